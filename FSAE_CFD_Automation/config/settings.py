@@ -61,6 +61,13 @@ SETTINGS = {
     # =============================
     "max_iterations": 2000,
     "floating_point_recovery_iterations": 300,
+    "residual_target": 1e-4,
+
+    # Live residual polling (--live): interval grows from min to max (s)
+    # while far from converged, back to min within 10x of residual_target
+    "live_poll_min": 1.0,
+    "live_poll_max": 30.0,
+    "live_poll_growth": 1.15,
 
     # =============================
     # BATCH
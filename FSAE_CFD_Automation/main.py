@@ -2,6 +2,7 @@ import os
 import time
 import argparse
 import glob
+from concurrent.futures import ThreadPoolExecutor
 
 import ansys.fluent.core as pyfluent
 
@@ -49,6 +50,10 @@ def run_case(geometry_path: str, output_dir: str, global_summary_csv: str | None
 
     os.makedirs(output_dir, exist_ok=True)
 
+    # Local CSV writes run here while Fluent keeps working.
+    # Fluent calls themselves stay on this thread: the session runs one command at a time.
+    io_pool = ThreadPoolExecutor(max_workers=1)
+
     print("\n========================================")
     print("           FSAE CFD PIPELINE")
     print("========================================")
@@ -101,13 +106,24 @@ def run_case(geometry_path: str, output_dir: str, global_summary_csv: str | None
     mesh_metrics = get_mesh_quality(solver)
     print_mesh_quality_summary(mesh_metrics)
 
-    save_mesh_quality_csv(mesh_metrics, os.path.join(output_dir, "mesh_quality.csv"))
+    mesh_csv = io_pool.submit(
+        save_mesh_quality_csv, mesh_metrics, os.path.join(output_dir, "mesh_quality.csv")
+    )
+
+    # Physics setup: settings writes only, so they go to Fluent as one batch.
+    # A failure here raises and stops the run.
+    with pyfluent.BatchOps(solver):
+        enable_GEKO(solver)
+        apply_boundary_conditions(solver, SETTINGS)
+        set_reference_values(solver, SETTINGS)
 
-    # Physics setup
-    enable_GEKO(solver)
-    apply_boundary_conditions(solver, SETTINGS)
-    apply_wheel_motion(solver, SETTINGS)
-    set_reference_values(solver, SETTINGS)
+    # Wheel zones are optional: batched separately, so a failing wheel
+    # doesn't discard the required setup above
+    try:
+        with pyfluent.BatchOps(solver):
+            apply_wheel_motion(solver, SETTINGS)
+    except Exception as e:
+        print(f"[Wheel] WARNING — wheel motion not applied: {e}")
 
     # Solver stabilization
     ramp_relaxation(solver)
@@ -148,20 +164,14 @@ def run_case(geometry_path: str, output_dir: str, global_summary_csv: str | None
     # Pressure map
     export_pressure_map(solver, os.path.join(output_dir, "pressure_map.png"))
 
-    # Save case & data
-    try:
-        solver.solver.File.Write(file_type="case", file_name=os.path.join(output_dir, "final.cas.h5"))
-        solver.solver.File.Write(file_type="data", file_name=os.path.join(output_dir, "final.dat.h5"))
-    except Exception as e:
-        print("[Main] Case/Data save error:", e)
-
     # Export summary CSV
     case_name = os.path.splitext(os.path.basename(geometry_path))[0]
     summary_file = (
         global_summary_csv if global_summary_csv is not None else os.path.join(output_dir, "summary.csv")
     )
 
-    export_case_summary_csv(
+    summary_csv = io_pool.submit(
+        export_case_summary_csv,
         file_path=summary_file,
         case_name=case_name,
         Cd=Cd,
@@ -173,6 +183,17 @@ def run_case(geometry_path: str, output_dir: str, global_summary_csv: str | None
         mesh_metrics=mesh_metrics,
     )
 
+    # Save case & data (overlaps with the summary CSV write)
+    try:
+        solver.solver.File.Write(file_type="case", file_name=os.path.join(output_dir, "final.cas.h5"))
+        solver.solver.File.Write(file_type="data", file_name=os.path.join(output_dir, "final.dat.h5"))
+    except Exception as e:
+        print("[Main] Case/Data save error:", e)
+
+    mesh_csv.result()
+    summary_csv.result()
+    io_pool.shutdown()
+
     print("\n========================================")
     print("        CFD CASE COMPLETE")
     print("========================================\n")
@@ -269,14 +290,22 @@ def main():
 
     if args.live and solver is not None:
         print("[LIVE] Tracking residuals...")
+        poll = SETTINGS["live_poll_min"]
+        start = time.monotonic()
         try:
             while True:
                 res = solver.solution.Monitors.Residual.GetValues()
                 print(
-                    f"[LIVE] continuity={res['continuity']:.3e} | "
+                    f"[LIVE] t={time.monotonic() - start:.0f}s | "
+                    f"continuity={res['continuity']:.3e} | "
                     f"mom-x={res['x-momentum']:.3e}"
                 )
-                time.sleep(1.5)
+                # Sparse polls early on, dense ones close to convergence
+                if res["continuity"] < 10 * SETTINGS["residual_target"]:
+                    poll = SETTINGS["live_poll_min"]
+                else:
+                    poll = min(SETTINGS["live_poll_max"], poll * SETTINGS["live_poll_growth"])
+                time.sleep(poll)
         except KeyboardInterrupt:
             print("\n[LIVE] Monitoring stopped by user.")
 
@@ -1,8 +1,27 @@
+from contextlib import contextmanager
+
 from .local_refinement_regions import add_all_local_refinements
 from .refinement_boxes import generate_wheel_refinement_boxes
 from .boundary_layer_tools import compute_bl_height, compute_first_layer_height
 
 
+@contextmanager
+def _quiet(session):
+    """
+    Stops streaming the Fluent transcript to Python inside the block, for
+    repetitive tasks whose banner output nobody reads.
+    """
+    transcript = getattr(session, "transcript", None)
+    if transcript is None:
+        yield
+        return
+
+    transcript.stop()
+    try:
+        yield
+    finally:
+        transcript.start()
+
 
 def run_mesh_pipeline(session, geometry_path, settings):
 
@@ -37,7 +56,8 @@ def run_mesh_pipeline(session, geometry_path, settings):
     # Wheel refinement boxes
     # -------------------------
     print("\n[Meshing] Adding wheel refinement boxes...")
-    generate_wheel_refinement_boxes(session, settings)
+    with _quiet(session):
+        generate_wheel_refinement_boxes(session, settings)
 
     # -------------------------
     # Boundary layer
@@ -83,7 +103,8 @@ def run_mesh_pipeline(session, geometry_path, settings):
     imp_surf.InsertCompoundChildTask()
     c = tasks[imp_surf.ChildNames[-1]]
     c.Arguments.set_state({"FaceQualityLimit": 0.7})
-    imp_surf.Execute()
+    with _quiet(session):
+        imp_surf.Execute()
 
     # -------------------------
     # Volume mesh
@@ -108,6 +129,7 @@ def run_mesh_pipeline(session, geometry_path, settings):
         "CellQualityLimit": 0.2,
         "UseAdditionalCriteria": False
     })
-    imp_vol.Execute()
+    with _quiet(session):
+        imp_vol.Execute()
 
     print("\n[Meshing] Pipeline complete.")
@@ -3,19 +3,19 @@ from config.wheel_centers import WHEEL_CENTERS
 def generate_wheel_refinement_boxes(session, settings):
     pad = settings["refinement_padding"]
     dia = settings["tire_diameter"]
+    half = dia / 2.0 + pad
+
+    # Loop invariant: one proxy lookup instead of one per wheel
+    task = session.workflow.TaskObject["Add Local Refinement"]
 
     for zone, (x, y, z) in WHEEL_CENTERS.items():
 
-        xmin = x - dia/2 - pad
-        xmax = x + dia/2 + pad
-        ymin = y - dia/2 - pad
-        ymax = y + dia/2 + pad
-        zmin = z - dia/2 - pad
-        zmax = z + dia/2 + pad
+        xmin, xmax = x - half, x + half
+        ymin, ymax = y - half, y + half
+        zmin, zmax = z - half, z + half
 
         print(f"[WheelBox] {zone}: [{xmin},{xmax}] x [{ymin},{ymax}] x [{zmin},{zmax}]")
 
-        task = session.workflow.TaskObject["Add Local Refinement"]
         task.AddChildToTask()
         task.InsertCompoundChildTask()
 
@@ -4,12 +4,12 @@ def get_fluent_coefficients(session):
 
     try:
         Cd = drag.GetData()[-1]
-    except:
+    except Exception:
         Cd = None
 
     try:
         Cl = lift.GetData()[-1]
-    except:
+    except Exception:
         Cl = None
 
     print(f"[Aero] Cd={Cd}, Cl={Cl}")
@@ -5,7 +5,6 @@
 
 import os
 import time
-import ansys.fluent.core as pyfluent
 
 
 class FrontWingPipeline:
@@ -22,6 +21,7 @@ class FrontWingPipeline:
         os.makedirs(self.outdir, exist_ok=True)
 
     def run(self):
+        import ansys.fluent.core as pyfluent  # Slow import: deferred until a job runs
         self.log("Launching Fluent Meshing (Front Wing)...")
 
         meshing = pyfluent.launch_fluent(
@@ -150,6 +150,7 @@ class FrontWingPipeline:
     # SOLVER
     # ==========================================================
     def _run_solver(self, mesh):
+        import ansys.fluent.core as pyfluent
         solver = pyfluent.launch_fluent(
             mode=pyfluent.FluentMode.SOLVER,
             precision=pyfluent.Precision.DOUBLE,
@@ -3,7 +3,6 @@
 # WITH wheels
 
 import os
-import ansys.fluent.core as pyfluent
 
 
 class HalfCarPipeline:
@@ -18,6 +17,7 @@ class HalfCarPipeline:
         os.makedirs(self.outdir, exist_ok=True)
 
     def run(self):
+        import ansys.fluent.core as pyfluent  # Slow import: deferred until a job runs
         meshing = pyfluent.launch_fluent(
             mode=pyfluent.FluentMode.MESHING,
             precision=pyfluent.Precision.DOUBLE,
@@ -81,6 +81,7 @@ class HalfCarPipeline:
         return mesh
 
     def _solve(self, mesh):
+        import ansys.fluent.core as pyfluent
         solver = pyfluent.launch_fluent(
             mode=pyfluent.FluentMode.SOLVER,
             precision=pyfluent.Precision.DOUBLE,
@@ -1,5 +1,8 @@
 import sys, os
-from PySide6 import QtWidgets
+from functools import partial
+from types import MappingProxyType
+from PySide6 import QtWidgets, QtCore
+from PySide6.QtCore import Slot
 from diagnostics import detect_system, detect_fluent_versions
 from simulation_manager import SimulationManager
 from worker_thread import WorkerThread
@@ -9,13 +12,28 @@ from rearwing_pipeline import RearWingPipeline
 from undertray_pipeline import UndertrayPipeline
 from halfcar_pipeline import HalfCarPipeline
 
+# Run-button key -> (pipeline class, simulation name)
+PIPELINE_REGISTRY = MappingProxyType({
+    "fw": (FrontWingPipeline, "FrontWing"),
+    "rw": (RearWingPipeline, "RearWing"),
+    "ut": (UndertrayPipeline, "Undertray"),
+    "hc": (HalfCarPipeline, "HalfCar"),
+})
+
 class MainWindow(QtWidgets.QWidget):
     def __init__(self):
         super().__init__()
         self.manager = SimulationManager()
-        self.sysinfo = detect_system()
+        self.sysinfo = None
         self.init_ui()
 
+        self.worker = WorkerThread(self.manager)
+        self.worker.log_signal.connect(self.append_log)
+        self.worker.start()
+
+        # Probe the system after the first paint instead of before it
+        QtCore.QTimer.singleShot(0, self.load_system_info)
+
     def init_ui(self):
         self.setWindowTitle("Ram Racing FSAE Aero Automation Suite")
         layout = QtWidgets.QVBoxLayout(self)
@@ -29,15 +47,13 @@ class MainWindow(QtWidgets.QWidget):
         cpu_box = QtWidgets.QGroupBox("Parallel Settings")
         cpu_layout = QtWidgets.QFormLayout(cpu_box)
 
-        self.cpu_label = QtWidgets.QLabel(self.sysinfo["display"])
+        self.cpu_label = QtWidgets.QLabel("Detecting...")
         self.mpi_field = QtWidgets.QSpinBox()
-        self.mpi_field.setValue(self.sysinfo["recommended_mpi"])
 
         self.mpi_type = QtWidgets.QComboBox()
         self.mpi_type.addItems(["Intel MPI", "Default MPI"])
 
         self.fluent_ver = QtWidgets.QComboBox()
-        self.fluent_ver.addItems(detect_fluent_versions())
 
         cpu_layout.addRow("Detected:", self.cpu_label)
         cpu_layout.addRow("MPI Ranks:", self.mpi_field)
@@ -46,9 +62,17 @@ class MainWindow(QtWidgets.QWidget):
 
         # Buttons
         run = QtWidgets.QPushButton("Run Front Wing")
-        run.clicked.connect(lambda: self.start_job("fw"))
+        run.clicked.connect(partial(self.start_job, "fw"))
 
-        self.log = QtWidgets.QTextEdit(readOnly=True)
+        self.log = QtWidgets.QPlainTextEdit(readOnly=True)
+        self.log.setMaximumBlockCount(5000)
+
+        # Worker log lines are buffered and written every 50 ms in one insert
+        self._log_buf = []
+        self._log_timer = QtCore.QTimer(self)
+        self._log_timer.setInterval(50)
+        self._log_timer.timeout.connect(self.flush_log)
+        self._log_timer.start()
 
         layout.addWidget(self.geom)
         layout.addWidget(browse)
@@ -56,27 +80,75 @@ class MainWindow(QtWidgets.QWidget):
         layout.addWidget(run)
         layout.addWidget(self.log)
 
+    @Slot()
+    def load_system_info(self):
+        self.sysinfo = detect_system()
+        self.cpu_label.setText(self.sysinfo["display"])
+        self.mpi_field.setValue(self.sysinfo["recommended_mpi"])
+        self.fluent_ver.addItems(detect_fluent_versions())
+
+    @Slot()
     def browse_geom(self):
-        f, _ = QtWidgets.QFileDialog.getOpenFileName(
-            self, "Select Geometry", "", "Geometry (*.pmdb *.dsco)"
+        url, _ = QtWidgets.QFileDialog.getOpenFileUrl(
+            self, "Select Geometry", QtCore.QUrl(), "Geometry (*.pmdb *.dsco)",
+            options=QtWidgets.QFileDialog.Option(0)
         )
+        f = url.toLocalFile()
         if f:
             self.geom.setText(f)
 
+    @Slot(str)
+    def append_log(self, msg):
+        self._log_buf.append(msg)
+
+    @Slot()
+    def flush_log(self):
+        if not self._log_buf:
+            return
+        # Auto-scrolls only when the view is already at the bottom
+        self.log.appendPlainText("\n".join(self._log_buf))
+        self._log_buf.clear()
+
+    @Slot(str)
     def start_job(self, kind):
+        entry = PIPELINE_REGISTRY.get(kind)
+        if entry is None:
+            raise ValueError(f"Unknown pipeline type: {kind}")
+        pipeline_class, sim_name = entry
+
         job = {
-            "pipeline_class": FrontWingPipeline,
+            "pipeline_class": pipeline_class,
             "geom": self.geom.text(),
             "mpi_ranks": self.mpi_field.value(),
             "mpi_type": "intel" if "Intel" in self.mpi_type.currentText() else "default",
             "fluent_version": self.fluent_ver.currentText(),
-            "sim_name": "FrontWing"
+            "sim_name": sim_name
         }
-        self.manager.add_job(job)
-
-        self.worker = WorkerThread(self.manager)
-        self.worker.log_signal.connect(self.log.append)
-        self.worker.start()
+        self.worker.submit(job)
+
+    def closeEvent(self, event):
+        # Idle worker: it only has to pick up the shutdown sentinel
+        if not self.worker.is_busy():
+            self.worker.stop()
+            self.worker.wait()
+            super().closeEvent(event)
+            return
+
+        # A running Fluent job can't be interrupted; never block the GUI on it
+        answer = QtWidgets.QMessageBox.question(
+            self, "Simulation running",
+            "A simulation is still running. Quit once it has finished?\n"
+            "Queued simulations are dropped."
+        )
+        event.ignore()
+        if answer != QtWidgets.QMessageBox.StandardButton.Yes:
+            return
+        # Connected before stop(): the job may end at any moment
+        self.worker.finished.connect(QtWidgets.QApplication.quit)
+        self.worker.stop()
+        self.hide()
+        if self.worker.isFinished():
+            QtWidgets.QApplication.quit()
 
 if __name__ == "__main__":
     app = QtWidgets.QApplication(sys.argv)
@@ -1,7 +1,9 @@
 # pipelines.py
 import os
 import time
-import ansys.fluent.core as pyfluent
+
+# PyFluent is imported where Fluent is launched, not here: the import takes
+# seconds and the GUI loads these modules long before a job runs.
 
 WHEEL_OMEGA = 88.0
 
@@ -30,8 +32,41 @@ class BasePipeline:
     # --------------------------------------------------
     # Utility
     # --------------------------------------------------
-    def wait(self, t=0.25):
-        time.sleep(t)
+    def wait_for(self, task, timeout=120, poll=0.01):
+        """
+        Returns once a workflow task reports Up-to-date. Execute() blocks
+        until the task is done, so this is normally one State() query;
+        the short poll only covers late status updates.
+        """
+        deadline = time.monotonic() + timeout
+        while task.State() != "Up-to-date":
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Workflow task did not complete within {timeout}s.")
+            time.sleep(poll)
+
+    # --------------------------------------------------
+    # Batched workflow submission
+    # --------------------------------------------------
+    def child_task_statements(self, parent, child, state):
+        """Workflow statements that add, configure and run one child task."""
+        return [
+            f"workflow.TaskObject[{parent!r}].AddChildToTask()",
+            f"workflow.TaskObject[{child!r}].Arguments.set_state({state!r})",
+            f"workflow.TaskObject[{child!r}].Execute()",
+        ]
+
+    def submit_workflow(self, session, statements):
+        """
+        Runs meshing workflow statements server-side in one scheme_eval
+        round-trip instead of one RPC per AddChildToTask/set_state/Execute.
+        """
+        body = " ".join(
+            '(%py-exec "{}")'.format(
+                stmt.replace("\\", "/").replace('"', '\\"')
+            )
+            for stmt in statements
+        )
+        session.scheme_eval.scheme_eval(f"(begin {body})")
 
     # --------------------------------------------------
     # Wheel centers (override per pipeline if needed)
@@ -46,6 +81,7 @@ class BasePipeline:
     # Launch Fluent
     # --------------------------------------------------
     def launch_meshing(self):
+        import ansys.fluent.core as pyfluent
         return pyfluent.launch_fluent(
             mode=pyfluent.FluentMode.MESHING,
             precision=pyfluent.Precision.DOUBLE,
@@ -56,6 +92,7 @@ class BasePipeline:
         )
 
     def launch_solver(self):
+        import ansys.fluent.core as pyfluent
         return pyfluent.launch_fluent(
             mode=pyfluent.FluentMode.SOLVER,
             precision=pyfluent.Precision.DOUBLE,
@@ -4,7 +4,6 @@
 
 import os
 import time
-import ansys.fluent.core as pyfluent
 
 
 class RearWingPipeline:
@@ -19,6 +18,7 @@ class RearWingPipeline:
         os.makedirs(self.outdir, exist_ok=True)
 
     def run(self):
+        import ansys.fluent.core as pyfluent  # Slow import: deferred until a job runs
         meshing = pyfluent.launch_fluent(
             mode=pyfluent.FluentMode.MESHING,
             precision=pyfluent.Precision.DOUBLE,
@@ -74,6 +74,7 @@ class RearWingPipeline:
         return mesh
 
     def _solve(self, mesh):
+        import ansys.fluent.core as pyfluent
         solver = pyfluent.launch_fluent(
             mode=pyfluent.FluentMode.SOLVER,
             precision=pyfluent.Precision.DOUBLE,
@@ -1,19 +1,26 @@
 import os
+import queue
 
 class SimulationManager:
     def __init__(self):
-        self.jobs = []
+        self.jobs = queue.Queue()
         self.log_cb = print
 
     def set_log_callback(self, cb):
         self.log_cb = cb
 
     def add_job(self, job):
-        self.jobs.append(job)
+        self.jobs.put(job)
+
+    def run_job(self, job):
+        self.log_cb(f"Starting {job['sim_name']}")
+        pipeline = job["pipeline_class"](job, self.log_cb)
+        pipeline.run()
 
     def run_all(self):
-        for job in self.jobs:
-            self.log_cb(f"Starting {job['sim_name']}")
-            pipeline = job["pipeline_class"](job, self.log_cb)
-            pipeline.run()
-        self.jobs.clear()
+        while True:
+            try:
+                job = self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            self.run_job(job)
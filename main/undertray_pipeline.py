@@ -6,8 +6,9 @@ from pipelines import BasePipeline, WHEEL_OMEGA
 class UndertrayPipeline(BasePipeline):
 
     def run(self):
-        mesh = self.run_meshing()
-        self.run_solver(mesh)
+        session = self.run_meshing()
+        # Same Fluent process continues as the solver with the mesh in memory
+        self.run_solver(session.switch_to_solver())
 
     # ==================================================
     # MESHING
@@ -23,7 +24,7 @@ class UndertrayPipeline(BasePipeline):
             "LengthUnit": "m"
         })
         tasks["Import Geometry"].Execute()
-        self.wait()
+        self.wait_for(tasks["Import Geometry"])
 
         # ---------------- GLOBAL REFINEMENT ----------------
         zmax = self.W * 0.5
@@ -47,41 +48,46 @@ class UndertrayPipeline(BasePipeline):
                 "Zmax": zmax
             })
             t.Execute()
-            self.wait()
+            self.wait_for(t)
+
+        # ---------------- WHEEL REFINEMENT + CURVATURE SIZING ----------------
+        # Independent child tasks: submitted as one batch, then each checked
+        batch = []
+        batch_tasks = []
 
-        # ---------------- WHEEL REFINEMENT ----------------
         for name, (x, y, z) in self.get_wheel_centers().items():
-            tasks["Create Local Refinement Regions"].AddChildToTask()
-            cyl = tasks[f"wheel-cyl-{name}"]
-            cyl.Arguments.set_state({
-                "RegionType": "Cylinder",
-                "CenterX": x,
-                "CenterY": y,
-                "CenterZ": z,
-                "Radius": 0.254,
-                "Height": 0.25,
-                "MeshSize": 0.016
-            })
-            cyl.Execute()
-            self.wait()
+            batch_tasks.append(f"wheel-cyl-{name}")
+            batch += self.child_task_statements(
+                "Create Local Refinement Regions", f"wheel-cyl-{name}", {
+                    "RegionType": "Cylinder",
+                    "CenterX": x,
+                    "CenterY": y,
+                    "CenterZ": z,
+                    "Radius": 0.254,
+                    "Height": 0.25,
+                    "MeshSize": 0.016
+                })
 
-        # ---------------- CURVATURE SIZING ----------------
         for label, zones, min_s, max_s, ang in [
             ("ut", ["undertray"], 0.0005, 0.008, 9),
             ("w", ["fw", "rw"], 0.0005, 0.032, 18),
             ("b", ["fwb", "rwb"], 0.0005, 0.032, 18),
         ]:
-            tasks["Add Local Sizing"].AddChildToTask()
-            t = tasks[f"curv-{label}"]
-            t.Arguments.set_state({
-                "LocalSizingType": "Curvature",
-                "MinSize": min_s,
-                "MaxSize": max_s,
-                "CurvatureNormalAngle": ang,
-                "BoundaryNameList": zones
-            })
-            t.Execute()
-            self.wait()
+            batch_tasks.append(f"curv-{label}")
+            batch += self.child_task_statements(
+                "Add Local Sizing", f"curv-{label}", {
+                    "LocalSizingType": "Curvature",
+                    "MinSize": min_s,
+                    "MaxSize": max_s,
+                    "CurvatureNormalAngle": ang,
+                    "BoundaryNameList": zones
+                })
+
+        self.submit_workflow(session, batch)
+
+        failed = [name for name in batch_tasks if tasks[name].State() != "Up-to-date"]
+        if failed:
+            raise RuntimeError(f"Batched local sizing tasks did not complete: {', '.join(failed)}")
 
         # ---------------- SURFACE MESH ----------------
         tasks["Generate the Surface Mesh"].Arguments.set_state({
@@ -91,13 +97,13 @@ class UndertrayPipeline(BasePipeline):
             "CurvatureNormalAngle": 18
         })
         tasks["Generate the Surface Mesh"].Execute()
-        self.wait()
+        self.wait_for(tasks["Generate the Surface Mesh"])
 
         tasks["Improve Surface Mesh"].Arguments.set_state({
             "FaceQualityLimit": 0.7
         })
         tasks["Improve Surface Mesh"].Execute()
-        self.wait()
+        self.wait_for(tasks["Improve Surface Mesh"])
 
         # ---------------- BL + VOLUME ----------------
         tasks["Add Boundary Layers"].AddChildToTask()
@@ -109,7 +115,7 @@ class UndertrayPipeline(BasePipeline):
             "LastLayerRatio": 1.2
         })
         bl.Execute()
-        self.wait()
+        self.wait_for(bl)
 
         tasks["Generate the Volume Mesh"].Arguments.set_state({
             "FillWith": "poly-hexcore",
@@ -118,25 +124,22 @@ class UndertrayPipeline(BasePipeline):
             "EnableParallel": True
         })
         tasks["Generate the Volume Mesh"].Execute()
-        self.wait()
+        self.wait_for(tasks["Generate the Volume Mesh"])
 
+        # Kept on disk for re-runs; the solver itself gets the mesh in memory
         mesh_file = os.path.join(self.outdir, "mesh_undertray.msh.h5")
         session.meshing.SaveMesh(file_name=mesh_file)
-        return mesh_file
+        return session
 
     # ==================================================
     # SOLVER
     # ==================================================
-    def run_solver(self, mesh):
-        solver = self.launch_solver()
-        solver.solver.File.Read(file_type="mesh", file_name=mesh)
-
+    def run_solver(self, solver):
         # GEKO ramp logic preserved
         solver.tui.define.models.viscous.ke_gko("yes")
         solver.tui.define.models.viscous.ke_gko.options.curvature_correction("no")
 
-        solver.solution.RunCalculation.iterate(1000)
-        solver.solution.RunCalculation.iterate(1000)
+        solver.solution.RunCalculation.iterate(2000)
 
         solver.tui.define.models.viscous.ke_gko.options.curvature_correction("yes")
         solver.solution.RunCalculation.iterate(5000)
@@ -1,14 +1,46 @@
+import queue
+import traceback
+
 from PySide6.QtCore import QThread, Signal
 
 class WorkerThread(QThread):
+    """
+    Long-lived worker: started once with the window and fed jobs through
+    submit(), so each job doesn't pay for a new thread.
+    """
     log_signal = Signal(str)
     finished_signal = Signal()
 
     def __init__(self, manager):
         super().__init__()
         self.manager = manager
+        self._queue = queue.Queue()
+        self._busy = False  # A job is running (read from the GUI thread)
+
+    def submit(self, job):
+        self._queue.put(job)
+
+    def is_busy(self):
+        return self._busy
+
+    def stop(self):
+        """Drops jobs not yet started; the running one finishes first."""
+        with self._queue.mutex:
+            self._queue.queue.clear()
+        # None is the shutdown sentinel
+        self._queue.put(None)
 
     def run(self):
         self.manager.set_log_callback(self.log_signal.emit)
-        self.manager.run_all()
-        self.finished_signal.emit()
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            self._busy = True
+            try:
+                self.manager.run_job(job)
+            except Exception as e:
+                self.log_signal.emit(f"{job['sim_name']} failed: {e}\n{traceback.format_exc()}")
+            finally:
+                self._busy = False
+            self.finished_signal.emit()
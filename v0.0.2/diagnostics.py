@@ -25,6 +25,10 @@ class FluentDiagnostics:
             "notes": []
         }
 
+        # Environment for the `fluent` subprocesses: None inherits the
+        # current one; a copy only when AWP_ROOT has to be added
+        self.env = None
+
     # ------------------------------------------------------------
     # Helper for checking environment variables
     # ------------------------------------------------------------
@@ -33,6 +37,8 @@ class FluentDiagnostics:
                    os.environ.get("AWP_ROOT") or \
                    os.environ.get("AWP_ROOT252")
         if awp_root:
+            if "AWP_ROOT" not in os.environ:
+                self.env = {**os.environ, "AWP_ROOT": awp_root}
             self.results["AWP_ROOT"] = True
             self.log(f"[Diagnostics] AWP_ROOT found: {awp_root}")
         else:
@@ -55,6 +61,7 @@ class FluentDiagnostics:
             subprocess.run(["fluent", "-v"],
                            stdout=subprocess.PIPE,
                            stderr=subprocess.PIPE,
+                           env=self.env,
                            timeout=5)
             self.results["fluent_in_path"] = True
             self.log("[Diagnostics] Fluent found in PATH.")
@@ -71,6 +78,7 @@ class FluentDiagnostics:
                 ["fluent", "-v"],
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
+                env=self.env,
                 timeout=5,
                 text=True
             )
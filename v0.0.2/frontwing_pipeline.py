@@ -1,8 +1,7 @@
 # frontwing_pipeline.py
 # Front Wing CFD pipeline (class-based)
 
-import os
-from pipelines import BasePipeline
+from pipelines import BasePipeline, MESH_FILE
 
 
 class FrontWingPipeline(BasePipeline):
@@ -17,12 +16,9 @@ class FrontWingPipeline(BasePipeline):
     def setup_geometry(self):
         self.log_info("Importing geometry for Front Wing...")
 
-        workflow = self.session.workflow
-        tasks = workflow.TaskObject
+        self.init_watertight_workflow()
 
-        workflow.InitializeWorkflow(WorkflowType="Watertight Geometry")
-
-        import_geom = tasks["Import Geometry"]
+        import_geom = self._tasks["import"]
         import_geom.Arguments.set_state({
             "FileName": self.geom_path,
             "LengthUnit": "m"
@@ -37,11 +33,8 @@ class FrontWingPipeline(BasePipeline):
     def mesh_surface(self):
         self.log_info("Generating Front Wing surface mesh...")
 
-        workflow = self.session.workflow
-        tasks = workflow.TaskObject
-
         # Generate Surface Mesh
-        surface_mesh = tasks["Generate the Surface Mesh"]
+        surface_mesh = self._tasks["surface"]
         surface_mesh.Arguments.set_state({
             "CFDSurfaceMeshControls": {
                 "CurvatureNormalAngle": 12,
@@ -60,10 +53,7 @@ class FrontWingPipeline(BasePipeline):
     def mesh_volume(self):
         self.log_info("Generating Front Wing volume mesh...")
 
-        workflow = self.session.workflow
-        tasks = workflow.TaskObject
-
-        volume_mesh = tasks["Generate the Volume Mesh"]
+        volume_mesh = self._tasks["volume"]
         volume_mesh.Arguments.set_state({
             "Solver": "Fluent",
             "FillWith": "poly-hexcore",
@@ -82,7 +72,7 @@ class FrontWingPipeline(BasePipeline):
         tui = self.tui
 
         self.log_info("Loading mesh into solver...")
-        tui.file.read_case(os.path.join(self.output_dir, "mesh.msh.h5"))
+        tui.file.read_case(self.out_file(MESH_FILE))
 
         # Enable GEKO turbulence model
         self.log_info("Configuring turbulence model (GEKO)...")
@@ -96,19 +86,14 @@ class FrontWingPipeline(BasePipeline):
         self.progress(3)
 
         # -------------------------------
-        # Stage 2 – enable curvature correction
+        # Stages 2+3 – curvature correction on, long stable solve
+        # (identical settings, so one 6000-iteration call)
         # -------------------------------
-        self.log_info("Solver Ramp 2: enabling curvature correction...")
+        self.log_info("Solver Ramps 2+3: enabling curvature correction, 6000 iterations...")
         tui.define.models.viscous.correction_factor("on")
-
-        tui.solve.iterate(1000)
         self.progress(4)
 
-        # -------------------------------
-        # Stage 3 – long stable solve
-        # -------------------------------
-        self.log_info("Solver Ramp 3: 5000 iterations...")
-        tui.solve.iterate(5000)
+        tui.solve.iterate(6000)
         self.progress(5)
 
         self.log_info("Solver completed for Front Wing.")
@@ -119,20 +104,16 @@ class FrontWingPipeline(BasePipeline):
     def export_results(self):
         self.log_info("Exporting Front Wing results...")
 
-        case_file = os.path.join(self.output_dir, f"{self.sim_name}.cas.h5")
-        data_file = os.path.join(self.output_dir, f"{self.sim_name}.dat.h5")
-        coeff_file = os.path.join(self.output_dir, f"{self.sim_name}_coeffs.txt")
-
-        tui = self.tui
+        case_file = self.out_file(f"{self.sim_name}.cas.h5")
+        data_file = self.out_file(f"{self.sim_name}.dat.h5")
+        coeff_file = self.out_file(f"{self.sim_name}_coeffs.txt")
 
         # Save case & data
-        tui.file.write_case_data(case_file)
+        self.write_case_data(case_file)
 
-        # Extract force coefficients
-        with open(coeff_file, "w") as f:
-            f.write("Front Wing Coefficients\n")
-            f.write("------------------------\n")
-            f.write(str(self.session.solution.force_monitor.get_force_coefficients()))
+        # Extract force coefficients (one round trip for the whole monitor set)
+        coeffs = self.session.solution.force_monitor.get_force_coefficients()
+        self.write_coefficients(coeff_file, coeffs, "Front Wing Coefficients")
 
         self.log_info("Result files saved.")
 
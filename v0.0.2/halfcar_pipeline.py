@@ -1,8 +1,7 @@
 # halfcar_pipeline.py
 # Half-Car CFD pipeline (class-based)
 
-import os
-from pipelines import BasePipeline
+from pipelines import BasePipeline, MESH_FILE
 
 
 class HalfCarPipeline(BasePipeline):
@@ -18,12 +17,9 @@ class HalfCarPipeline(BasePipeline):
     def setup_geometry(self):
         self.log_info("Importing half-car geometry...")
 
-        workflow = self.session.workflow
-        tasks = workflow.TaskObject
+        self.init_watertight_workflow()
 
-        workflow.InitializeWorkflow(WorkflowType="Watertight Geometry")
-
-        import_geom = tasks["Import Geometry"]
+        import_geom = self._tasks["import"]
         import_geom.Arguments.set_state({
             "FileName": self.geom_path,
             "LengthUnit": "m"
@@ -38,10 +34,7 @@ class HalfCarPipeline(BasePipeline):
     def mesh_surface(self):
         self.log_info("Generating half-car surface mesh...")
 
-        workflow = self.session.workflow
-        tasks = workflow.TaskObject
-
-        surf = tasks["Generate the Surface Mesh"]
+        surf = self._tasks["surface"]
         surf.Arguments.set_state({
             "CFDSurfaceMeshControls": {
                 "CurvatureNormalAngle": 12,
@@ -60,10 +53,7 @@ class HalfCarPipeline(BasePipeline):
     def mesh_volume(self):
         self.log_info("Generating half-car volume mesh...")
 
-        workflow = self.session.workflow
-        tasks = workflow.TaskObject
-
-        vol = tasks["Generate the Volume Mesh"]
+        vol = self._tasks["volume"]
         vol.Arguments.set_state({
             "Solver": "Fluent",
             "FillWith": "poly-hexcore",
@@ -80,10 +70,11 @@ class HalfCarPipeline(BasePipeline):
     # =============================================================
     def run_solver_stages(self):
         tui = self.tui
-        mesh_file = os.path.join(self.output_dir, "mesh.msh.h5")
+        mesh_file = self.out_file(MESH_FILE)
 
         self.log_info("Loading mesh into solver...")
         tui.file.read_case(mesh_file)
+        self.resolve_zones()
 
         inlet_speed = 40 * 0.44704  # mph → m/s
 
@@ -92,43 +83,33 @@ class HalfCarPipeline(BasePipeline):
         # -------------------------------
         self.log_info("Applying boundary conditions...")
 
+        # All setup commands are queued and sent as one scheme block
+        bc = "define/boundary-conditions"
+
         # Inlet
-        tui.define.boundary_conditions.velocity_inlet(
-            "inlet", "yes", f"{inlet_speed}"
-        )
+        self.queue_tui(f"{bc}/velocity-inlet inlet yes {inlet_speed}")
 
         # Outlet
-        tui.define.boundary_conditions.pressure_outlet("outlet", "yes")
+        self.queue_tui(f"{bc}/pressure-outlet outlet yes")
 
         # Moving ground plane
-        tui.define.boundary_conditions.wall(
-            "ground", "moving-wall", "yes", "speed", f"{inlet_speed}"
-        )
+        self.queue_tui(f"{bc}/wall ground moving-wall yes speed {inlet_speed}")
 
         # Symmetry
-        tui.define.boundary_conditions.symmetry("symmetry")
+        self.queue_tui(f"{bc}/symmetry symmetry")
 
         # Rotating wheels (88 rad/s)
-        rotating = ["fw", "rw"]
-        for w in rotating:
-            try:
-                tui.define.boundary_conditions.wall(
-                    w, "moving-wall", "yes",
-                    "rotation-rate", "88", "z", "0"
-                )
-            except:
-                pass
+        for w in self.present_zones(["fw", "rw"]):
+            self.queue_tui(f"{bc}/wall {w} moving-wall yes rotation-rate 88 z 0", required=False)
 
         # Wheel blocks remain stationary
-        blocks = ["fwb", "rwb"]
-        for b in blocks:
-            try:
-                tui.define.boundary_conditions.wall(b, "stationary-wall", "no")
-            except:
-                pass
+        for b in self.present_zones(["fwb", "rwb"]):
+            self.queue_tui(f"{bc}/wall {b} stationary-wall no", required=False)
 
         # Turbulence model: GEKO
-        tui.define.models.viscous.gko("yes")
+        self.queue_tui("define/models/viscous/gko yes")
+
+        self.flush_tui()
 
         # =====================================================
         # SOLVER RAMP STAGES
@@ -139,15 +120,13 @@ class HalfCarPipeline(BasePipeline):
         tui.solve.iterate(1000)
         self.progress(3)
 
-        # Stage 2 – curvature correction
-        self.log_info("Solver Ramp 2: enabling curvature correction...")
+        # Stages 2+3 – curvature correction, long solve
+        # (identical settings, so one 6000-iteration call)
+        self.log_info("Solver Ramps 2+3: enabling curvature correction, 6000 iterations...")
         tui.define.models.viscous.correction_factor("on")
-        tui.solve.iterate(1000)
         self.progress(4)
 
-        # Stage 3 – long solve
-        self.log_info("Solver Ramp 3: 5000 iterations...")
-        tui.solve.iterate(5000)
+        tui.solve.iterate(6000)
         self.progress(5)
 
         self.log_info("Solver complete for Half-Car.")
@@ -158,32 +137,31 @@ class HalfCarPipeline(BasePipeline):
     def export_results(self):
         self.log_info("Exporting half-car results...")
 
-        tui = self.tui
-
-        case_file = os.path.join(self.output_dir, f"{self.sim_name}.cas.h5")
-        coeff_file = os.path.join(self.output_dir, f"{self.sim_name}_coeffs.txt")
+        case_file = self.out_file(f"{self.sim_name}.cas.h5")
+        coeff_file = self.out_file(f"{self.sim_name}_coeffs.txt")
 
         # Save case/data
-        tui.file.write_case_data(case_file)
+        self.write_case_data(case_file)
 
-        # Extract aerodynamic coefficients
+        # Extract aerodynamic coefficients (one round trip for the whole monitor set)
         coeffs = self.session.solution.force_monitor.get_force_coefficients()
 
         # Projected frontal area (SCx, SCz reference)
         try:
             area = self.session.solution.surface_area.get_projected_area(
-                surfaces=["frontwing", "rearwing", "undertray", "chassis",
-                          "fw", "fwb", "rw", "rwb"],
+                surfaces=self.present_zones([
+                    "frontwing", "rearwing", "undertray", "chassis",
+                    "fw", "fwb", "rw", "rwb"
+                ]),
                 direction=[1, 0, 0],
                 min_feature_size=0.0001
             )
-        except:
+        except Exception:
             area = 0.0
 
-        with open(coeff_file, "w") as f:
-            f.write("Half-Car Aerodynamic Coefficients\n")
-            f.write("--------------------------------\n\n")
-            f.write(f"Coefficients: {coeffs}\n")
-            f.write(f"Projected Area (SCx): {area}\n")
+        self.write_coefficients(
+            coeff_file, coeffs, "Half-Car Aerodynamic Coefficients",
+            extra={"ProjectedArea": area}
+        )
 
         self.log_info("Half-car results exported.")
@@ -4,19 +4,101 @@
 
 import sys
 import os
-
-from PySide6 import QtWidgets, QtCore
+from collections import deque
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
+from types import MappingProxyType
+
+from PySide6 import QtWidgets, QtCore, QtGui
+from PySide6.QtCore import Slot
 from PySide6.QtWidgets import QFileDialog, QMessageBox
 
-from simulation_manager import SimulationManager
+from simulation_manager import SimulationManager, Job
+from worker_thread import QueueWorker
 from frontwing_pipeline import FrontWingPipeline
 from rearwing_pipeline import RearWingPipeline
 from undertray_pipeline import UndertrayPipeline
 from halfcar_pipeline import HalfCarPipeline
 
+LOG_MAX_LINES = 10000
+_INVALID_FIELD_STYLE = "border: 1px solid red;"
+
+_PIPELINE_MAP = MappingProxyType({
+    "fw": FrontWingPipeline,
+    "rw": RearWingPipeline,
+    "ut": UndertrayPipeline,
+    "hc": HalfCarPipeline,
+})
+
+_PIPELINE_KEYS = {cls: key for key, cls in _PIPELINE_MAP.items()}
+
+# Bound once: JobListModel.data runs for every visible row on each repaint
+_DISPLAY_ROLE = QtCore.Qt.ItemDataRole.DisplayRole
+
+
+class JobListModel(QtCore.QAbstractListModel):
+    """
+    Queue display model. Holds references to the queued Job objects, so
+    the view lays out only visible rows and nothing is copied per item.
+    GUI thread only: the manager's own list is popped by the worker.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._jobs = []
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._jobs)
+
+    def data(self, index, role=_DISPLAY_ROLE):
+        if role != _DISPLAY_ROLE or not index.isValid():
+            return None
+        job = self._jobs[index.row()]
+        key = _PIPELINE_KEYS.get(job.pipeline_class, "?")
+        return f"Queued: {job.sim_name} ({key.upper()})"
+
+    def append(self, job):
+        row = len(self._jobs)
+        self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        self._jobs.append(job)
+        self.endInsertRows()
+
+    def remove(self, job):
+        # Parallel jobs can finish out of order, so match by identity
+        for row, queued in enumerate(self._jobs):
+            if queued is job:
+                self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+                del self._jobs[row]
+                self.endRemoveRows()
+                return
+
+
+@contextmanager
+def _batch_updates(widget):
+    """Suspends repaints of widget so a burst of edits paints once."""
+    widget.setUpdatesEnabled(False)
+    try:
+        yield
+    finally:
+        widget.setUpdatesEnabled(True)
+        widget.update()
+
 
 class MainWindow(QtWidgets.QWidget):
 
+    # Pipeline progress stage (BasePipeline.run) → (label, percent)
+    _STAGE_MAP = (
+        ("Starting...", 0),
+        ("Surface Mesh Complete", 15),
+        ("Volume Mesh Complete", 35),
+        ("Solver Ramp 1 Complete", 45),
+        # Ramps 2+3 run as one long solve: stage 4 marks its start
+        ("Solver Ramps 2+3 (Curvature ON)...", 50),
+        ("Solver Complete", 90),
+        ("Report Generation Complete", 100),
+    )
+
     def __init__(self):
         super().__init__()
 
@@ -24,6 +106,20 @@ class MainWindow(QtWidgets.QWidget):
         self.setGeometry(200, 200, 850, 600)
 
         self.manager = SimulationManager()
+        self.queue_worker = None
+        self._settings = QtCore.QSettings("RamRacing", "FluentAuto")
+
+        # Cached input validation (None = edited since last check)
+        self._geom_ok = None
+        self._out_ok = None
+        self._dims = None
+
+        # Log lines are buffered and flushed to the log box every 100 ms
+        self._log_pending = deque(maxlen=LOG_MAX_LINES)
+        self._log_timer = QtCore.QTimer(self)
+        self._log_timer.timeout.connect(self._flush_log)
+        self._log_timer.start(100)
+
         self.init_ui()
 
     # ============================================================
@@ -45,24 +141,45 @@ class MainWindow(QtWidgets.QWidget):
         self.W_field = QtWidgets.QLineEdit("1.40462")
         self.H_field = QtWidgets.QLineEdit("1.19507")
 
+        # Jobs run side by side; each one keeps its own Fluent sessions open
+        self.parallel_jobs = QtWidgets.QSpinBox()
+        self.parallel_jobs.setRange(1, max(1, (os.cpu_count() or 1) // 2))
+        self.parallel_jobs.setValue(1)
+
         browse_geom = QtWidgets.QPushButton("Browse Geometry")
         browse_geom.clicked.connect(self.browse_geometry)
 
         browse_out = QtWidgets.QPushButton("Browse Output")
         browse_out.clicked.connect(self.browse_output)
 
-        form.addRow("Geometry File:", self.geom_path)
-        form.addRow("", browse_geom)
-        form.addRow("Output Folder:", self.out_path)
-        form.addRow("", browse_out)
-        form.addRow("Simulation Name:", self.sim_name)
-
-        form.addRow("Length (L):", self.L_field)
-        form.addRow("Width (W):", self.W_field)
-        form.addRow("Height (H):", self.H_field)
+        rows = (
+            ("Geometry File:", self.geom_path),
+            ("", browse_geom),
+            ("Output Folder:", self.out_path),
+            ("", browse_out),
+            ("Simulation Name:", self.sim_name),
+            ("Length (L):", self.L_field),
+            ("Width (W):", self.W_field),
+            ("Height (H):", self.H_field),
+            ("Parallel Jobs:", self.parallel_jobs),
+        )
+        for label, widget in rows:
+            form.addRow(label, widget)
 
         layout.addLayout(form)
 
+        # Validate once per edit instead of on every button press
+        self.geom_path.textChanged.connect(self._geom_edited)
+        self.geom_path.editingFinished.connect(self._validate_geom)
+        self.out_path.textChanged.connect(self._out_edited)
+        self.out_path.editingFinished.connect(self._validate_out)
+        # Dimension fields only accept numbers; "." decimal regardless of locale
+        dim_validator = QtGui.QDoubleValidator(0.0, 1e6, 6, self)
+        dim_validator.setLocale(QtCore.QLocale.c())
+        for field in (self.L_field, self.W_field, self.H_field):
+            field.setValidator(dim_validator)
+            field.textChanged.connect(self._validate_dims)
+
         # --------------------------
         # SECTION: Pipeline Buttons
         # --------------------------
@@ -73,10 +190,10 @@ class MainWindow(QtWidgets.QWidget):
         self.btn_ut = QtWidgets.QPushButton("Run Undertray")
         self.btn_hc = QtWidgets.QPushButton("Run Half Car")
 
-        self.btn_fw.clicked.connect(lambda: self.add_job("fw"))
-        self.btn_rw.clicked.connect(lambda: self.add_job("rw"))
-        self.btn_ut.clicked.connect(lambda: self.add_job("ut"))
-        self.btn_hc.clicked.connect(lambda: self.add_job("hc"))
+        self.btn_fw.clicked.connect(partial(self.add_job, "fw"))
+        self.btn_rw.clicked.connect(partial(self.add_job, "rw"))
+        self.btn_ut.clicked.connect(partial(self.add_job, "ut"))
+        self.btn_hc.clicked.connect(partial(self.add_job, "hc"))
 
         btn_layout.addWidget(self.btn_fw)
         btn_layout.addWidget(self.btn_rw)
@@ -84,6 +201,7 @@ class MainWindow(QtWidgets.QWidget):
         btn_layout.addWidget(self.btn_hc)
 
         layout.addLayout(btn_layout)
+        self._validate_dims()
 
         # --------------------------
         # SECTION: Queue Controls
@@ -92,26 +210,44 @@ class MainWindow(QtWidgets.QWidget):
 
         add_queue = QtWidgets.QPushButton("Add to Queue Only")
         start_queue = QtWidgets.QPushButton("Start Queue")
+        self.btn_stop_queue = QtWidgets.QPushButton("Stop Queue")
+        self.btn_stop_queue.setEnabled(False)
 
         add_queue.clicked.connect(self.add_to_queue_only)
         start_queue.clicked.connect(self.start_queue)
+        self.btn_stop_queue.clicked.connect(self.stop_queue)
 
         queue_controls.addWidget(add_queue)
         queue_controls.addWidget(start_queue)
+        queue_controls.addWidget(self.btn_stop_queue)
 
         layout.addLayout(queue_controls)
 
+        # --------------------------
+        # SECTION: Progress
+        # --------------------------
+        self.progress_label = QtWidgets.QLabel("Idle")
+        self.progress_bar = QtWidgets.QProgressBar()
+        self.progress_bar.setRange(0, 100)
+
+        layout.addWidget(self.progress_label)
+        layout.addWidget(self.progress_bar)
+
         # --------------------------
         # SECTION: Log Window
         # --------------------------
-        self.log_box = QtWidgets.QTextEdit()
+        self.log_box = QtWidgets.QPlainTextEdit()
         self.log_box.setReadOnly(True)
+        self.log_box.setMaximumBlockCount(LOG_MAX_LINES)
         layout.addWidget(self.log_box)
 
         # --------------------------
         # SECTION: Queue Display
         # --------------------------
-        self.queue_list = QtWidgets.QListWidget()
+        self.queue_model = JobListModel(self)
+        self.queue_list = QtWidgets.QListView()
+        self.queue_list.setModel(self.queue_model)
+        self.queue_list.setUniformItemSizes(True)
         layout.addWidget(self.queue_list)
 
         self.setLayout(layout)
@@ -119,46 +255,165 @@ class MainWindow(QtWidgets.QWidget):
     # ============================================================
     # Handlers
     # ============================================================
+    @Slot()
     def browse_geometry(self):
-        fname, _ = QFileDialog.getOpenFileName(
+        last = self._settings.value("last_geom_dir", "")
+        # Native picker: Qt's own dialog stats every entry before it opens
+        url, _ = QFileDialog.getOpenFileUrl(
             self,
             "Select Geometry File",
-            "",
-            "Fluent Geometry (*.dsco *.pmdb);;All Files (*)"
+            QtCore.QUrl.fromLocalFile(last),
+            "Fluent Geometry (*.dsco *.pmdb);;All Files (*)",
+            options=QFileDialog.Option(0)
         )
+        fname = url.toLocalFile()
         if fname:
             self.geom_path.setText(fname)
+            self._validate_geom()
+            self._settings.setValue("last_geom_dir", os.path.dirname(fname))
 
+    @Slot()
     def browse_output(self):
-        folder = QFileDialog.getExistingDirectory(self, "Select Output Folder")
+        last = self._settings.value("last_out_dir", "")
+        folder = QFileDialog.getExistingDirectory(
+            self, "Select Output Folder", last, QFileDialog.Option.ShowDirsOnly
+        )
         if folder:
             self.out_path.setText(folder)
+            self._validate_out()
+            self._settings.setValue("last_out_dir", folder)
 
+    @Slot(str)
     def add_job(self, pipeline_name):
         job = self.build_job(pipeline_name)
         if job:
-            self.manager.add_job(job)
-            self.queue_list.addItem(f"Queued: {job['sim_name']} ({pipeline_name.upper()})")
-
+            try:
+                self.manager.add_job(job)
+            except ValueError as e:
+                self.error(str(e))
+                return
+            self.queue_model.append(job)
+
+    @Slot()
     def add_to_queue_only(self):
         QMessageBox.information(self, "Queue", "Simulation added to queue. Press 'Start Queue' to run.")
 
+    @Slot()
     def start_queue(self):
+        if self.queue_worker is not None and self.queue_worker.isRunning():
+            self.log("Queue is already running.")
+            return
+
         self.log("Starting simulation queue...")
-        self.manager.set_log_callback(self.log)
-        self.manager.run_all()
+        self.manager.max_parallel_jobs = self.parallel_jobs.value()
+        self.queue_worker = QueueWorker(self.manager)
+
+        # Signals are emitted from lane threads: always queue them onto the
+        # GUI thread, so an emit never waits on (or runs) a repaint
+        queued = QtCore.Qt.ConnectionType.QueuedConnection
+        self.queue_worker.log_signal.connect(self.log, queued)
+        self.queue_worker.progress_signal.connect(self.update_progress, queued)
+        self.queue_worker.job_finished_signal.connect(self.job_finished, queued)
+        self.queue_worker.finished_signal.connect(self.queue_finished, queued)
+
+        # The worker mostly waits on Fluent; never let it outrank the GUI
+        self.queue_worker.start(QtCore.QThread.Priority.LowPriority)
+        self.btn_stop_queue.setEnabled(True)
+
+    @Slot()
+    def stop_queue(self):
+        if self.queue_worker is None or not self.queue_worker.isRunning():
+            return
+        self.log("Stopping queue after the running simulations finish...")
+        self.btn_stop_queue.setEnabled(False)
+        self.queue_worker.request_stop()
+
+    @Slot(str, int)
+    def update_progress(self, sim_name, stage):
+        label, pct = self._STAGE_MAP[stage] if 0 <= stage < len(self._STAGE_MAP) else ("Unknown", 0)
+        self.progress_label.setText(f"{sim_name}: {label}")
+        if pct != self.progress_bar.value():
+            self.progress_bar.setValue(pct)
+
+    @Slot(dict)
+    def job_finished(self, result):
+        status = "Done" if result["success"] else "FAILED"
+        self.queue_model.remove(result["job"])
+        self.log(f"{status}: {result['sim_name']}")
+
+    @Slot()
+    def queue_finished(self):
+        self.btn_stop_queue.setEnabled(False)
         self.log("Queue finished.")
 
+    # ============================================================
+    # Input validation
+    # ============================================================
+    def _mark(self, field, ok):
+        # setStyleSheet repolishes the widget, so only call it on a change
+        style = "" if ok else _INVALID_FIELD_STYLE
+        if field.styleSheet() != style:
+            field.setStyleSheet(style)
+
+    @Slot()
+    def _geom_edited(self):
+        self._geom_ok = None
+        self._mark(self.geom_path, True)
+        self._refresh_buttons()
+
+    @Slot()
+    def _out_edited(self):
+        self._out_ok = None
+        self._mark(self.out_path, True)
+        self._refresh_buttons()
+
+    @Slot()
+    def _validate_geom(self):
+        geom = self.geom_path.text().strip()
+        self._geom_ok = bool(geom) and Path(geom).is_file()
+        self._mark(self.geom_path, self._geom_ok)
+        self._refresh_buttons()
+
+    @Slot()
+    def _validate_out(self):
+        outdir = self.out_path.text().strip()
+        self._out_ok = bool(outdir) and Path(outdir).is_dir()
+        self._mark(self.out_path, self._out_ok)
+        self._refresh_buttons()
+
+    @Slot()
+    def _validate_dims(self):
+        fields = (self.L_field, self.W_field, self.H_field)
+        # The validator rejects bad keystrokes; only partial input ("", "1.") can remain
+        if all(field.hasAcceptableInput() for field in fields):
+            self._dims = tuple(float(field.text()) for field in fields)
+        else:
+            self._dims = None
+        for field in fields:
+            self._mark(field, field.hasAcceptableInput())
+        self._refresh_buttons()
+
+    def _refresh_buttons(self):
+        # Unchecked fields (None) don't disable anything; build_job checks them
+        ok = (self._geom_ok is not False and self._out_ok is not False
+              and self._dims is not None)
+        for btn in (self.btn_fw, self.btn_rw, self.btn_ut, self.btn_hc):
+            btn.setEnabled(ok)
+
     def build_job(self, sim_type):
         geom = self.geom_path.text().strip()
         outdir = self.out_path.text().strip()
         name = self.sim_name.text().strip()
 
-        if not geom or not os.path.exists(geom):
+        if self._geom_ok is None:
+            self._validate_geom()
+        if not self._geom_ok:
             self.error("Geometry file invalid.")
             return None
 
-        if not outdir or not os.path.exists(outdir):
+        if self._out_ok is None:
+            self._validate_out()
+        if not self._out_ok:
             self.error("Output folder invalid.")
             return None
 
@@ -166,39 +421,43 @@ class MainWindow(QtWidgets.QWidget):
             self.error("Simulation name required.")
             return None
 
-        try:
-            L = float(self.L_field.text())
-            W = float(self.W_field.text())
-            H = float(self.H_field.text())
-        except:
+        if self._dims is None:
             self.error("L, W, H must be numeric.")
             return None
+        L, W, H = self._dims
 
-        if sim_type == "fw":
-            pipeline_class = FrontWingPipeline
-        elif sim_type == "rw":
-            pipeline_class = RearWingPipeline
-        elif sim_type == "ut":
-            pipeline_class = UndertrayPipeline
-        elif sim_type == "hc":
-            pipeline_class = HalfCarPipeline
-        else:
+        pipeline_class = _PIPELINE_MAP.get(sim_type)
+        if pipeline_class is None:
             self.error("Unknown pipeline type.")
             return None
 
-        return {
-            "pipeline_class": pipeline_class,
-            "geom": geom,
-            "outdir": os.path.join(outdir, name),
-            "sim_name": name,
-            "L": L,
-            "W": W,
-            "H": H
-        }
+        return Job(
+            pipeline_class=pipeline_class,
+            geom=geom,
+            outdir=Path(outdir) / name,
+            sim_name=name,
+            L=L,
+            W=W,
+            H=H
+        )
 
+    @Slot(str)
     def log(self, msg):
-        self.log_box.append(msg)
-
+        self._log_pending.append(msg)
+
+    @Slot()
+    def _flush_log(self):
+        if not self._log_pending:
+            return
+        text = "\n".join(self._log_pending)
+        self._log_pending.clear()
+        # appendPlainText follows the end only if the view is already at the
+        # bottom, so scrolling up to read older lines isn't undone here.
+        # Appending may also trim old blocks at the cap; paint once for both.
+        with _batch_updates(self.log_box):
+            self.log_box.appendPlainText(text)
+
+    @Slot(str)
     def error(self, msg):
         QMessageBox.critical(self, "Error", msg)
         self.log(f"ERROR: {msg}")
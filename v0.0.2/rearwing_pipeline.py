@@ -1,8 +1,7 @@
 # rearwing_pipeline.py
 # Rear Wing CFD pipeline (class-based)
 
-import os
-from pipelines import BasePipeline
+from pipelines import BasePipeline, MESH_FILE
 
 
 class RearWingPipeline(BasePipeline):
@@ -17,12 +16,9 @@ class RearWingPipeline(BasePipeline):
     def setup_geometry(self):
         self.log_info("Importing geometry for Rear Wing...")
 
-        workflow = self.session.workflow
-        tasks = workflow.TaskObject
+        self.init_watertight_workflow()
 
-        workflow.InitializeWorkflow(WorkflowType="Watertight Geometry")
-
-        import_geom = tasks["Import Geometry"]
+        import_geom = self._tasks["import"]
         import_geom.Arguments.set_state({
             "FileName": self.geom_path,
             "LengthUnit": "m"
@@ -37,10 +33,7 @@ class RearWingPipeline(BasePipeline):
     def mesh_surface(self):
         self.log_info("Generating Rear Wing surface mesh...")
 
-        workflow = self.session.workflow
-        tasks = workflow.TaskObject
-
-        surface_mesh = tasks["Generate the Surface Mesh"]
+        surface_mesh = self._tasks["surface"]
         surface_mesh.Arguments.set_state({
             "CFDSurfaceMeshControls": {
                 "CurvatureNormalAngle": 12,
@@ -59,10 +52,7 @@ class RearWingPipeline(BasePipeline):
     def mesh_volume(self):
         self.log_info("Generating Rear Wing volume mesh...")
 
-        workflow = self.session.workflow
-        tasks = workflow.TaskObject
-
-        volume_mesh = tasks["Generate the Volume Mesh"]
+        volume_mesh = self._tasks["volume"]
         volume_mesh.Arguments.set_state({
             "Solver": "Fluent",
             "FillWith": "poly-hexcore",
@@ -81,12 +71,15 @@ class RearWingPipeline(BasePipeline):
         tui = self.tui
 
         self.log_info("Loading Rear Wing mesh into solver...")
-        tui.file.read_case(os.path.join(self.output_dir, "mesh.msh.h5"))
+        tui.file.read_case(self.out_file(MESH_FILE))
 
         # Enable GEKO
         self.log_info("Configuring turbulence model (GEKO)...")
         tui.define.models.viscous.gko("yes")
 
+        # The final solve stops early once Cd settles (6000 iterations at most)
+        self.define_drag_report(["rearwing"])
+
         # -------------------------------
         # Stage 1 – Coarse solve
         # -------------------------------
@@ -95,19 +88,14 @@ class RearWingPipeline(BasePipeline):
         self.progress(3)
 
         # -------------------------------
-        # Stage 2 – curvature correction
+        # Stages 2+3 – curvature correction on, final long solve
+        # (identical settings, so one Cd-stability window across both)
         # -------------------------------
-        self.log_info("Solver Ramp 2: enabling curvature correction...")
+        self.log_info("Solver Ramps 2+3: enabling curvature correction, up to 6000 iterations...")
         tui.define.models.viscous.correction_factor("on")
-
-        tui.solve.iterate(1000)
         self.progress(4)
 
-        # -------------------------------
-        # Stage 3 – final long ramp
-        # -------------------------------
-        self.log_info("Solver Ramp 3: 5000 iterations...")
-        tui.solve.iterate(5000)
+        self.iterate_until_stable(6000)
         self.progress(5)
 
         self.log_info("Solver finished for Rear Wing.")
@@ -118,20 +106,15 @@ class RearWingPipeline(BasePipeline):
     def export_results(self):
         self.log_info("Exporting Rear Wing results...")
 
-        tui = self.tui
-
-        case_file = os.path.join(self.output_dir, f"{self.sim_name}.cas.h5")
-        coeff_file = os.path.join(self.output_dir, f"{self.sim_name}_coeffs.txt")
+        case_file = self.out_file(f"{self.sim_name}.cas.h5")
+        coeff_file = self.out_file(f"{self.sim_name}_coeffs.txt")
 
         # Save case+data
-        tui.file.write_case_data(case_file)
+        self.write_case_data(case_file)
 
         # Extract aerodynamic coefficients
         coeffs = self.session.solution.force_monitor.get_force_coefficients()
 
-        with open(coeff_file, "w") as f:
-            f.write("Rear Wing Aerodynamic Coefficients\n")
-            f.write("----------------------------------\n")
-            f.write(str(coeffs))
+        self.write_coefficients(coeff_file, coeffs, "Rear Wing Aerodynamic Coefficients")
 
         self.log_info("Rear Wing result files saved.")
@@ -1,12 +1,68 @@
 # report_gen.py
 # Generates PDF analysis reports for Ram Racing FSAE Aero Automation Suite
 
+import io
+import logging
 import os
+from PIL import Image as PILImage
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib import colors
 
+# Built once per process rather than on every report
+_STYLES = getSampleStyleSheet()
+
+_INFO_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+    ("TEXTCOLOR", (0, 0), (-1, -1), colors.black),
+    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+    ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
+    ("FONTSIZE", (0, 0), (-1, -1), 10),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
+    ("GRID", (0, 0), (-1, -1), 0.3, colors.grey),
+])
+
+_COEFF_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+    ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
+    ("GRID", (0, 0), (-1, -1), 0.3, colors.grey),
+])
+
+logger = logging.getLogger("fluentauto")
+
+# Rows of the coefficient table, in order
+_COEFF_KEYS = ("Cd", "Cl", "SCx", "SCz")
+
+# Image sections in report order: (results["contours"] key, heading)
+_CONTOUR_SECTIONS = (
+    ("pressure", "Pressure Contour"),
+    ("velocity", "Velocity Contour"),
+    ("residuals", "Residual Plot"),
+)
+
+
+def _paragraph(markup, style):
+    """
+    New Paragraph in one of the shared _STYLES. Flowables hold layout
+    state from the build that drew them, so every report gets its own.
+    """
+    return Paragraph(markup, _STYLES[style])
+
+
+def _shrink(path, width, height):
+    """
+    Downsamples an image to 2x its drawn size before embedding, so large
+    contour renders aren't decoded and stored at full resolution.
+    """
+    with PILImage.open(path) as im:
+        im.thumbnail((width * 2, height * 2), PILImage.LANCZOS)
+        buf = io.BytesIO()
+        im.save(buf, "PNG", optimize=True)
+    buf.seek(0)
+    return buf
+
 
 def generate_report(results: dict, outdir: str) -> str:
     """
@@ -38,22 +94,21 @@ def generate_report(results: dict, outdir: str) -> str:
     pdf_path = os.path.join(outdir, "report.pdf")
 
     doc = SimpleDocTemplate(pdf_path, pagesize=letter)
-    styles = getSampleStyleSheet()
     flow = []
 
     # ------------------------------------------------------------
     # Title
     # ------------------------------------------------------------
-    title = Paragraph(
+    title = _paragraph(
         "<para align='center'><b><font size=20>Ram Racing FSAE Aero Automation Suite</font></b></para>",
-        styles["Title"]
+        "Title"
     )
     flow.append(title)
     flow.append(Spacer(1, 24))
 
     subtitle = Paragraph(
         f"<para align='center'><font size=14>CFD Report — {results.get('component','Component')}</font></para>",
-        styles["Title"]
+        _STYLES["Title"]
     )
     flow.append(subtitle)
     flow.append(Spacer(1, 36))
@@ -69,15 +124,7 @@ def generate_report(results: dict, outdir: str) -> str:
     ]
 
     info_table = Table(info_data, colWidths=[160, 360])
-    info_table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-        ("TEXTCOLOR", (0, 0), (-1, -1), colors.black),
-        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-        ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
-        ("FONTSIZE", (0, 0), (-1, -1), 10),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
-        ("GRID", (0, 0), (-1, -1), 0.3, colors.grey),
-    ]))
+    info_table.setStyle(_INFO_TABLE_STYLE)
     flow.append(info_table)
     flow.append(Spacer(1, 24))
 
@@ -85,23 +132,19 @@ def generate_report(results: dict, outdir: str) -> str:
     # Aerodynamic Coefficients Section
     # ------------------------------------------------------------
     coeffs = results.get("coeffs", {})
-    coeff_table_data = [
-        ["Coefficient", "Value"],
-        ["Cd", f"{coeffs.get('Cd','N/A'):.5f}"],
-        ["Cl", f"{coeffs.get('Cl','N/A'):.5f}"],
-        ["SCx", f"{coeffs.get('SCx','N/A'):.5f}"],
-        ["SCz", f"{coeffs.get('SCz','N/A'):.5f}"],
+    missing = [k for k in _COEFF_KEYS if not isinstance(coeffs.get(k), (int, float))]
+    if missing:
+        logger.warning("Report for %s: no value for %s", results.get("component", "?"), ", ".join(missing))
+
+    # Missing values print as N/A instead of crashing the :.5f format
+    coeff_table_data = [["Coefficient", "Value"]] + [
+        [k, "N/A" if k in missing else f"{coeffs[k]:.5f}"] for k in _COEFF_KEYS
     ]
 
     coeff_table = Table(coeff_table_data, colWidths=[200, 150])
-    coeff_table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-        ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
-        ("GRID", (0, 0), (-1, -1), 0.3, colors.grey),
-    ]))
-
-    header = Paragraph("<b><font size=14>Aerodynamic Coefficients</font></b>", styles["Heading2"])
+    coeff_table.setStyle(_COEFF_TABLE_STYLE)
+
+    header = _paragraph("<b><font size=14>Aerodynamic Coefficients</font></b>", "Heading2")
     flow.append(header)
     flow.append(Spacer(1, 12))
     flow.append(coeff_table)
@@ -112,29 +155,23 @@ def generate_report(results: dict, outdir: str) -> str:
     # ------------------------------------------------------------
     contours = results.get("contours", {})
 
-    if os.path.exists(contours.get("pressure", "")):
-        flow.append(Paragraph("<b>Pressure Contour</b>", styles["Heading3"]))
-        flow.append(Image(contours["pressure"], width=420, height=280))
-        flow.append(Spacer(1, 18))
-
-    if os.path.exists(contours.get("velocity", "")):
-        flow.append(Paragraph("<b>Velocity Contour</b>", styles["Heading3"]))
-        flow.append(Image(contours["velocity"], width=420, height=280))
-        flow.append(Spacer(1, 18))
+    # One existence check per image, then a plain loop
+    existing = {k: v for k, v in contours.items() if v and os.path.exists(v)}
 
-    if os.path.exists(contours.get("residuals", "")):
-        flow.append(Paragraph("<b>Residual Plot</b>", styles["Heading3"]))
-        flow.append(Image(contours["residuals"], width=420, height=280))
-        flow.append(Spacer(1, 18))
+    for key, heading in _CONTOUR_SECTIONS:
+        if key in existing:
+            flow.append(_paragraph(f"<b>{heading}</b>", "Heading3"))
+            flow.append(Image(_shrink(existing[key], 420, 280), width=420, height=280))
+            flow.append(Spacer(1, 18))
 
     # ------------------------------------------------------------
     # Notes Section
     # ------------------------------------------------------------
-    notes = Paragraph(
+    notes = _paragraph(
         "<b>Notes:</b><br/>"
         "This report was automatically generated by the "
         "<i>Ram Racing FSAE Aero Automation Suite</i> using Ansys Fluent Python automation.",
-        styles["BodyText"]
+        "BodyText"
     )
     flow.append(notes)
 
@@ -1,8 +1,88 @@
 # simulation_manager.py
 # Thread-safe job execution manager for PySide6 GUI
 
+import logging
 import os
+import queue
+import threading
 import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+
+from pipelines import default_core_count, launch_session, numa_cpu_sets, session_options
+
+# Per-job log file written into each job's output folder
+EVENT_LOG = "event.log"
+
+# Console side of SimulationManager.log; the GUI gets lines via log_callback
+logger = logging.getLogger("fluentauto")
+
+# While the queue runs, log lines are passed on in batches: every
+# LOG_FLUSH_INTERVAL seconds or LOG_FLUSH_LINES lines, whichever comes first.
+# Set FLUENTAUTO_LOG_UNBUFFERED=1 to pass each line on at once (debugging).
+LOG_FLUSH_INTERVAL = 0.05
+LOG_FLUSH_LINES = 64
+LOG_UNBUFFERED = bool(os.environ.get("FLUENTAUTO_LOG_UNBUFFERED"))
+
+# Solver launch options for every job (see pipelines.session_options):
+# FLUENTAUTO_MPI_FABRIC picks Fluent's MPI (e.g. "intel"), unset = Fluent's
+# default; FLUENTAUTO_GPU_SOLVER=1 starts the native GPU solver.
+MPI_FABRIC = os.environ.get("FLUENTAUTO_MPI_FABRIC") or None
+USE_GPU_SOLVER = bool(os.environ.get("FLUENTAUTO_GPU_SOLVER"))
+
+
+class EventLog:
+    """
+    Append-only job log file. write() only appends to an in-memory list;
+    a background thread moves the lines to disk every FLUSH_INTERVAL
+    seconds, so a slow (network) disk never stalls the solver thread.
+    Up to FLUSH_INTERVAL of output can be lost if the process dies.
+    """
+    FLUSH_INTERVAL = 0.5
+
+    def __init__(self, path):
+        self._fh = open(path, "a", buffering=64 * 1024, encoding="utf-8")
+        self._lines = []
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._drain, name="event-log", daemon=True)
+        self._thread.start()
+
+    def write(self, line):
+        with self._lock:
+            self._lines.append(line)
+
+    def _flush(self):
+        with self._lock:
+            lines, self._lines = self._lines, []
+        if lines:
+            self._fh.writelines(lines)
+            self._fh.flush()
+
+    def _drain(self):
+        while not self._closed.wait(self.FLUSH_INTERVAL):
+            self._flush()
+
+    def close(self):
+        self._closed.set()
+        self._thread.join()
+        self._flush()
+        self._fh.close()
+
+
+@dataclass(slots=True, frozen=True)
+class Job:
+    """One queued CFD run, as built by the GUI."""
+    pipeline_class: type
+    geom: str
+    outdir: Path
+    sim_name: str
+    L: float
+    W: float
+    H: float
 
 
 class SimulationManager:
@@ -11,14 +91,42 @@ class SimulationManager:
     Updated for PySide6 QThread-based execution.
     """
 
-    def __init__(self):
-        self.jobs = []
+    def __init__(self, max_parallel_jobs=1, prewarm_solver=True):
+        self.jobs = queue.Queue()  # Filled by the GUI thread, drained by the lanes
+        self._outdirs = set()      # Output folders of queued + running jobs
+        self._outdirs_lock = threading.Lock()
+        self._stop_requested = threading.Event()
         self.log_callback = None
         self.progress_callback = None
+        self._log_buf = []
+        self._log_lock = threading.Lock()
+        self._log_buffering = False  # True while run_all's flusher thread is alive
+
+        # Jobs run at once; 1 = one after another, None = as many as the
+        # cores allow (see parallel_job_count)
+        self.max_parallel_jobs = max_parallel_jobs
+
+        # Start each lane's solver while its first job is still meshing
+        self.prewarm_solver = prewarm_solver
+
+        # Solver ranks per job; None = the pipelines' default (see set_core_count)
+        self.solver_ranks = None
+        self.mpi_fabric = MPI_FABRIC
+        self.use_gpu_solver = USE_GPU_SOLVER
+
+        # Plain console output unless the application configured logging itself
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
 
     # --------------------------------------------------------------
     # Callback setters
     # --------------------------------------------------------------
+    # Both callbacks are called from lane threads, never the GUI thread.
+    # Pass a Qt signal's emit (as QueueWorker does) connected to a @Slot-
+    # decorated receiver, never a widget method directly.
     def set_log_callback(self, fn):
         """Assigns logging callback (GUI-safe)."""
         self.log_callback = fn
@@ -27,84 +135,284 @@ class SimulationManager:
         """Assigns progress stage callback (GUI-safe)."""
         self.progress_callback = fn
 
+    def set_core_count(self, ncores):
+        """Sets the number of Fluent solver processes each job launches."""
+        self.solver_ranks = ncores
+
     # --------------------------------------------------------------
     # Logging utilities
     # --------------------------------------------------------------
     def log(self, msg: str):
-        print(msg)
+        if LOG_UNBUFFERED or not self._log_buffering:
+            self._emit_log(msg)
+            return
+        with self._log_lock:
+            self._log_buf.append(msg)
+            if len(self._log_buf) >= LOG_FLUSH_LINES:
+                self._flush_locked()
+
+    def flush_logs(self):
+        """Passes any buffered log lines on to the console and the GUI."""
+        with self._log_lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        # Emitted under the lock so batches from different lanes stay in order
+        if self._log_buf:
+            self._emit_log("\n".join(self._log_buf))
+            self._log_buf.clear()
+
+    def _emit_log(self, text):
+        logger.info(text)
         if self.log_callback:
-            self.log_callback(msg)
+            self.log_callback(text)
 
-    def progress(self, stage: int):
+    @contextmanager
+    def _buffered_logging(self):
+        """Batches log() output for the duration of the block."""
+        stop = threading.Event()
+
+        def drain():
+            while not stop.wait(LOG_FLUSH_INTERVAL):
+                self.flush_logs()
+
+        flusher = threading.Thread(target=drain, name="log-flush", daemon=True)
+        self._log_buffering = True
+        flusher.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            flusher.join()
+            self._log_buffering = False
+            self.flush_logs()
+
+    def progress(self, sim_name: str, stage: int):
         if self.progress_callback:
-            self.progress_callback(stage)
+            self.progress_callback(sim_name, stage)
+
+    # --------------------------------------------------------------
+    # Per-job event log
+    # --------------------------------------------------------------
+    @contextmanager
+    def job_log(self, job):
+        """
+        Creates the job's output folder and yields a log function that
+        writes to <outdir>/event.log (see EventLog) as well as the GUI.
+        """
+        path = Path(job.outdir) / EVENT_LOG
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            event_log = EventLog(path)
+        except OSError as e:
+            self.log(f"Warning: could not open {path}: {e}")
+            yield self.log
+            return
+
+        def log(msg):
+            event_log.write(f"{msg}\n")
+            self.log(msg)
+
+        try:
+            yield log
+        finally:
+            event_log.close()
 
     # --------------------------------------------------------------
     # Queue handling
     # --------------------------------------------------------------
-    def add_job(self, job_dict):
-        """Adds a job to the queue."""
-        self.jobs.append(job_dict)
+    def add_job(self, job):
+        """
+        Adds a Job to the queue. Raises ValueError if a queued or running
+        job already writes to the same output folder.
+        """
+        outdir = Path(job.outdir).resolve()
+        with self._outdirs_lock:
+            if outdir in self._outdirs:
+                raise ValueError(f"A queued job already writes to {outdir}")
+            self._outdirs.add(outdir)
+        self.jobs.put(job)
+
+    def _release_outdir(self, job):
+        with self._outdirs_lock:
+            self._outdirs.discard(Path(job.outdir).resolve())
 
     def clear(self):
         """Clears job queue."""
-        self.jobs = []
+        try:
+            while True:
+                self._release_outdir(self.jobs.get_nowait())
+        except queue.Empty:
+            pass
+
+    def _next_job(self):
+        if self._stop_requested.is_set():
+            return None
+        try:
+            return self.jobs.get_nowait()
+        except queue.Empty:
+            return None
+
+    def request_stop(self):
+        """
+        Asks run_all() to stop after the jobs currently running.
+        Jobs not yet started stay queued for the next run.
+        """
+        self._stop_requested.set()
 
     # --------------------------------------------------------------
     # Sequential execution (used by QThread)
     # --------------------------------------------------------------
-    def run_single_threadsafe(self, job):
+    def run_single_threadsafe(self, job, sessions=None, cpus=None):
         """
-        Runs ONE CFD job. Called ONLY inside SimulationWorker::run().
+        Runs ONE CFD job on a worker thread (never the GUI thread).
+        sessions is the caller's Fluent session pool, if any; cpus the
+        NUMA node its Fluent processes are pinned to, if any.
         Returns a dictionary describing outcome.
         """
 
-        sim_name = job["sim_name"]
-        self.log(f"===== Starting Simulation: {sim_name} =====")
-
         try:
-            pipeline_class = job["pipeline_class"]
+            with self.job_log(job) as log:
+                return self._run_job(job, sessions, cpus, log)
+        finally:
+            self._release_outdir(job)
+
+    def _run_job(self, job, sessions, cpus, log):
+        sim_name = job.sim_name
+        log(f"===== Starting Simulation: {sim_name} =====")
 
-            # Create output folder
-            os.makedirs(job["outdir"], exist_ok=True)
+        try:
+            pipeline_class = job.pipeline_class
 
             # Instantiate pipeline with injected callbacks
             pipeline = pipeline_class(
-                geom_path=job["geom"],
-                output_dir=job["outdir"],
+                geom_path=job.geom,
+                output_dir=job.outdir,
                 sim_name=sim_name,
-                L=job["L"],
-                W=job["W"],
-                H=job["H"],
-                logfn=self.log,
-                progressfn=self.progress
+                L=job.L,
+                W=job.W,
+                H=job.H,
+                logfn=log,
+                progressfn=partial(self.progress, sim_name),
+                sessions=sessions,
+                solver_ranks=self.solver_ranks,
+                mpi_fabric=self.mpi_fabric,
+                use_gpu_solver=self.use_gpu_solver,
+                cpus=cpus
             )
 
             # Execute pipeline
             result = pipeline.run()
 
-            self.log(f"===== Simulation Complete: {sim_name} =====")
+            log(f"===== Simulation Complete: {sim_name} =====")
             return {
                 "success": True,
+                "job": job,
                 "sim_name": sim_name,
                 "result": result
             }
 
         except Exception as e:
             tb = traceback.format_exc()
-            self.log(f"ERROR during simulation '{sim_name}': {e}")
-            self.log(tb)
+            log(f"ERROR during simulation '{sim_name}': {e}")
+            log(tb)
             return {
                 "success": False,
+                "job": job,
                 "sim_name": sim_name,
                 "error": str(e),
                 "traceback": tb
             }
 
     # --------------------------------------------------------------
-    # Full queue execution (not used with QThread)
+    # Full queue execution
     # --------------------------------------------------------------
-    def run_all(self):
-        """Legacy mode: synchronous queue execution (blocks GUI)."""
-        for job in self.jobs:
-            self.run_single_threadsafe(job)
+    def parallel_job_count(self):
+        """
+        Number of jobs to run side by side: max_parallel_jobs, or with None
+        as many as the cores allow. Each lane keeps a meshing and a solver
+        session open, default_core_count() cores each (solver_ranks for
+        the solver), so a lane counts both.
+        """
+        if self.max_parallel_jobs:
+            lanes = self.max_parallel_jobs
+        else:
+            lane_cores = (self.solver_ranks or default_core_count()) + default_core_count()
+            lanes = (os.cpu_count() or 1) // lane_cores
+        return max(1, min(lanes, self.jobs.qsize()))
+
+    def run_all(self, on_result=None):
+        """
+        Runs every queued job. Jobs are independent Fluent processes, so up
+        to parallel_job_count() of them run at once, one per worker thread
+        ("lane"). Each lane launches one meshing and one solver session,
+        reuses them for its following jobs, and closes them when the queue
+        is empty. With prewarm_solver the solver starts up in the background
+        while the lane's first job is meshing.
+        on_result, if given, receives each job's outcome dict as it finishes
+        (from the lane's thread).
+        """
+        self._stop_requested.clear()
+        if self.jobs.empty():
+            # Nothing to run: don't pre-launch (and license) a solver
+            self.log("Queue is empty.")
+            return
+        lanes = self.parallel_job_count()
+        nodes = self.lane_cpu_sets(lanes)
+        with self._buffered_logging():
+            if lanes == 1:
+                self._run_lane(on_result, nodes[0])
+                return
+
+            self.log(f"Running up to {lanes} jobs in parallel.")
+            with ThreadPoolExecutor(max_workers=lanes) as pool:
+                for future in [pool.submit(self._run_lane, on_result, cpus) for cpus in nodes]:
+                    future.result()
+
+    def lane_cpu_sets(self, lanes):
+        """
+        NUMA node CPU set for each lane, round-robin over the nodes, so a
+        job's ranks share one node's memory. None (no pinning) for every lane
+        on single-node machines or when a node has fewer cores than a job uses.
+        """
+        nodes = [cpus for cpus in numa_cpu_sets() if len(cpus) >= default_core_count()]
+        if not nodes:
+            return [None] * lanes
+        return [nodes[i % len(nodes)] for i in range(lanes)]
+
+    def _run_lane(self, on_result, cpus=None):
+        sessions = {}
+        launcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fluent-launch")
+        try:
+            if self.prewarm_solver:
+                # Picked up (and awaited) by BasePipeline._acquire_session
+                sessions["solver"] = launcher.submit(
+                    launch_session,
+                    "solver",
+                    cpus=cpus,
+                    **session_options(
+                        "solver",
+                        solver_ranks=self.solver_ranks,
+                        mpi_fabric=self.mpi_fabric,
+                        use_gpu_solver=self.use_gpu_solver
+                    )
+                )
+            while (job := self._next_job()) is not None:
+                result = self.run_single_threadsafe(job, sessions, cpus)
+                self.flush_logs()  # The job's last lines before its result
+                if on_result:
+                    on_result(result)
+        finally:
+            self.close_sessions(sessions)
+            launcher.shutdown()
+
+    def close_sessions(self, sessions):
+        """Exits all Fluent sessions in a lane's pool."""
+        for kind, session in sessions.items():
+            try:
+                if isinstance(session, Future):
+                    session = session.result()  # Pre-launched but never used
+                session.exit()
+            except Exception as e:
+                self.log(f"Warning: could not close Fluent {kind} session: {e}")
+        sessions.clear()
@@ -1,8 +1,7 @@
 # undertray_pipeline.py
 # Undertray CFD pipeline for half-car underbody testing (class-based)
 
-import os
-from pipelines import BasePipeline
+from pipelines import BasePipeline, MESH_FILE
 
 
 class UndertrayPipeline(BasePipeline):
@@ -18,12 +17,9 @@ class UndertrayPipeline(BasePipeline):
     def setup_geometry(self):
         self.log_info("Importing geometry for Undertray...")
 
-        workflow = self.session.workflow
-        tasks = workflow.TaskObject
+        self.init_watertight_workflow()
 
-        workflow.InitializeWorkflow(WorkflowType="Watertight Geometry")
-
-        import_geom = tasks["Import Geometry"]
+        import_geom = self._tasks["import"]
         import_geom.Arguments.set_state({
             "FileName": self.geom_path,
             "LengthUnit": "m"
@@ -38,10 +34,7 @@ class UndertrayPipeline(BasePipeline):
     def mesh_surface(self):
         self.log_info("Generating Undertray surface mesh...")
 
-        workflow = self.session.workflow
-        tasks = workflow.TaskObject
-
-        surface_mesh = tasks["Generate the Surface Mesh"]
+        surface_mesh = self._tasks["surface"]
 
         #
         # Undertray typically requires aggressive curvature control
@@ -65,10 +58,7 @@ class UndertrayPipeline(BasePipeline):
     def mesh_volume(self):
         self.log_info("Generating Undertray volume mesh...")
 
-        workflow = self.session.workflow
-        tasks = workflow.TaskObject
-
-        volume_mesh = tasks["Generate the Volume Mesh"]
+        volume_mesh = self._tasks["volume"]
         volume_mesh.Arguments.set_state({
             "Solver": "Fluent",
             "FillWith": "poly-hexcore",
@@ -86,10 +76,11 @@ class UndertrayPipeline(BasePipeline):
     def run_solver_stages(self):
 
         tui = self.tui
-        out_case = os.path.join(self.output_dir, "mesh.msh.h5")
+        out_case = self.out_file(MESH_FILE)
 
         self.log_info("Loading Undertray mesh into solver...")
         tui.file.read_case(out_case)
+        self.resolve_zones()
 
         # -------------------------------
         # Flow conditions
@@ -98,51 +89,36 @@ class UndertrayPipeline(BasePipeline):
 
         self.log_info("Applying boundary conditions...")
 
-        tui.define.boundary_conditions.velocity_inlet(
-            "inlet",
-            "yes",
-            f"{inlet_speed}"
-        )
+        # All setup commands are queued and sent as one scheme block
+        bc = "define/boundary-conditions"
+
+        self.queue_tui(f"{bc}/velocity-inlet inlet yes {inlet_speed}")
 
         # Wheels rotate at 88 rad/s
         wheel_rpm = 88
 
-        rotating_wheels = ["fw", "rw"]
+        rotating_wheels = self.present_zones(["fw", "rw"])
+        if len(rotating_wheels) < 2:
+            self.log_info("Warning: wheel zones missing (OK for isolated UT).")
         for w in rotating_wheels:
-            try:
-                tui.define.boundary_conditions.wall(
-                    w,
-                    "moving-wall",
-                    "yes",
-                    "rotation-rate",
-                    f"{wheel_rpm}",
-                    "z",
-                    "0"
-                )
-            except:
-                self.log_info(f"Warning: wheel zone '{w}' not found (OK for isolated UT).")
+            self.queue_tui(
+                f"{bc}/wall {w} moving-wall yes rotation-rate {wheel_rpm} z 0",
+                required=False
+            )
 
         # Wheel blocks stay stationary
-        wheel_blocks = ["fwb", "rwb"]
-        for wb in wheel_blocks:
-            try:
-                tui.define.boundary_conditions.wall(wb, "stationary-wall", "no")
-            except:
-                pass
+        for wb in self.present_zones(["fwb", "rwb"]):
+            self.queue_tui(f"{bc}/wall {wb} stationary-wall no", required=False)
 
         # Moving ground
         self.log_info("Setting moving ground boundary...")
-        tui.define.boundary_conditions.wall(
-            "ground",
-            "moving-wall",
-            "yes",
-            "speed",
-            f"{inlet_speed}"
-        )
+        self.queue_tui(f"{bc}/wall ground moving-wall yes speed {inlet_speed}")
 
         # Enable GEKO
         self.log_info("Configuring GEKO turbulence model...")
-        tui.define.models.viscous.gko("yes")
+        self.queue_tui("define/models/viscous/gko yes")
+
+        self.flush_tui()
 
         # =====================================================
         # Solver Ramp Sequence
@@ -156,18 +132,14 @@ class UndertrayPipeline(BasePipeline):
         self.progress(3)
 
         # -------------------------------
-        # Stage 2 – curvature correction ON
+        # Stages 2+3 – curvature correction ON, long stabilization run
+        # (identical settings, so one 6000-iteration call)
         # -------------------------------
-        self.log_info("Solver Ramp 2: enabling curvature correction...")
+        self.log_info("Solver Ramps 2+3: enabling curvature correction, 6000 iterations...")
         tui.define.models.viscous.correction_factor("on")
-        tui.solve.iterate(1000)
         self.progress(4)
 
-        # -------------------------------
-        # Stage 3 – long stabilization run
-        # -------------------------------
-        self.log_info("Solver Ramp 3: 5000 iterations...")
-        tui.solve.iterate(5000)
+        tui.solve.iterate(6000)
         self.progress(5)
 
         self.log_info("Solver completed for Undertray.")
@@ -178,20 +150,15 @@ class UndertrayPipeline(BasePipeline):
     def export_results(self):
         self.log_info("Exporting Undertray results...")
 
-        tui = self.tui
-
-        case_file = os.path.join(self.output_dir, f"{self.sim_name}.cas.h5")
-        coeff_file = os.path.join(self.output_dir, f"{self.sim_name}_coeffs.txt")
+        case_file = self.out_file(f"{self.sim_name}.cas.h5")
+        coeff_file = self.out_file(f"{self.sim_name}_coeffs.txt")
 
         # Save case/data
-        tui.file.write_case_data(case_file)
+        self.write_case_data(case_file)
 
         # Extract aerodynamic coefficients
         coeffs = self.session.solution.force_monitor.get_force_coefficients()
 
-        with open(coeff_file, "w") as f:
-            f.write("Undertray Aerodynamic Coefficients\n")
-            f.write("----------------------------------\n")
-            f.write(str(coeffs))
+        self.write_coefficients(coeff_file, coeffs, "Undertray Aerodynamic Coefficients")
 
         self.log_info("Undertray result files saved.")
@@ -2,22 +2,23 @@
 # QThread-based simulation worker for PySide6 GUI
 # Updated: adds CPU-core control + safe session launch + clean logging
 
-from PySide6.QtCore import QThread, Signal
+from PySide6.QtCore import QThread, Signal, Slot
 import traceback
 
 
 class SimulationWorker(QThread):
     # Signals emitted back to the GUI threads
     log_signal = Signal(str)
-    progress_signal = Signal(int)
+    progress_signal = Signal(str, int)  # (sim_name, stage)
     finished_signal = Signal(dict)
     error_signal = Signal(str)
 
-    def __init__(self, job, manager, ncores=60):
+    def __init__(self, job, manager, ncores=None):
         """
-        job: job dictionary from GUI
+        job: Job built by the GUI
         manager: SimulationManager instance
-        ncores: number of Fluent solver cores to launch
+        ncores: number of Fluent solver cores to launch; None = the
+                pipelines' default (default_core_count)
         """
         super().__init__()
         self.job = job
@@ -30,8 +31,8 @@ class SimulationWorker(QThread):
     def log(self, msg):
         self.log_signal.emit(msg)
 
-    def progress(self, stage):
-        self.progress_signal.emit(stage)
+    def progress(self, sim_name, stage):
+        self.progress_signal.emit(sim_name, stage)
 
     # ------------------------------------------------------
     # Main threaded execution
@@ -57,3 +58,32 @@ class SimulationWorker(QThread):
         except Exception as e:
             tb = traceback.format_exc()
             self.error_signal.emit(f"Exception in worker:\n{e}\n\n{tb}")
+
+
+class QueueWorker(QThread):
+    """
+    Runs the whole SimulationManager queue off the GUI thread.
+    Log lines reach the GUI through log_signal (queued connection).
+    """
+    log_signal = Signal(str)
+    progress_signal = Signal(str, int)  # (sim_name, stage)
+    job_finished_signal = Signal(dict)
+    finished_signal = Signal()
+
+    def __init__(self, manager):
+        super().__init__()
+        self.manager = manager
+
+    @Slot()
+    def request_stop(self):
+        """Lets the running jobs finish, then ends the queue (called from the GUI thread)."""
+        self.manager.request_stop()
+
+    def run(self):
+        self.manager.set_log_callback(self.log_signal.emit)
+        self.manager.set_progress_callback(self.progress_signal.emit)
+        try:
+            self.manager.run_all(on_result=self.job_finished_signal.emit)
+        except Exception as e:
+            self.log_signal.emit(f"Exception in queue worker:\n{e}\n\n{traceback.format_exc()}")
+        self.finished_signal.emit()
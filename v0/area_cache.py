@@ -0,0 +1,60 @@
+# area_cache.py
+# Projected-area cache shared by the v0 scripts (RW/HC).
+
+import hashlib
+import json
+import os
+import tempfile
+
+# Projected areas of geometries solved before, keyed by component + geometry
+# file hash; the oldest entries are dropped beyond AREA_CACHE_ENTRIES
+AREA_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".fluentauto_cache", "projected_area.json")
+AREA_CACHE_ENTRIES = 256
+
+
+def geometry_key(geom_path, component):
+    """
+    Cache key for the projected area of component (e.g. "rearwing"):
+    the component name plus the SHA-256 of the geometry file. The name
+    keeps scripts that mesh the same file differently apart.
+    """
+    with open(geom_path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+: hashes through one reused buffer
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+        else:
+            h = hashlib.sha256()
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(block)
+            digest = h.hexdigest()
+    return f"{component}:{digest}"
+
+
+def load_area_cache():
+    try:
+        with open(AREA_CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def store_cached_area(key, area):
+    cache = load_area_cache()
+    cache.pop(key, None)
+    cache[key] = area  # Most recent last
+    for old in list(cache)[:-AREA_CACHE_ENTRIES]:
+        del cache[old]
+
+    try:
+        cache_dir = os.path.dirname(AREA_CACHE_FILE)
+        os.makedirs(cache_dir, exist_ok=True)
+        # Unique temporary name: runs finishing at once never share a file
+        fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(cache, f)
+            os.replace(tmp, AREA_CACHE_FILE)
+        except OSError:
+            os.unlink(tmp)
+            raise
+    except OSError as e:
+        print(f"[Area] WARNING — could not update area cache: {e}")
@@ -0,0 +1,42 @@
+# fluent_helpers.py
+# Small Fluent helpers shared by the v0 scripts (FW/RW/HC/UD).
+
+
+def _tui_forms(commands):
+    return " ".join(
+        '(ti-menu-load-string "{}")'.format(
+            cmd.replace("\\", "/").replace('"', '\\"')
+        )
+        for cmd in commands
+    )
+
+
+def failed_tui_commands(solver, commands):
+    """
+    Runs several TUI command strings in one scheme round-trip and collects
+    each command's result: returns the commands Fluent reported as failed (#f).
+    Raises RuntimeError if Fluent doesn't return one result per command.
+    """
+    results = solver.scheme_eval.scheme_eval(f"(list {_tui_forms(commands)})")
+    if not isinstance(results, (list, tuple)) or len(results) != len(commands):
+        raise RuntimeError(
+            f"Unexpected result for {len(commands)} batched TUI commands: {results!r}"
+        )
+    return [cmd for cmd, ok in zip(commands, results) if ok is False]
+
+
+def present_walls(solver, names):
+    """
+    The names that are wall zones of the loaded mesh, in order; the others
+    are reported and skipped. All names if Fluent can't list its zones.
+    """
+    try:
+        walls = set(solver.setup.boundary_conditions.wall.get_object_names())
+    except Exception as e:
+        print(f"[BC] WARNING — could not list wall zones: {e}")
+        return list(names)
+
+    missing = [n for n in names if n not in walls]
+    if missing:
+        print(f"[BC] Not in this mesh, skipped: {', '.join(missing)}")
+    return [n for n in names if n in walls]
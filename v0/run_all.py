@@ -0,0 +1,63 @@
+# run_all.py
+# Solves the front wing, rear wing and half-car meshes side by side.
+# Each job is its own Fluent process; the threads here only wait on gRPC.
+
+import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from solver_core import SimConfig, run_component_solver
+
+# name → (zones for force coefficients, wheel zones, share of the cores)
+COMPONENTS = {
+    "frontwing": (["frontwing"], (), 1),
+    "rearwing": (["rearwing"], (), 1),
+    "halfcar": (["frontwing", "rearwing", "undertray", "chassis",
+                 "fw", "fwb", "rw", "rwb"], ("fw", "rw", "fwb", "rwb"), 2),
+}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run component solvers concurrently")
+    parser.add_argument("--frontwing", help="Front wing mesh (.msh.h5)")
+    parser.add_argument("--rearwing", help="Rear wing mesh (.msh.h5)")
+    parser.add_argument("--halfcar", help="Half-car mesh (.msh.h5)")
+    parser.add_argument("--outdir", default=os.getcwd(), help="Output folder")
+    # Under SLURM only the allocation's cores are ours, not the whole node's
+    parser.add_argument("--cores", type=int,
+                        default=int(os.environ.get("SLURM_CPUS_ON_NODE") or os.cpu_count() or 1),
+                        help="Cores shared by all jobs")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    jobs = {name: getattr(args, name) for name in COMPONENTS if getattr(args, name)}
+    if not jobs:
+        print("No meshes given; pass --frontwing, --rearwing and/or --halfcar.")
+        return
+
+    # Cores split by each job's share, so the jobs don't oversubscribe the node
+    shares = sum(COMPONENTS[name][2] for name in jobs)
+    os.makedirs(args.outdir, exist_ok=True)
+
+    with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+        futures = {}
+        for name, mesh in jobs.items():
+            zones, wheels, share = COMPONENTS[name]
+            nproc = max(1, args.cores * share // shares)
+            print(f"[Run] {name}: {nproc} processes")
+            cfg = SimConfig(mesh, args.outdir, tuple(zones), name,
+                            wheels=wheels, processor_count=nproc)
+            futures[name] = pool.submit(run_component_solver, cfg, reuse_server=False)
+
+        for name, future in futures.items():
+            try:
+                cd, cl = future.result()
+                print(f"[Done] {name}: Cd = {cd}, Cl = {cl}")
+            except Exception as e:
+                print(f"[Failed] {name}: {e}")
+
+
+if __name__ == "__main__":
+    main()
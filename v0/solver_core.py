@@ -1,73 +1,115 @@
 # solver_core.py
 import os
-import ansys.fluent.core as pyfluent
-
-def run_component_solver(mesh_path, outdir, zones, sim_name):
-    # Launch solver
-    solver = pyfluent.launch_fluent(
-        mode=pyfluent.FluentMode.SOLVER,
-        precision=pyfluent.Precision.DOUBLE,
-        processor_count=16,
-        dimension=3,
-        mpi_type="intel",
-    )
+from dataclasses import dataclass
 
-    solver.solver.File.Read(file_type="mesh", file_name=mesh_path)
+from solver_server import choose_procs, launch_or_connect_solver, launch_solver
 
-    # Units
-    solver.tui.define.units("force", "lbf")
-    solver.tui.define.units("velocity", "mph")
+WHEEL_ZONES = ("fw", "rw", "fwb", "rwb")
 
-    # Turbulence model (GEKO, no curvature correction)
-    solver.tui.define.models.viscous.ke_gko("yes")
-    solver.tui.define.models.viscous.ke_gko.options.production_limiter("yes")
-    solver.tui.define.models.viscous.ke_gko.options.curvature_correction("no")
 
-    # Boundary conditions
-    solver.tui.define.boundary_conditions.velocity_inlet(
-        "inlet", "yes", "velocity-magnitude", "40"
-    )
+@dataclass(slots=True, frozen=True)
+class SimConfig:
+    """
+    One component solve, as run by run_component_solver.
+    processor_count: solver ranks; None = choose_procs (node cores vs mesh size).
+    wheels: wall zones to rotate; empty for meshes without wheels.
+    """
+    mesh_path: str
+    outdir: str
+    zones: tuple[str, ...]
+    sim_name: str
+    velocity_mph: float = 40.0
+    wheel_omega: float = 88.0  # rad/s
+    wheels: tuple[str, ...] = WHEEL_ZONES
+    processor_count: int | None = None
+
+
+def run_component_solver(cfg, reuse_server=True):
+    """
+    Solves one component mesh (a SimConfig) and returns (Cd, Cl).
+    reuse_server: use the solver_server.py session if one is running.
+    Pass False for calls that run side by side (see run_all.py), so each
+    gets its own Fluent process.
+    """
+    processor_count = cfg.processor_count or choose_procs(cfg.mesh_path)
+
+    if reuse_server:
+        solver, shared = launch_or_connect_solver(processor_count)
+    else:
+        solver, shared = launch_solver(processor_count), False
+
+    try:
+        return _solve_component(solver, cfg)
+    finally:
+        if not shared:
+            solver.exit()  # Frees this job's cores, also after a failure
+
+
+def _solve_component(solver, cfg):
+    """Reads cfg's mesh into solver, sets it up, iterates and returns (Cd, Cl)."""
+    import ansys.fluent.core as pyfluent
+
+    mesh_path, outdir, zones, sim_name = cfg.mesh_path, cfg.outdir, cfg.zones, cfg.sim_name
+    velocity = f"{cfg.velocity_mph}"
 
-    solver.tui.define.boundary_conditions.wall(
-        "ground", "yes",
-        "motion", "moving-wall",
-        "moving-wall-speed", "40",
-        "moving-wall-direction", "1", "0", "0"
+    solver.solver.File.Read(file_type="mesh", file_name=mesh_path)
+
+    # Fluent's console output goes to a file, not a pipe nobody drains
+    solver.transcript.start(
+        file_name=os.path.join(outdir, f"{sim_name}.trn"), write_to_stdout=False
     )
 
-    wheels = ["fw", "rw", "fwb", "rwb"]
-    for w in wheels:
+    # Setup writes are queued and sent to Fluent as one batch on exit
+    with pyfluent.BatchOps(solver):
+        # Units
+        solver.tui.define.units("force", "lbf")
+        solver.tui.define.units("velocity", "mph")
+
+        # Turbulence model (GEKO, no curvature correction)
+        solver.tui.define.models.viscous.ke_gko("yes")
+        solver.tui.define.models.viscous.ke_gko.options.production_limiter("yes")
+        solver.tui.define.models.viscous.ke_gko.options.curvature_correction("no")
+
+        # Boundary conditions
+        solver.tui.define.boundary_conditions.velocity_inlet(
+            "inlet", "yes", "velocity-magnitude", velocity
+        )
+
         solver.tui.define.boundary_conditions.wall(
-            w, "yes",
-            "motion", "rotational",
-            "rotation-rate", "88",
-            "rotation-axis-origin", "0", "0", "0",
-            "rotation-axis-direction", "0", "1", "0"
+            "ground", "yes",
+            "motion", "moving-wall",
+            "moving-wall-speed", velocity,
+            "moving-wall-direction", "1", "0", "0"
         )
 
-    # Reference values
-    solver.tui.solve.reference_values.set("velocity", "40")
-    solver.tui.solve.reference_values.set("compute-from", "inlet")
+        for w in cfg.wheels:
+            solver.tui.define.boundary_conditions.wall(
+                w, "yes",
+                "motion", "rotational",
+                "rotation-rate", f"{cfg.wheel_omega}",
+                "rotation-axis-origin", "0", "0", "0",
+                "rotation-axis-direction", "0", "1", "0"
+            )
+
+        # Reference values
+        solver.tui.solve.reference_values.set("velocity", velocity)
+        solver.tui.solve.reference_values.set("compute-from", "inlet")
 
-    # Ramping
-    solver.solution.RunCalculation.iterate(1000)
-    solver.solution.RunCalculation.iterate(1000)
+    # Ramping (phases 1 + 2 share the same setup, so they run as one call)
+    solver.solution.RunCalculation.iterate(2000)
 
     solver.tui.define.models.viscous.ke_gko.options.curvature_correction("yes")
     solver.solution.RunCalculation.iterate(5000)
 
-    # Force extraction
-    solver.tui.report.force_coefficients.setup(
-        "force-coeff",
-        "zone-names", *zones,
-        "reference-area", "1.0",
-        "reference-length", "1.0",
-        "force-vector", "1", "0", "0",
-        "moment-center", "0", "0", "0"
-    )
+    # Force extraction: drag + lift report definitions, computed together in
+    # one pass over the zones (reference area stays at Fluent's default 1.0)
+    report_defs = solver.solution.report_definitions
+    report_defs.drag["cd"] = {"zones": list(zones), "force_vector": [1, 0, 0]}
+    report_defs.lift["cl"] = {"zones": list(zones), "force_vector": [0, 1, 0]}
 
-    cd = solver.tui.report.force_coefficients.c_d()
-    cl = solver.tui.report.force_coefficients.c_l()
+    result = report_defs.compute(report_defs=["cd", "cl"])
+    values = {name: value[0] for entry in result for name, value in entry.items()}
+    cd, cl = values["cd"], values["cl"]
 
     with open(os.path.join(outdir, f"{sim_name}_forces.txt"), "w") as f:
         f.write(f"Cd = {cd}\nCl = {cl}")
@@ -77,3 +119,5 @@ def run_component_solver(mesh_path, outdir, zones, sim_name):
     print("--------------------------------")
     print(f"Cd = {cd}")
     print(f"Cl = {cl}")
+
+    return cd, cl
@@ -0,0 +1,138 @@
+# solver_server.py
+# Starts one long-lived Fluent solver that the v0 scripts connect to instead
+# of launching (20-60 s) a solver of their own for every run.
+#
+#   python solver_server.py --cores 16    # start; leaves Fluent running
+#   python solver_server.py --stop        # shut it down
+#
+# The FW/RW/UD scripts use the session when run with --persistent-session
+# (one run at a time: the session holds a single case); solver_core reuses
+# it while SERVER_INFO_FILE exists. Otherwise they launch their own solver,
+# sized by choose_procs().
+
+import argparse
+import json
+import os
+
+SERVER_INFO_FILE = os.environ.get(
+    "FLUENTAUTO_SERVER_INFO",
+    os.path.join(os.path.expanduser("~"), ".fluentauto_cache", "solver_server.json"),
+)
+
+
+# Solver ranks: every core of the node (SLURM_CPUS_ON_NODE under SLURM), but
+# no fewer than CELLS_PER_CORE cells per rank, so small meshes don't spend
+# their time in MPI traffic. Cells are estimated from the mesh file size.
+CELLS_PER_CORE = int(os.environ.get("FLUENTAUTO_CELLS_PER_CORE", 50000))
+MESH_BYTES_PER_CELL = int(os.environ.get("FLUENTAUTO_MESH_BYTES_PER_CELL", 400))
+MIN_PROCS = 4
+
+# Fluent's native multi-GPU solver, used when a GPU is visible to this
+# process; FLUENTAUTO_GPU=0 forces the CPU solver
+GPU_SOLVER = (os.environ.get("FLUENTAUTO_GPU", "1") != "0"
+              and bool(os.environ.get("CUDA_VISIBLE_DEVICES")))
+
+
+def choose_procs(mesh_path):
+    slurm = os.environ.get("SLURM_CPUS_ON_NODE")
+    cores = int(slurm) if slurm else (os.cpu_count() or 1)
+    try:
+        cells = os.path.getsize(mesh_path) // MESH_BYTES_PER_CELL
+    except OSError:
+        return cores
+
+    nproc = max(min(MIN_PROCS, cores), min(cores, cells // CELLS_PER_CORE))
+    print(f"[Solver] ~{cells} cells → {nproc} of {cores} cores")
+    return nproc
+
+
+def connect_to_server():
+    """Session of the running server, or None if there is none (or it's gone)."""
+    import ansys.fluent.core as pyfluent
+    try:
+        with open(SERVER_INFO_FILE) as f:
+            info = json.load(f)
+    except (OSError, ValueError):
+        return None
+    try:
+        return pyfluent.connect_to_fluent(cleanup_on_exit=False, **info)
+    except Exception as e:
+        print(f"[Server] Could not connect ({e}); ignoring {SERVER_INFO_FILE}")
+        return None
+
+
+def launch_or_connect_solver(processor_count):
+    """
+    Returns (solver, shared). shared is True for the server's session,
+    which the caller must leave running instead of calling exit().
+    """
+    solver = connect_to_server()
+    if solver is not None:
+        print(f"[Solver] Reusing solver server ({SERVER_INFO_FILE})")
+        return solver, True
+    return launch_solver(processor_count), False
+
+
+def launch_solver(processor_count, **options):
+    """
+    Launches a solver on the GPU when GPU_SOLVER is set, falling back to
+    processor_count CPU ranks if the GPU launch fails.
+    """
+    import ansys.fluent.core as pyfluent
+
+    def launch(**gpu):
+        return pyfluent.launch_fluent(
+            mode=pyfluent.FluentMode.SOLVER,
+            precision=pyfluent.Precision.DOUBLE,
+            processor_count=processor_count,
+            dimension=3,
+            mpi_type="intel",
+            **gpu,
+            **options,
+        )
+
+    if GPU_SOLVER:
+        try:
+            solver = launch(gpu=True)
+            print("[Solver] Running on the GPU solver")
+            return solver
+        except Exception as e:
+            print(f"[Solver] GPU launch failed ({e}); using {processor_count} CPU ranks")
+    return launch()
+
+
+def start(cores):
+    if connect_to_server() is not None:
+        print(f"[Server] Already running ({SERVER_INFO_FILE})")
+        return
+
+    solver = launch_solver(cores, cleanup_on_exit=False)
+    props = solver.connection_properties
+    # The file holds the session's password: readable by this user only
+    os.makedirs(os.path.dirname(SERVER_INFO_FILE), mode=0o700, exist_ok=True)
+    fd = os.open(SERVER_INFO_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        json.dump({"ip": props.ip, "port": props.port, "password": props.password}, f)
+    print(f"[Server] Fluent solver running on {cores} cores → {SERVER_INFO_FILE}")
+
+
+def stop():
+    solver = connect_to_server()
+    if solver is not None:
+        solver.exit()
+        print("[Server] Fluent solver stopped")
+    try:
+        os.remove(SERVER_INFO_FILE)
+    except OSError:
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Long-lived Fluent solver for the v0 scripts")
+    parser.add_argument("--cores", type=int, default=16)
+    parser.add_argument("--stop", action="store_true", help="Shut the server down")
+    args = parser.parse_args()
+    if args.stop:
+        stop()
+    else:
+        start(args.cores)
@@ -5,34 +5,100 @@
 # Isolated Front Wing Geometry (No Wheels)
 ##############################################
 
+import argparse
 import os
-import time
-import math
-import ansys.fluent.core as pyfluent
+import sys
+
+from fluent_helpers import failed_tui_commands
+from solver_server import choose_procs, launch_or_connect_solver, launch_solver
+
+
+# gzip level for the .cas.h5/.dat.h5 files; 0 writes them uncompressed
+HDF5_COMPRESSION_LEVEL = int(os.environ.get("FLUENTAUTO_HDF5_COMPRESSION", 1))
+
+# Refinement mesh sizes (m)
+NEAR_SIZE = 0.016
+MID_SIZE = 0.032
+FAR_SIZE = 0.064
+
+# Near/mid/far boxes as (name, mesh size, Xmin/L, Xmax/L, Ymax/H), scaled to
+# the user's L/W/H. Y runs from the ground up, Z over the half model (0 → W/2).
+BOX_SPECS = (
+    ("local-refinement-near", NEAR_SIZE, -0.65, 2.2, 1.5),
+    ("local-refinement-mid",  MID_SIZE,  -0.72, 4.1, 2.2),
+    ("local-refinement-far",  FAR_SIZE,  -0.78, 6.0, 3.0),
+)
+
+
+def refinement_box(size, xmin, xmax, ymax, L, W, H):
+    return {
+        "CoordinateSpecificationMethod": "Direct",
+        "MeshSize": size,
+        "Xmin": L * xmin, "Xmax": L * xmax,
+        "Ymin": 0, "Ymax": H * ymax,
+        "Zmin": 0, "Zmax": W * 0.5,
+    }
 
 
 ###########################################################
 # ---- INPUT INTERFACE (FRONT WING) ----
 ###########################################################
 
-def ask_user_inputs():
+def parse_args(argv=None):
+    """
+    Command-line inputs for unattended runs (e.g. design sweeps). Anything
+    left out is asked for interactively by ask_user_inputs.
+    """
+    parser = argparse.ArgumentParser(description="FSAE front wing CFD automation")
+    parser.add_argument("--geom", help="Front wing geometry (.step / .stp)")
+    parser.add_argument("--name", help="Simulation name (output folder, default frontwing_sim)")
+    parser.add_argument("--L", type=float, help="Vehicle length (m)")
+    parser.add_argument("--W", type=float, help="Vehicle width (m)")
+    parser.add_argument("--H", type=float, help="Vehicle height (m)")
+    parser.add_argument("--persistent-session", action="store_true",
+                        help="Solve in the solver_server.py session instead of launching one")
+    args = parser.parse_args(argv)
+
+    # Batch jobs have no terminal to prompt on: every input must be given
+    if not sys.stdin.isatty() and (
+        None in (args.L, args.W, args.H) or not (args.geom and os.path.isfile(args.geom))
+    ):
+        parser.error("--geom (an existing file), --L, --W and --H are required "
+                     "when not run from a terminal")
+    return args
+
+
+def ask_user_inputs(args=None):
+    if args is None:
+        args = parse_args()
+
     print("\n===========================================")
     print("      FSAE CFD AUTOMATION — FRONT WING")
     print("===========================================\n")
 
-    geom = input("Enter full path to FRONT WING geometry (.step or .stp): ").strip()
+    geom = args.geom or input("Enter full path to FRONT WING geometry (.step or .stp): ").strip()
     while not os.path.isfile(geom):
         geom = input("❗ File not found. Enter geometry file path again: ").strip()
 
-    sim_name = input("Enter simulation name (e.g., FW_test01): ").strip()
-    if sim_name == "":
+    # Without a terminal (batch job) a missing name means the default
+    sim_name = args.name
+    if sim_name is None and sys.stdin.isatty():
+        sim_name = input("Enter simulation name (e.g., FW_test01): ").strip()
+    if not sim_name:
         sim_name = "frontwing_sim"
 
     # Vehicle dimensions — user supplies L, W, H
-    print("\nENTER VEHICLE BOUNDING BOX DIMENSIONS (M)")
-    L = float(input("Vehicle Length  L (m): ").strip())
-    W = float(input("Vehicle Width   W (m): ").strip())
-    H = float(input("Vehicle Height  H (m): ").strip())
+    L, W, H = args.L, args.W, args.H
+    if None in (L, W, H):
+        print("\nENTER VEHICLE BOUNDING BOX DIMENSIONS (M)")
+    if (L, W, H) == (None, None, None):
+        try:
+            L, W, H = map(float, input("Vehicle L W H (m), space-separated: ").split())
+        except ValueError:
+            print("❗ Expected three numbers — enter them one at a time.")
+    L = L if L is not None else float(input("Vehicle Length  L (m): ").strip())
+    W = W if W is not None else float(input("Vehicle Width   W (m): ").strip())
+    H = H if H is not None else float(input("Vehicle Height  H (m): ").strip())
 
     # Output directory
     outdir = os.path.join(os.getcwd(), sim_name)
@@ -51,11 +117,6 @@ def print_header(msg):
     print("=" * 70 + "\n")
 
 
-def wait():
-    """Small pause for Fluent."""
-    time.sleep(0.25)
-
-
 ###########################################################
 # ---- RESIDUAL MONITOR FUNCTION ----
 ###########################################################
@@ -65,31 +126,31 @@ def get_continuity_residual(solver):
     try:
         res = solver.solution.Monitors.Residual.GetValues()
         return res.get("continuity", None)
-    except:
+    except Exception:
         return None
 
 
-def wait_until_converged(solver, target=1e-4, max_wait=1800):
+def wait_until_converged(solver, target=1e-4):
     """
-    Poll continuity until below threshold (target = 1e-4).
-    max_wait = seconds allowed (default 30 minutes)
+    Checks continuity against the threshold (target = 1e-4).
+    Call after the iterate() has returned: the residual can't change
+    once the calculation has ended, so it is read once, not polled.
     """
-    print("\n[Monitor] Watching continuity residual until < {:.1e}".format(target))
-    start = time.time()
 
-    while True:
-        res = get_continuity_residual(solver)
-        if res is not None:
-            print(f"   continuity = {res:.3e}")
-            if res < target:
-                print("[Monitor] Converged.\n")
-                return True
+    print("\n[Monitor] Checking continuity < {:.1e}".format(target))
 
-        if time.time() - start > max_wait:
-            print("[Monitor] Timeout waiting for convergence.\n")
-            return False
+    res = get_continuity_residual(solver)
+    if res is None:
+        print("[Monitor] WARNING — continuity residual unavailable.\n")
+        return False
 
-        time.sleep(2)
+    print(f"   continuity = {res:.3e}")
+    if res < target:
+        print("[Monitor] Converged.\n")
+        return True
+
+    print("[Monitor] WARNING — not converged.\n")
+    return False
 
 
 ###########################################################
@@ -101,6 +162,14 @@ def save_case_data(solver, outdir):
         case_file = os.path.join(outdir, "final.cas.h5")
         data_file = os.path.join(outdir, "final.dat.h5")
 
+        # Compressed HDF5 (low gzip level: most of the size saving for little CPU);
+        # Fluent versions without cffio-options write uncompressed instead
+        try:
+            solver.tui.file.cff_files("yes")
+            solver.tui.file.cffio_options.compression_level(HDF5_COMPRESSION_LEVEL)
+        except Exception as e:
+            print(f"[Save] HDF5 compression not set ({e}); writing uncompressed")
+
         solver.solver.File.Write(file_type="case", file_name=case_file)
         solver.solver.File.Write(file_type="data", file_name=data_file)
 
@@ -120,21 +189,27 @@ def export_contours(solver, outdir):
     press = os.path.join(outdir, "pressure.png")
     vel = os.path.join(outdir, "velocity.png")
 
-    try:
-        solver.tui.display.set_window(1)
-        solver.tui.display.contour("pressure", "static-pressure", "yes")
-        solver.tui.display.save_picture(press)
-        print(f"[Post] Pressure contour saved → {press}")
-    except:
-        print("[Post] Pressure contour failed.")
+    # Window 1 is selected once and both contours are rendered + saved
+    # in one scheme round-trip, so the surface is uploaded to Fluent's
+    # graphics pipeline in a single display pass. Each picture is reported
+    # from its own contour + save-picture results.
+    pictures = [
+        ("Pressure", "display/contour pressure static-pressure yes", press),
+        ("Velocity", "display/contour velocity velocity-magnitude yes", vel),
+    ]
+    commands = ["display/set-window 1"]
+    for _, contour, png in pictures:
+        commands += [contour, f'display/save-picture "{png}"']
 
     try:
-        solver.tui.display.set_window(1)
-        solver.tui.display.contour("velocity", "velocity-magnitude", "yes")
-        solver.tui.display.save_picture(vel)
-        print(f"[Post] Velocity contour saved → {vel}")
-    except:
-        print("[Post] Velocity contour failed.")
+        failed = failed_tui_commands(solver, commands)
+        for label, contour, png in pictures:
+            if contour in failed or f'display/save-picture "{png}"' in failed:
+                print(f"[Post] {label} contour export failed → {png}")
+            else:
+                print(f"[Post] {label} contour saved → {png}")
+    except Exception as e:
+        print(f"[Post] Contour export failed: {e}")
 
 
 ###########################################################
@@ -155,8 +230,8 @@ def compute_projected_area(solver, outdir):
 
         print(f"[Area] Projected frontal area = {area}\n")
         return float(area)
-    except:
-        print("[Area] ERROR computing projected area.")
+    except Exception as e:
+        print(f"[Area] ERROR computing projected area: {e}")
         return None
 
 
@@ -175,14 +250,12 @@ def extract_aero_coeffs(solver, outdir, area):
         cd = solver.tui.report.force_coefficients.c_d()
         cl = solver.tui.report.force_coefficients.c_l()
 
-        scx = cd * area
-        scz = cl * area
+        # A failed area compute leaves Cd/Cl valid; only SCx/SCz are lost
+        scx = cd * area if area is not None else None
+        scz = cl * area if area is not None else None
 
         with open(txt, "w") as f:
-            f.write(f"Cd = {cd}\n")
-            f.write(f"Cl = {cl}\n")
-            f.write(f"SCx = {scx}\n")
-            f.write(f"SCz = {scz}\n")
+            f.write(f"Cd = {cd}\nCl = {cl}\nSCx = {scx}\nSCz = {scz}\n")
 
         print("\n[Aero Results]")
         print(f"   Cd  = {cd}")
@@ -215,7 +288,6 @@ def run_meshing(session, geom_path, outdir, L, W, H):
         "LengthUnit": "m"
     })
     imp.Execute()
-    wait()
 
 
     ###############################################################
@@ -224,64 +296,14 @@ def run_meshing(session, geom_path, outdir, L, W, H):
 
     print_header("CREATING LOCAL REFINEMENT REGIONS")
 
-    # Fine mesh sizes:
-    near_size = 0.016
-    mid_size  = 0.032
-    far_size  = 0.064
-
-    # Symmetric half-model: Z from 0 → W/2
-    zmin = 0
-    zmax = W * 0.5
-
-    # Define refinement boxes (scaled to user-supplied L/W/H)
-    box_defs = {
-        "local-refinement-near": {
-            "MeshSize": near_size,
-            "Xmin": -L*0.65,
-            "Xmax":  L*2.2,
-            "Ymin":  0,
-            "Ymax":  H*1.5,
-            "Zmin":  zmin,
-            "Zmax":  zmax
-        },
-        "local-refinement-mid": {
-            "MeshSize": mid_size,
-            "Xmin": -L*0.72,
-            "Xmax":  L*4.1,
-            "Ymin":  0,
-            "Ymax":  H*2.2,
-            "Zmin":  zmin,
-            "Zmax":  zmax
-        },
-        "local-refinement-far": {
-            "MeshSize": far_size,
-            "Xmin": -L*0.78,
-            "Xmax":  L*6.0,
-            "Ymin":  0,
-            "Ymax":  H*3.0,
-            "Zmin":  zmin,
-            "Zmax":  zmax
-        },
-    }
-
     add_refine = tasks["Create Local Refinement Regions"]
 
     # Create each refinement region
-    for name, params in box_defs.items():
+    for name, *spec in BOX_SPECS:
         add_refine.AddChildToTask()
         child = tasks[name]
-        child.Arguments.set_state({
-            "CoordinateSpecificationMethod": "Direct",
-            "MeshSize": params["MeshSize"],
-            "Xmin": params["Xmin"],
-            "Xmax": params["Xmax"],
-            "Ymin": params["Ymin"],
-            "Ymax": params["Ymax"],
-            "Zmin": params["Zmin"],
-            "Zmax": params["Zmax"]
-        })
+        child.Arguments.set_state(refinement_box(*spec, L, W, H))
         child.Execute()
-        wait()
 
 
     ###############################################################
@@ -304,7 +326,6 @@ def run_meshing(session, geom_path, outdir, L, W, H):
         "BoundaryNameList": ["frontwing"]
     })
     child.Execute()
-    wait()
 
 
     ###############################################################
@@ -323,7 +344,6 @@ def run_meshing(session, geom_path, outdir, L, W, H):
         "SizeFunctions": "CurvatureProximity"
     })
     surf.Execute()
-    wait()
 
 
     # Improve surface mesh
@@ -333,7 +353,6 @@ def run_meshing(session, geom_path, outdir, L, W, H):
         "FaceQualityLimit": 0.7
     })
     improve_surf.Execute()
-    wait()
 
 
     ###############################################################
@@ -345,7 +364,6 @@ def run_meshing(session, geom_path, outdir, L, W, H):
         "SetupType": "The geometry consists of only fluid regions with no voids"
     })
     desc.Execute()
-    wait()
 
 
     ###############################################################
@@ -353,10 +371,8 @@ def run_meshing(session, geom_path, outdir, L, W, H):
     ###############################################################
 
     tasks["Update Boundaries"].Execute()
-    wait()
 
     tasks["Update Regions"].Execute()
-    wait()
 
 
     ###############################################################
@@ -376,7 +392,6 @@ def run_meshing(session, geom_path, outdir, L, W, H):
         "LastLayerRatio": 1.2
     })
     child.Execute()
-    wait()
 
 
     ###############################################################
@@ -394,7 +409,6 @@ def run_meshing(session, geom_path, outdir, L, W, H):
         "EnableParallel": True
     })
     vol.Execute()
-    wait()
 
 
     ###############################################################
@@ -409,7 +423,6 @@ def run_meshing(session, geom_path, outdir, L, W, H):
         "CellQualityLimit": 0.2
     })
     impv.Execute()
-    wait()
 
 
     ###############################################################
@@ -429,24 +442,21 @@ def run_meshing(session, geom_path, outdir, L, W, H):
 # ---- SOLVER PIPELINE (FRONT WING) ----
 ###########################################################
 
-def run_solver(mesh_path, outdir):
+def run_solver(mesh_path, outdir, persistent_session=False):
     print_header("LAUNCHING FLUENT SOLVER (FRONT WING)")
 
-    solver = pyfluent.launch_fluent(
-        mode=pyfluent.FluentMode.SOLVER,
-        precision=pyfluent.Precision.DOUBLE,
-        processor_count=16,
-        dimension=3,
-        mpi_type="intel",
-    )
-    wait()
+    # The solver_server.py session only on request: it holds one case at a
+    # time, so runs that may overlap (sweeps) each launch their own solver
+    if persistent_session:
+        solver, _ = launch_or_connect_solver(choose_procs(mesh_path))
+    else:
+        solver = launch_solver(choose_procs(mesh_path))
 
     # -------------------------------
     #  LOAD MESH
     # -------------------------------
     print("[Solver] Loading mesh...")
     solver.solver.File.Read(file_type="mesh", file_name=mesh_path)
-    wait()
 
 
     ###############################################################
@@ -456,8 +466,8 @@ def run_solver(mesh_path, outdir):
     try:
         solver.tui.define.units("force", "lbf")
         solver.tui.define.units("velocity", "mph")
-    except:
-        print("[Units] Error assigning units.")
+    except Exception as e:
+        print(f"[Units] Error assigning units: {e}")
 
 
     ###############################################################
@@ -469,8 +479,8 @@ def run_solver(mesh_path, outdir):
         solver.tui.define.models.viscous.ke_gko.options.production_limiter("yes")
         solver.tui.define.models.viscous.ke_gko.options.curvature_correction("no")
         print("[Turbulence] GEKO enabled (curvature correction OFF)")
-    except:
-        print("[Turbulence] ERROR enabling GEKO")
+    except Exception as e:
+        print(f"[Turbulence] ERROR enabling GEKO: {e}")
 
 
     ###############################################################
@@ -484,8 +494,8 @@ def run_solver(mesh_path, outdir):
             "inlet", "yes", "velocity-magnitude", "40"
         )
         print("[BC] inlet = 40 mph")
-    except:
-        print("[BC] ERROR applying inlet velocity")
+    except Exception as e:
+        print(f"[BC] ERROR applying inlet velocity: {e}")
 
     # Moving ground = 40 mph
     try:
@@ -496,8 +506,8 @@ def run_solver(mesh_path, outdir):
             "moving-wall-direction", "1", "0", "0"
         )
         print("[BC] ground = moving at 40 mph")
-    except:
-        print("[BC] ERROR setting ground motion")
+    except Exception as e:
+        print(f"[BC] ERROR setting ground motion: {e}")
 
     # ⚠️ No wheels in front wing geometry → wheel BCs skipped
     print("[BC] Wheels: SKIPPED (isolated front wing geometry)\n")
@@ -512,8 +522,8 @@ def run_solver(mesh_path, outdir):
         solver.tui.solve.reference_values.set("velocity", "40")
         solver.tui.solve.reference_values.set("compute-from", "inlet")
         print("[Reference] Computed from inlet at 40 mph")
-    except:
-        print("[Reference] ERROR assigning reference values")
+    except Exception as e:
+        print(f"[Reference] ERROR assigning reference values: {e}")
 
 
     ###############################################################
@@ -542,39 +552,34 @@ def run_solver(mesh_path, outdir):
             "turb-kinetic-energy", "0.3",
             "turb-diss-rate", "0.3"
         )
-    except:
-        print("[Solver] ERROR setting discretization or relaxation factors")
+    except Exception as e:
+        print(f"[Solver] ERROR setting discretization or relaxation factors: {e}")
 
 
     ###############################################################
     # SOLVER RAMP-UP PHASES
     ###############################################################
 
-    print_header("RAMP-UP PHASE 1 → 1000 ITERATIONS")
-    solver.solution.RunCalculation.iterate(1000)
-    wait()
-
-    print_header("RAMP-UP PHASE 2 → 1000 ITERATIONS")
-    solver.solution.RunCalculation.iterate(1000)
-    wait()
+    # Phases 1 and 2 use identical settings, so they run as one call
+    print_header("RAMP-UP PHASES 1+2 → 2000 ITERATIONS")
+    solver.solution.RunCalculation.iterate(2000)
 
     # Enable curvature correction in Phase 3
     print_header("ENABLING CURVATURE CORRECTION FOR FINAL RUN")
     try:
         solver.tui.define.models.viscous.ke_gko.options.curvature_correction("yes")
-    except:
-        print("[GEKO] ERROR enabling curvature correction")
+    except Exception as e:
+        print(f"[GEKO] ERROR enabling curvature correction: {e}")
 
     print_header("FINAL SOLVER RUN → 5000 ITERATIONS (PHASE 3)")
     solver.solution.RunCalculation.iterate(5000)
-    wait()
 
 
     ###############################################################
     # CONVERGENCE CHECK
     ###############################################################
     print_header("CHECKING CONTINUITY RESIDUAL")
-    converged = wait_until_converged(solver, target=1e-4, max_wait=1800)
+    converged = wait_until_converged(solver, target=1e-4)
 
 
     ###############################################################
@@ -609,13 +614,17 @@ def run_solver(mesh_path, outdir):
 # ---- MAIN WORKFLOW (FRONT WING) ----
 ###########################################################
 
-def main():
+def main(argv=None):
     print_header("FSAE FRONT WING CFD — FULL AUTOMATION")
 
     # ------------------------------------------
     # USER INPUTS
     # ------------------------------------------
-    geom_path, sim_name, outdir, L, W, H = ask_user_inputs()
+    args = parse_args(argv)
+    geom_path, sim_name, outdir, L, W, H = ask_user_inputs(args)
+
+    # Imported after the prompts: loading PyFluent takes seconds
+    import ansys.fluent.core as pyfluent
 
     # ------------------------------------------
     # START MESHING SESSION
@@ -629,7 +638,6 @@ def main():
         dimension=3,
         mpi_type="intel",
     )
-    wait()
 
 
     # ------------------------------------------
@@ -649,7 +657,7 @@ def main():
     # ------------------------------------------
     # RUN SOLVER PIPELINE
     # ------------------------------------------
-    cd, cl, scx, scz = run_solver(mesh_file, outdir)
+    cd, cl, scx, scz = run_solver(mesh_file, outdir, args.persistent_session)
 
 
     # ------------------------------------------
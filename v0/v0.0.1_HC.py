@@ -5,9 +5,97 @@
 ##############################################
 
 import os
-import time
-import math
-import ansys.fluent.core as pyfluent
+
+from area_cache import geometry_key, load_area_cache, store_cached_area
+from fluent_helpers import failed_tui_commands, present_walls
+
+
+###########################################################
+# ---- GLOBAL CONSTANTS ----
+###########################################################
+
+# Refinement mesh sizes (m)
+NEAR_SIZE = 0.016
+MID_SIZE = 0.032
+FAR_SIZE = 0.064
+
+# Vehicle dimensions (m) the refinement boxes scale with
+VEHICLE_L = 3.1
+VEHICLE_W = 1.40462
+VEHICLE_H = 1.19507039
+
+# Near/mid/far boxes as (name, mesh size, Xmin/L, Xmax/L, Ymax/H). Y runs
+# from the ground up, Z over the half car (0 → W/2).
+BOX_SPECS = (
+    ("local-refinement-near", NEAR_SIZE, -0.65, 2.2, 1.5),
+    ("local-refinement-mid",  MID_SIZE,  -0.72, 4.1, 2.2),
+    ("local-refinement-far",  FAR_SIZE,  -0.78, 6.0, 3.0),
+)
+
+
+def refinement_box(size, xmin, xmax, ymax, L, W, H):
+    return {
+        "CoordinateSpecificationMethod": "Direct",
+        "MeshSize": size,
+        "Xmin": L * xmin, "Xmax": L * xmax,
+        "Ymin": 0, "Ymax": H * ymax,
+        "Zmin": 0, "Zmax": W * 0.5,
+    }
+
+
+# Built once at import; identical for every run
+REFINEMENT_BOXES = tuple(
+    (name, refinement_box(*spec, VEHICLE_L, VEHICLE_W, VEHICLE_H))
+    for name, *spec in BOX_SPECS
+)
+
+# Wheel centers (full car) grouped per refinement box, and the margin
+# the box keeps around each wheel center
+WHEEL_CENTERS = {
+    "local-refinement-fw": ((-0.7874, 0.2032, 0.6096), (-0.7874, 0.2032, -0.6096)),
+    "local-refinement-rw": (( 0.7874, 0.2032, 0.5842), ( 0.7874, 0.2032, -0.5842)),
+}
+WHEEL_BOX_RADIUS = 0.20
+
+
+def wheel_box(centers, radius):
+    """Axis-aligned box around the wheel centers, radius beyond each."""
+    lo = [min(axis) - radius for axis in zip(*centers)]
+    hi = [max(axis) + radius for axis in zip(*centers)]
+    return {
+        "CoordinateSpecificationMethod": "Direct",
+        "MeshSize": NEAR_SIZE,
+        "Xmin": lo[0], "Xmax": hi[0],
+        "Ymin": lo[1], "Ymax": hi[1],
+        "Zmin": lo[2], "Zmax": hi[2],
+    }
+
+
+# Built once at import; identical for every run
+WHEEL_BOXES = tuple(
+    (name, wheel_box(centers, WHEEL_BOX_RADIUS)) for name, centers in WHEEL_CENTERS.items()
+)
+
+# Phase 3 runs in chunks of PHASE3_CHUNK iterations (PHASE3_ITERS at most)
+# and stops at the first chunk whose continuity residual is below CONTINUITY_TARGET
+PHASE3_ITERS = 5000
+PHASE3_CHUNK = 100
+CONTINUITY_TARGET = 1e-4
+
+# gzip level for the .cas.h5/.dat.h5 files; 0 writes them uncompressed
+HDF5_COMPRESSION_LEVEL = int(os.environ.get("FLUENTAUTO_HDF5_COMPRESSION", 1))
+
+# Curvature local sizing: shared base state + per-control overrides
+LS_BASE = {
+    "LocalSizingType": "Curvature",
+    "SizeControlType": "Curvature",
+}
+
+LS_SPECS = (
+    ("curvature_stuff",  {"MinSize": 0.001,  "MaxSize": 0.064, "CurvatureNormalAngle": 12, "BoundaryNameList": ["chassis"]}),
+    ("curvature_wheels", {"MinSize": 0.0005, "MaxSize": 0.032, "CurvatureNormalAngle": 18, "BoundaryNameList": ["fw", "rw", "fwb", "rwb"]}),
+    ("curvature_aero",   {"MinSize": 0.0005, "MaxSize": 0.008, "CurvatureNormalAngle": 9,  "BoundaryNameList": ["frontwing", "rearwing", "undertray"]}),
+)
 
 
 ###########################################################
@@ -44,9 +132,18 @@ def print_header(msg):
     print("=" * 65 + "\n")
 
 
-def wait():
-    """Small delay to let Fluent catch up."""
-    time.sleep(0.2)
+def log_transcript(solver, outdir):
+    """
+    Sends Fluent's console output to <outdir>/fluent.trn instead of this
+    script's stdout, so a long headless run is never held up by a full
+    output pipe nobody reads.
+    """
+    trn = os.path.join(outdir, "fluent.trn")
+    try:
+        solver.transcript.start(file_name=trn, write_to_stdout=False)
+        print(f"[Solver] Fluent transcript → {trn}")
+    except Exception as e:
+        print(f"[Solver] WARNING — transcript not redirected: {e}")
 
 
 ###########################################################
@@ -58,31 +155,53 @@ def get_continuity_residual(solver):
     try:
         res = solver.solution.Monitors.Residual.GetValues()
         return res.get("continuity", None)
-    except:
+    except Exception:
         return None
 
 
-def wait_until_converged(solver, target=1e-4, max_wait=300):
+def iterate_until_converged(solver, max_iters, chunk, target):
     """
-    Poll continuity until below threshold.
-    max_wait = seconds allowed
+    Runs up to max_iters iterations in chunks, stopping early once the
+    continuity residual is below target. Returns (iterations run, last
+    continuity read), so the caller needn't fetch the residuals again.
     """
-    print("\n[Monitor] Waiting for continuity < {:.1e}".format(target))
-    t0 = time.time()
+    done, res = 0, None
+    while done < max_iters:
+        n = min(chunk, max_iters - done)
+        solver.solution.RunCalculation.iterate(n)
+        done += n
 
-    while True:
         res = get_continuity_residual(solver)
-        if res is not None:
-            print(f"   continuity = {res:.3e}")
-            if res < target:
-                print("\n[Monitor] Converged.")
-                return True
+        if res is not None and res < target:
+            print(f"[Monitor] continuity {res:.3e} < {target:.1e} after {done} iterations")
+            break
+    return done, res
 
-        if time.time() - t0 > max_wait:
-            print("\n[Monitor] WARNING — Timeout waiting for convergence.")
-            return False
 
-        time.sleep(2)
+def wait_until_converged(solver, target=1e-4, res=None):
+    """
+    Checks continuity against the threshold (target = 1e-4).
+    Call after the iterate() has returned: the residual can't change
+    once the calculation has ended, so it is read once, not polled.
+    res: continuity already read since that iterate(), if any; skips the
+    GetValues() round trip.
+    """
+
+    print("\n[Monitor] Checking continuity < {:.1e}".format(target))
+
+    if res is None:
+        res = get_continuity_residual(solver)
+    if res is None:
+        print("[Monitor] WARNING — continuity residual unavailable.\n")
+        return False
+
+    print(f"   continuity = {res:.3e}")
+    if res < target:
+        print("[Monitor] Converged.\n")
+        return True
+
+    print("[Monitor] WARNING — not converged.\n")
+    return False
 
 
 ###########################################################
@@ -93,8 +212,16 @@ def save_case_data(solver, outdir):
     try:
         case_path = os.path.join(outdir, "final.cas.h5")
         data_path = os.path.join(outdir, "final.dat.h5")
-        solver.solver.File.Write(file_type="case", file_name=case_path)
-        solver.solver.File.Write(file_type="data", file_name=data_path)
+        # gzip the HDF5 output; Fluent builds without cffio-options write it plain
+        try:
+            solver.tui.file.cff_files("yes")
+            solver.tui.file.cffio_options.compression_level(HDF5_COMPRESSION_LEVEL)
+        except Exception as e:
+            print(f"[Save] HDF5 compression not set ({e}); writing uncompressed")
+
+        # Both files in one write: the session runs one command at a time,
+        # so writing them alongside the contour export would only queue
+        solver.solver.File.Write(file_type="case-data", file_name=case_path)
         print(f"[Save] Case saved to: {case_path}")
         print(f"[Save] Data saved to: {data_path}")
     except Exception as e:
@@ -110,36 +237,51 @@ def export_contours(solver, outdir):
     press_png = os.path.join(outdir, "pressure.png")
     vel_png = os.path.join(outdir, "velocity.png")
 
-    try:
-        solver.tui.display.set_window(1)
-        solver.tui.display.contour("pressure", "static-pressure", "yes")
-        solver.tui.display.save_picture(press_png)
-        print(f"[Post] Pressure contour saved → {press_png}")
-    except:
-        print("[Post] Pressure contour failed.")
+    # Window 1 is selected once and both contours are rendered + saved
+    # in one scheme round-trip, so the surface is uploaded to Fluent's
+    # graphics pipeline in a single display pass. Each picture is reported
+    # from its own contour + save-picture results.
+    pictures = [
+        ("Pressure", "display/contour pressure static-pressure yes", press_png),
+        ("Velocity", "display/contour velocity velocity-magnitude yes", vel_png),
+    ]
+    commands = ["display/set-window 1"]
+    for _, contour, png in pictures:
+        commands += [contour, f'display/save-picture "{png}"']
 
     try:
-        solver.tui.display.set_window(1)
-        solver.tui.display.contour("velocity", "velocity-magnitude", "yes")
-        solver.tui.display.save_picture(vel_png)
-        print(f"[Post] Velocity contour saved → {vel_png}")
-    except:
-        print("[Post] Velocity contour failed.")
+        failed = failed_tui_commands(solver, commands)
+        for label, contour, png in pictures:
+            if contour in failed or f'display/save-picture "{png}"' in failed:
+                print(f"[Post] {label} contour export failed → {png}")
+            else:
+                print(f"[Post] {label} contour saved → {png}")
+    except Exception as e:
+        print(f"[Post] Contour export failed: {e}")
 
 
 ###########################################################
 # ---- PROJECTED AREA (METHOD 1) ----
 ###########################################################
 
-def compute_projected_area(solver, outdir):
+def compute_projected_area(solver, outdir, geom_key=None):
     """
     Uses Fluent's Projected Area tool (Method 1)
     Along +X direction.
+    With geom_key, an area cached from an earlier run of the same geometry
+    is set as the reference area instead of being recomputed.
     """
     txt = os.path.join(outdir, "projected_area.txt")
     try:
-        solver.tui.solve.reference_values.compute("projected-area")
-        area = solver.tui.solve.reference_values.area()
+        area = load_area_cache().get(geom_key) if geom_key else None
+        if area is not None:
+            solver.tui.solve.reference_values.set("area", str(area))
+            print("[Area] Reusing cached projected area")
+        else:
+            solver.tui.solve.reference_values.compute("projected-area")
+            area = solver.tui.solve.reference_values.area()
+            if geom_key:
+                store_cached_area(geom_key, float(area))
 
         with open(txt, "w") as f:
             f.write(str(area))
@@ -169,14 +311,12 @@ def extract_aero_coeffs(solver, outdir, area):
         cd = solver.tui.report.force_coefficients.c_d()
         cl = solver.tui.report.force_coefficients.c_l()
 
-        scx = cd * area
-        scz = cl * area
+        # A failed area compute leaves Cd/Cl valid; only SCx/SCz are lost
+        scx = cd * area if area is not None else None
+        scz = cl * area if area is not None else None
 
         with open(txt, "w") as f:
-            f.write(f"Cd: {cd}\n")
-            f.write(f"Cl: {cl}\n")
-            f.write(f"SCx: {scx}\n")
-            f.write(f"SCz: {scz}\n")
+            f.write(f"Cd: {cd}\nCl: {cl}\nSCx: {scx}\nSCz: {scz}\n")
 
         print("\n[Aero]")
         print(f"   Cd  = {cd}")
@@ -194,7 +334,7 @@ def extract_aero_coeffs(solver, outdir, area):
 # ---- MESHING PIPELINE (WATERTIGHT GEOMETRY WORKFLOW) ----
 ###########################################################
 
-def run_meshing(session, geom_path, outdir):
+def run_meshing(session, geom_path, outdir, save_mesh=True):
     workflow = session.workflow
     tasks = workflow.TaskObject
 
@@ -209,7 +349,6 @@ def run_meshing(session, geom_path, outdir):
         "LengthUnit": "m"
     })
     imp.Execute()
-    wait()
 
 
     ###############################################################
@@ -218,109 +357,25 @@ def run_meshing(session, geom_path, outdir):
 
     print_header("CREATING LOCAL REFINEMENT REGIONS")
 
-    # Fine mesh sizes:
-    near_size = 0.016
-    mid_size  = 0.032
-    far_size  = 0.064
-
-    # Vehicle dimensions:
-    L = 3.1
-    W = 1.40462
-    H = 1.19507039
-
-    # Half car: Z from 0 → +W/2
-    zmin = 0
-    zmax = W * 0.5
-
-    # Define refinement boxes per your PDF & requirements:
-    box_defs = {
-        "local-refinement-near": {
-            "MeshSize": near_size,
-            "Xmin": -L*0.65,
-            "Xmax":  L*2.2,
-            "Ymin":  0,
-            "Ymax":  H*1.5,
-            "Zmin":  zmin,
-            "Zmax":  zmax
-        },
-        "local-refinement-mid": {
-            "MeshSize": mid_size,
-            "Xmin": -L*0.72,
-            "Xmax":  L*4.1,
-            "Ymin":  0,
-            "Ymax":  H*2.2,
-            "Zmin":  zmin,
-            "Zmax":  zmax
-        },
-        "local-refinement-far": {
-            "MeshSize": far_size,
-            "Xmin": -L*0.78,
-            "Xmax":  L*6.0,
-            "Ymin":  0,
-            "Ymax":  H*3.0,
-            "Zmin":  zmin,
-            "Zmax":  zmax
-        },
-    }
-
     # Create each refinement region
     add_refine = tasks["Create Local Refinement Regions"]
 
-    for name, params in box_defs.items():
+    for name, params in REFINEMENT_BOXES:
         add_refine.AddChildToTask()
         child = tasks[name]
-        child.Arguments.set_state({
-            "CoordinateSpecificationMethod": "Direct",
-            "MeshSize": params["MeshSize"],
-            "Xmin": params["Xmin"],
-            "Xmax": params["Xmax"],
-            "Ymin": params["Ymin"],
-            "Ymax": params["Ymax"],
-            "Zmin": params["Zmin"],
-            "Zmax": params["Zmax"]
-        })
+        child.Arguments.set_state(params)
         child.Execute()
-        wait()
 
 
     ###############################################################
     # WHEEL REFINEMENT BOXES (FOLLOWS YOUR DOCUMENT)
     ###############################################################
 
-    # Wheel centers – must match your earlier definitions
-    FL = (-0.7874, 0.2032,  0.6096)
-    FR = (-0.7874, 0.2032, -0.6096)
-    RL = ( 0.7874, 0.2032,  0.5842)
-    RR = ( 0.7874, 0.2032, -0.5842)
-
-    wheel_centers = {
-        "local-refinement-fw": [FL, FR],
-        "local-refinement-rw": [RL, RR]
-    }
-
-    wheel_box_radius = 0.20  # 20 cm box radius around each wheel
-
-    for name, centers in wheel_centers.items():
+    for name, params in WHEEL_BOXES:
         add_refine.AddChildToTask()
         child = tasks[name]
-
-        # Compute bounding box around wheels
-        xs = [c[0] for c in centers]
-        ys = [c[1] for c in centers]
-        zs = [c[2] for c in centers]
-
-        child.Arguments.set_state({
-            "CoordinateSpecificationMethod": "Direct",
-            "MeshSize": near_size,
-            "Xmin": min(xs) - wheel_box_radius,
-            "Xmax": max(xs) + wheel_box_radius,
-            "Ymin": min(ys) - wheel_box_radius,
-            "Ymax": max(ys) + wheel_box_radius,
-            "Zmin": min(zs) - wheel_box_radius,
-            "Zmax": max(zs) + wheel_box_radius,
-        })
+        child.Arguments.set_state(params)
         child.Execute()
-        wait()
 
 
     ###############################################################
@@ -331,40 +386,11 @@ def run_meshing(session, geom_path, outdir):
 
     add_sizing = tasks["Add Local Sizing"]
 
-    curvature_groups = {
-        "curvature_stuff": {
-            "Min": 0.001,
-            "Max": 0.064,
-            "Angle": 12,
-            "Labels": ["chassis"],
-        },
-        "curvature_wheels": {
-            "Min": 0.0005,
-            "Max": 0.032,
-            "Angle": 18,
-            "Labels": ["fw", "rw", "fwb", "rwb"],
-        },
-        "curvature_aero": {
-            "Min": 0.0005,
-            "Max": 0.008,
-            "Angle": 9,
-            "Labels": ["frontwing", "rearwing", "undertray"],
-        },
-    }
-
-    for name, params in curvature_groups.items():
+    for name, spec in LS_SPECS:
         add_sizing.AddChildToTask()
         child = tasks[name]
-        child.Arguments.set_state({
-            "LocalSizingType": "Curvature",
-            "SizeControlType": "Curvature",
-            "MinSize": params["Min"],
-            "MaxSize": params["Max"],
-            "CurvatureNormalAngle": params["Angle"],
-            "BoundaryNameList": params["Labels"]
-        })
+        child.Arguments.set_state({**LS_BASE, **spec})
         child.Execute()
-        wait()
 
 
     ###############################################################
@@ -383,7 +409,6 @@ def run_meshing(session, geom_path, outdir):
         "SizeFunctions": "CurvatureProximity"
     })
     surf.Execute()
-    wait()
 
 
     # Improve surface mesh
@@ -393,7 +418,6 @@ def run_meshing(session, geom_path, outdir):
         "FaceQualityLimit": 0.7
     })
     improve_surf.Execute()
-    wait()
 
 
     ###############################################################
@@ -405,7 +429,6 @@ def run_meshing(session, geom_path, outdir):
         "SetupType": "The geometry consists of only fluid regions with no voids"
     })
     desc.Execute()
-    wait()
 
 
     ###############################################################
@@ -413,10 +436,8 @@ def run_meshing(session, geom_path, outdir):
     ###############################################################
 
     tasks["Update Boundaries"].Execute()
-    wait()
 
     tasks["Update Regions"].Execute()
-    wait()
 
 
     ###############################################################
@@ -440,7 +461,6 @@ def run_meshing(session, geom_path, outdir):
     })
 
     child.Execute()
-    wait()
 
 
     ###############################################################
@@ -458,7 +478,6 @@ def run_meshing(session, geom_path, outdir):
         "EnableParallel": True
     })
     vol.Execute()
-    wait()
 
 
     ###############################################################
@@ -473,19 +492,22 @@ def run_meshing(session, geom_path, outdir):
         "CellQualityLimit": 0.2
     })
     impv.Execute()
-    wait()
 
 
     ###############################################################
     # SAVE FINAL MESH
     ###############################################################
 
-    mesh_out = os.path.join(outdir, "mesh.msh.h5")
-    try:
-        session.meshing.SaveMesh(file_name=mesh_out)
-        print(f"[Mesh] Final mesh saved → {mesh_out}")
-    except Exception as e:
-        print(f"[Mesh] ERROR saving mesh: {e}")
+    # The solver takes the mesh straight from this session (see run_solver),
+    # so writing it to disk is only for keeping a copy next to the results.
+    mesh_out = None
+    if save_mesh:
+        mesh_out = os.path.join(outdir, "mesh.msh.h5")
+        try:
+            session.meshing.SaveMesh(file_name=mesh_out)
+            print(f"[Mesh] Final mesh saved → {mesh_out}")
+        except Exception as e:
+            print(f"[Mesh] ERROR saving mesh: {e}")
 
     return mesh_out
 
@@ -493,102 +515,80 @@ def run_meshing(session, geom_path, outdir):
 # ---- SOLVER PIPELINE ----
 ###########################################################
 
-def run_solver(mesh_path, outdir):
-    print_header("LAUNCHING FLUENT SOLVER")
+def run_solver(meshing_session, outdir, geom_key=None):
+    import ansys.fluent.core as pyfluent
+    print_header("SWITCHING MESHING SESSION TO SOLVER")
 
-    solver = pyfluent.launch_fluent(
-        mode=pyfluent.FluentMode.SOLVER,
-        precision=pyfluent.Precision.DOUBLE,
-        processor_count=16,
-        dimension=3,
-        mpi_type="intel",
-    )
-    wait()
-
-    print("[Solver] Reading mesh...")
-    solver.solver.File.Read(file_type="mesh", file_name=mesh_path)
-    wait()
+    # Hands the in-memory volume mesh to the solver: no relaunch, no re-read
+    solver = meshing_session.switch_to_solver()
+    log_transcript(solver, outdir)
 
     ###############################################################
-    # UNITS — LBF & MPH
+    # UNITS, TURBULENCE MODEL, BOUNDARY CONDITIONS, REFERENCE VALUES
     ###############################################################
-    print_header("SETTING UNITS")
-    try:
-        solver.tui.define.units("force", "lbf")
-        solver.tui.define.units("velocity", "mph")
-        print("[Units] Force = lbf, Velocity = mph")
-    except:
-        print("[Units] Unit assignment failed (check available units).")
+    # These only write settings: they are queued and reach Fluent as one
+    # batch when the block exits, which is also where a failure surfaces.
+    # Without them the results are meaningless, so a failure stops the run.
+    print_header("SETTING UNITS, GEKO MODEL, BCs + REFERENCE VALUES")
 
-    ###############################################################
-    # TURBULENCE MODEL — GEKO (NO CURVATURE CORRECTION YET)
-    ###############################################################
-    print_header("SETTING TURBULENCE MODEL")
     try:
-        solver.tui.define.models.viscous.ke_gko("yes")
-        solver.tui.define.models.viscous.ke_gko.options.production_limiter("yes")
-        solver.tui.define.models.viscous.ke_gko.options.curvature_correction("no")
-        print("[Turbulence] GEKO enabled (no curvature correction).")
-    except:
-        print("[Turbulence] ERROR setting GEKO model.")
-
-    ###############################################################
-    # BOUNDARY CONDITIONS
-    ###############################################################
-    print_header("APPLYING BOUNDARY CONDITIONS")
+        with pyfluent.BatchOps(solver):
+            # lbf & mph
+            solver.tui.define.units("force", "lbf")
+            solver.tui.define.units("velocity", "mph")
+
+            # GEKO, no curvature correction yet
+            solver.tui.define.models.viscous.ke_gko("yes")
+            solver.tui.define.models.viscous.ke_gko.options.production_limiter("yes")
+            solver.tui.define.models.viscous.ke_gko.options.curvature_correction("no")
+
+            # 40 mph inlet
+            solver.tui.define.boundary_conditions.velocity_inlet(
+                "inlet", "yes", "velocity-magnitude", "40"
+            )
 
-    # 40 mph inlet
-    try:
-        solver.tui.define.boundary_conditions.velocity_inlet(
-            "inlet", "yes", "velocity-magnitude", "40"
-        )
-        print("[BC] Inlet = 40 mph")
-    except:
-        print("[BC] ERROR setting inlet velocity")
-
-    # Moving ground
-    try:
-        solver.tui.define.boundary_conditions.wall(
-            "ground", "yes",
-            "motion", "moving-wall",
-            "moving-wall-speed", "40",
-            "moving-wall-direction", "1", "0", "0"
-        )
-        print("[BC] Ground moving at 40 mph")
-    except:
-        print("[BC] ERROR setting ground motion")
-
-    # Wheels rotating at 88 rad/s
-    wheels = ["fw", "rw", "fwb", "rwb"]
-    for w in wheels:
-        try:
+            # Moving ground
             solver.tui.define.boundary_conditions.wall(
-                w, "yes",
-                "motion", "rotational",
-                "rotation-rate", "88",
-                "rotation-axis-origin", "0", "0", "0",
-                "rotation-axis-direction", "0", "1", "0"
+                "ground", "yes",
+                "motion", "moving-wall",
+                "moving-wall-speed", "40",
+                "moving-wall-direction", "1", "0", "0"
             )
-            print(f"[BC] Wheel {w} set to 88 rad/s")
-        except:
-            print(f"[BC] ERROR setting wheel: {w}")
 
-    ###############################################################
-    # REFERENCE VALUES (REQUIRED FOR Cd/Cl)
-    ###############################################################
-    print_header("SETTING REFERENCE VALUES")
+            # Reference values (required for Cd/Cl)
+            solver.tui.solve.reference_values.set("velocity", "40")
+            solver.tui.solve.reference_values.set("compute-from", "inlet")
 
-    try:
-        solver.tui.solve.reference_values.set("velocity", "40")
-        solver.tui.solve.reference_values.set("compute-from", "inlet")
+        print("[Units] Force = lbf, Velocity = mph")
+        print("[Turbulence] GEKO enabled (no curvature correction).")
+        print("[BC] Inlet = 40 mph, ground moving at 40 mph")
         print("[Reference] Reference values set from inlet @ 40 mph")
-    except:
-        print("[Reference] ERROR setting reference values")
+    except Exception as e:
+        print(f"[Setup] ERROR applying setup batch: {e}")
+        raise RuntimeError("Solver setup failed; not iterating on a partial setup") from e
+
+    # Wheels + blocks rotating at 88 rad/s: optional zones, in their own
+    # batch so a missing or failing one doesn't undo the setup above
+    wheels = present_walls(solver, ["fw", "rw", "fwb", "rwb"])
+    try:
+        with pyfluent.BatchOps(solver):
+            for w in wheels:
+                solver.tui.define.boundary_conditions.wall(
+                    w, "yes",
+                    "motion", "rotational",
+                    "rotation-rate", "88",
+                    "rotation-axis-origin", "0", "0", "0",
+                    "rotation-axis-direction", "0", "1", "0"
+                )
+        if wheels:
+            print(f"[BC] Wheels {', '.join(wheels)} set to 88 rad/s")
+    except Exception as e:
+        print(f"[BC] WARNING — wheel rotation not applied: {e}")
 
     ###############################################################
     # COMPUTE PROJECTED AREA (METHOD 1)
     ###############################################################
-    area = compute_projected_area(solver, outdir)
+    area = compute_projected_area(solver, outdir, geom_key)
 
     ###############################################################
     # SOLVER CONTROLS
@@ -596,49 +596,46 @@ def run_solver(mesh_path, outdir):
     print_header("CONFIGURING SOLVER CONTROLS")
 
     try:
-        solver.tui.solve.set.p_v_coupling("SIMPLE")
-        solver.tui.solve.set.discretization_scheme("pressure", "PRESTO!")
-        solver.tui.solve.set.discretization_scheme("momentum", "second-order-upwind")
-        solver.tui.solve.set.discretization_scheme("turb-kinetic-energy", "second-order-upwind")
-        solver.tui.solve.set.discretization_scheme("turb-diss-rate", "second-order-upwind")
-
-        solver.tui.solve.set.relaxation_factors(
-            "pressure", "0.2",
-            "momentum", "0.3",
-            "turb-kinetic-energy", "0.3",
-            "turb-diss-rate", "0.3"
-        )
+        with pyfluent.BatchOps(solver):
+            solver.tui.solve.set.p_v_coupling("SIMPLE")
+            solver.tui.solve.set.discretization_scheme("pressure", "PRESTO!")
+            solver.tui.solve.set.discretization_scheme("momentum", "second-order-upwind")
+            solver.tui.solve.set.discretization_scheme("turb-kinetic-energy", "second-order-upwind")
+            solver.tui.solve.set.discretization_scheme("turb-diss-rate", "second-order-upwind")
+
+            solver.tui.solve.set.relaxation_factors(
+                "pressure", "0.2",
+                "momentum", "0.3",
+                "turb-kinetic-energy", "0.3",
+                "turb-diss-rate", "0.3"
+            )
         print("[Solver] Discretization + relaxation set.")
-    except:
-        print("[Solver] ERROR setting solver controls.")
+    except Exception as e:
+        print(f"[Solver] ERROR setting solver controls: {e}")
+        raise RuntimeError("Solver controls failed; not iterating on a partial setup") from e
 
     ###############################################################
     # RAMP-UP ITERATIONS
     ###############################################################
-    print_header("SOLVER RAMP-UP — PHASE 1 (1000 ITERS)")
-    solver.solution.RunCalculation.iterate(1000)
-    wait()
-
-    print_header("SOLVER RAMP-UP — PHASE 2 (1000 ITERS)")
-    solver.solution.RunCalculation.iterate(1000)
-    wait()
+    # Phases 1 and 2 use identical settings, so they run as one call
+    print_header("SOLVER RAMP-UP — PHASES 1+2 (2000 ITERS)")
+    solver.solution.RunCalculation.iterate(2000)
 
     # Enable curvature correction
     print_header("ENABLING CURVATURE CORRECTION (PHASE 3)")
     try:
         solver.tui.define.models.viscous.ke_gko.options.curvature_correction("yes")
         print("[GEKO] Curvature correction enabled.")
-    except:
-        print("[GEKO] ERROR enabling curvature correction.")
+    except Exception as e:
+        print(f"[GEKO] ERROR enabling curvature correction: {e}")
 
-    print_header("SOLVER FULL RUN — PHASE 3 (5000 ITERS)")
-    solver.solution.RunCalculation.iterate(5000)
-    wait()
+    print_header(f"SOLVER FULL RUN — PHASE 3 (UP TO {PHASE3_ITERS} ITERS)")
+    _, last_res = iterate_until_converged(solver, PHASE3_ITERS, PHASE3_CHUNK, CONTINUITY_TARGET)
 
     ###############################################################
     # CHECK CONVERGENCE
     ###############################################################
-    converged = wait_until_converged(solver, target=1e-4, max_wait=1800)
+    converged = wait_until_converged(solver, target=CONTINUITY_TARGET, res=last_res)
 
     ###############################################################
     # AERO COEFFICIENTS
@@ -673,6 +670,9 @@ def main():
     # -------------------------
     geom_path, sim_name, outdir = ask_user_inputs()
 
+    # Imported after the prompts: loading PyFluent takes seconds
+    import ansys.fluent.core as pyfluent
+
     # -------------------------
     # LAUNCH FLUENT MESHING
     # -------------------------
@@ -685,14 +685,13 @@ def main():
         dimension=3,
         mpi_type="intel",
     )
-    wait()
 
     # -------------------------
     # RUN MESHING PIPELINE
     # -------------------------
     print_header("STARTING MESHING PIPELINE")
 
-    mesh_file = run_meshing(
+    run_meshing(
         session=meshing_session,
         geom_path=geom_path,
         outdir=outdir
@@ -705,7 +704,7 @@ def main():
     # -------------------------
     print_header("STARTING SOLVER PIPELINE")
 
-    cd, cl, scx, scz = run_solver(mesh_file, outdir)
+    cd, cl, scx, scz = run_solver(meshing_session, outdir, geometry_key(geom_path, "halfcar"))
 
     # -------------------------
     # FINAL SUMMARY
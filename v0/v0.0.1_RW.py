@@ -5,33 +5,101 @@
 # Isolated Rear Wing Geometry (No Wheels)
 ##############################################
 
+import argparse
+import json
 import os
-import time
-import math
-import ansys.fluent.core as pyfluent
+import sys
+
+from area_cache import geometry_key, load_area_cache, store_cached_area
+from fluent_helpers import failed_tui_commands
+from solver_server import choose_procs, launch_or_connect_solver, launch_solver
+
+
+# gzip level for the .cas.h5/.dat.h5 files; 0 writes them uncompressed
+HDF5_COMPRESSION_LEVEL = int(os.environ.get("FLUENTAUTO_HDF5_COMPRESSION", 1))
+
+# Refinement mesh sizes (m)
+NEAR_SIZE = 0.016
+MID_SIZE = 0.032
+FAR_SIZE = 0.064
+
+# Near/mid/far boxes as (name, mesh size, Xmin/L, Xmax/L, Ymax/H), scaled to
+# the user's L/W/H. Y runs from the ground up, Z over the half model (0 → W/2).
+BOX_SPECS = (
+    ("local-refinement-near", NEAR_SIZE, -0.65, 2.2, 1.5),
+    ("local-refinement-mid",  MID_SIZE,  -0.72, 4.1, 2.2),
+    ("local-refinement-far",  FAR_SIZE,  -0.78, 6.0, 3.0),
+)
+
+
+def refinement_box(size, xmin, xmax, ymax, L, W, H):
+    return {
+        "CoordinateSpecificationMethod": "Direct",
+        "MeshSize": size,
+        "Xmin": L * xmin, "Xmax": L * xmax,
+        "Ymin": 0, "Ymax": H * ymax,
+        "Zmin": 0, "Zmax": W * 0.5,
+    }
 
 
 ###########################################################
 # ---- USER INPUT INTERFACE ----
 ###########################################################
 
-def ask_user_inputs():
+def parse_args(argv=None):
+    """
+    Command-line inputs for unattended runs (e.g. design sweeps). Anything
+    left out is asked for interactively by ask_user_inputs.
+    """
+    parser = argparse.ArgumentParser(description="FSAE rear wing CFD automation")
+    parser.add_argument("--geom", help="Rear wing geometry (.step / .stp)")
+    parser.add_argument("--name", help="Simulation name (output folder, default rearwing_sim)")
+    parser.add_argument("--L", type=float, help="Vehicle length (m)")
+    parser.add_argument("--W", type=float, help="Vehicle width (m)")
+    parser.add_argument("--H", type=float, help="Vehicle height (m)")
+    parser.add_argument("--persistent-session", action="store_true",
+                        help="Solve in the solver_server.py session instead of launching one")
+    args = parser.parse_args(argv)
+
+    # Batch jobs have no terminal to prompt on: every input must be given
+    if not sys.stdin.isatty() and (
+        None in (args.L, args.W, args.H) or not (args.geom and os.path.isfile(args.geom))
+    ):
+        parser.error("--geom (an existing file), --L, --W and --H are required "
+                     "when not run from a terminal")
+    return args
+
+
+def ask_user_inputs(args=None):
+    if args is None:
+        args = parse_args()
+
     print("\n===========================================")
     print("      FSAE CFD AUTOMATION — REAR WING")
     print("===========================================\n")
 
-    geom = input("Enter full path to REAR WING geometry (.step or .stp): ").strip()
+    geom = args.geom or input("Enter full path to REAR WING geometry (.step or .stp): ").strip()
     while not os.path.isfile(geom):
         geom = input("❗ File not found. Enter geometry file path again: ").strip()
 
-    sim_name = input("Enter simulation name (e.g., RW_test01): ").strip()
-    if sim_name == "":
+    # Without a terminal (batch job) a missing name means the default
+    sim_name = args.name
+    if sim_name is None and sys.stdin.isatty():
+        sim_name = input("Enter simulation name (e.g., RW_test01): ").strip()
+    if not sim_name:
         sim_name = "rearwing_sim"
 
-    print("\nENTER VEHICLE BOUNDING BOX DIMENSIONS (M)")
-    L = float(input("Vehicle Length  L (m): ").strip())
-    W = float(input("Vehicle Width   W (m): ").strip())
-    H = float(input("Vehicle Height  H (m): ").strip())
+    L, W, H = args.L, args.W, args.H
+    if None in (L, W, H):
+        print("\nENTER VEHICLE BOUNDING BOX DIMENSIONS (M)")
+    if (L, W, H) == (None, None, None):
+        try:
+            L, W, H = map(float, input("Vehicle L W H (m), space-separated: ").split())
+        except ValueError:
+            print("❗ Expected three numbers — enter them one at a time.")
+    L = L if L is not None else float(input("Vehicle Length  L (m): ").strip())
+    W = W if W is not None else float(input("Vehicle Width   W (m): ").strip())
+    H = H if H is not None else float(input("Vehicle Height  H (m): ").strip())
 
     outdir = os.path.join(os.getcwd(), sim_name)
     os.makedirs(outdir, exist_ok=True)
@@ -49,10 +117,6 @@ def print_header(msg):
     print("=" * 70 + "\n")
 
 
-def wait():
-    time.sleep(0.25)
-
-
 ###########################################################
 # ---- RESIDUAL MONITOR ----
 ###########################################################
@@ -61,27 +125,31 @@ def get_continuity_residual(solver):
     try:
         res = solver.solution.Monitors.Residual.GetValues()
         return res.get("continuity", None)
-    except:
+    except Exception:
         return None
 
 
-def wait_until_converged(solver, target=1e-4, max_wait=1800):
-    print("\n[Monitor] Watching continuity until < {:.1e}".format(target))
-    start = time.time()
+def wait_until_converged(solver, target=1e-4):
+    """
+    Checks continuity against the threshold (target = 1e-4).
+    Call after the iterate() has returned: the residual can't change
+    once the calculation has ended, so it is read once, not polled.
+    """
+
+    print("\n[Monitor] Checking continuity < {:.1e}".format(target))
 
-    while True:
-        res = get_continuity_residual(solver)
-        if res is not None:
-            print(f"   continuity = {res:.3e}")
-            if res < target:
-                print("[Monitor] Converged.\n")
-                return True
+    res = get_continuity_residual(solver)
+    if res is None:
+        print("[Monitor] WARNING — continuity residual unavailable.\n")
+        return False
 
-        if time.time() - start > max_wait:
-            print("[Monitor] Timeout waiting for convergence.\n")
-            return False
+    print(f"   continuity = {res:.3e}")
+    if res < target:
+        print("[Monitor] Converged.\n")
+        return True
 
-        time.sleep(2)
+    print("[Monitor] WARNING — not converged.\n")
+    return False
 
 
 ###########################################################
@@ -93,6 +161,14 @@ def save_case_data(solver, outdir):
         case_file = os.path.join(outdir, "final.cas.h5")
         data_file = os.path.join(outdir, "final.dat.h5")
 
+        # Compressed HDF5 (low gzip level: most of the size saving for little CPU);
+        # Fluent versions without cffio-options write uncompressed instead
+        try:
+            solver.tui.file.cff_files("yes")
+            solver.tui.file.cffio_options.compression_level(HDF5_COMPRESSION_LEVEL)
+        except Exception as e:
+            print(f"[Save] HDF5 compression not set ({e}); writing uncompressed")
+
         solver.solver.File.Write(file_type="case", file_name=case_file)
         solver.solver.File.Write(file_type="data", file_name=data_file)
 
@@ -111,40 +187,54 @@ def export_contours(solver, outdir):
     press = os.path.join(outdir, "pressure.png")
     vel = os.path.join(outdir, "velocity.png")
 
-    try:
-        solver.tui.display.set_window(1)
-        solver.tui.display.contour("pressure", "static-pressure", "yes")
-        solver.tui.display.save_picture(press)
-        print(f"[Post] Pressure contour saved → {press}")
-    except:
-        print("[Post] Pressure contour failed.")
+    # Window 1 is selected once and both contours are rendered + saved
+    # in one scheme round-trip, so the surface is uploaded to Fluent's
+    # graphics pipeline in a single display pass. Each picture is reported
+    # from its own contour + save-picture results.
+    pictures = [
+        ("Pressure", "display/contour pressure static-pressure yes", press),
+        ("Velocity", "display/contour velocity velocity-magnitude yes", vel),
+    ]
+    commands = ["display/set-window 1"]
+    for _, contour, png in pictures:
+        commands += [contour, f'display/save-picture "{png}"']
 
     try:
-        solver.tui.display.set_window(1)
-        solver.tui.display.contour("velocity", "velocity-magnitude", "yes")
-        solver.tui.display.save_picture(vel)
-        print(f"[Post] Velocity contour saved → {vel}")
-    except:
-        print("[Post] Velocity contour failed.")
+        failed = failed_tui_commands(solver, commands)
+        for label, contour, png in pictures:
+            if contour in failed or f'display/save-picture "{png}"' in failed:
+                print(f"[Post] {label} contour export failed → {png}")
+            else:
+                print(f"[Post] {label} contour saved → {png}")
+    except Exception as e:
+        print(f"[Post] Contour export failed: {e}")
 
 
 ###########################################################
 # ---- PROJECTED AREA ----
 ###########################################################
 
-def compute_projected_area(solver, outdir):
-    txt = os.path.join(outdir, "projected_area.txt")
+def compute_projected_area(solver, geom_key=None):
+    """
+    With geom_key, an area cached from an earlier run of the same rear wing
+    geometry (e.g. a sweep over BCs) is set as the reference area instead
+    of being recomputed.
+    """
     try:
-        solver.tui.solve.reference_values.compute("projected-area")
-        area = solver.tui.solve.reference_values.area()
-
-        with open(txt, "w") as f:
-            f.write(str(area))
+        area = load_area_cache().get(geom_key) if geom_key else None
+        if area is not None:
+            solver.tui.solve.reference_values.set("area", str(area))
+            print("[Area] Reusing cached projected area")
+        else:
+            solver.tui.solve.reference_values.compute("projected-area")
+            area = solver.tui.solve.reference_values.area()
+            if geom_key:
+                store_cached_area(geom_key, float(area))
 
         print(f"[Area] Projected frontal area = {area}\n")
         return float(area)
-    except:
-        print("[Area] ERROR computing projected area.")
+    except Exception as e:
+        print(f"[Area] ERROR computing projected area: {e}")
         return None
 
 
@@ -152,21 +242,15 @@ def compute_projected_area(solver, outdir):
 # ---- AERO COEFFICIENT EXTRACTION ----
 ###########################################################
 
-def extract_aero_coeffs(solver, outdir, area):
-    txt = os.path.join(outdir, "aero_coeffs.txt")
-
+def extract_aero_coeffs(solver, area):
+    """Cd, Cl from Fluent's force report; SCx, SCz = Cd*A, Cl*A (saved by write_results)."""
     try:
         cd = solver.tui.report.force_coefficients.c_d()
         cl = solver.tui.report.force_coefficients.c_l()
 
-        scx = cd * area
-        scz = cl * area
-
-        with open(txt, "w") as f:
-            f.write(f"Cd = {cd}\n")
-            f.write(f"Cl = {cl}\n")
-            f.write(f"SCx = {scx}\n")
-            f.write(f"SCz = {scz}\n")
+        # A failed area compute leaves Cd/Cl valid; only SCx/SCz are lost
+        scx = cd * area if area is not None else None
+        scz = cl * area if area is not None else None
 
         print("\n[Aero Results — REAR WING]")
         print(f"   Cd  = {cd}")
@@ -176,10 +260,29 @@ def extract_aero_coeffs(solver, outdir, area):
 
         return cd, cl, scx, scz
 
-    except:
-        print("[Aero] ERROR extracting aero coefficients.")
+    except Exception as e:
+        print(f"[Aero] ERROR extracting aero coefficients: {e}")
         return None, None, None, None
 
+
+###########################################################
+# ---- RESULTS FILE ----
+###########################################################
+
+def write_results(outdir, results):
+    """
+    Writes the run's scalar results (area + coefficients) to
+    results.json in one go, once the solver work is done.
+    """
+    path = os.path.join(outdir, "results.json")
+    try:
+        with open(path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"[Results] Saved → {path}")
+    except OSError as e:
+        print(f"[Results] ERROR writing {path}: {e}")
+
+
 ###########################################################
 # ---- MESHING PIPELINE (REAR WING) ----
 ###########################################################
@@ -199,7 +302,6 @@ def run_meshing(session, geom_path, outdir, L, W, H):
         "LengthUnit": "m"
     })
     imp.Execute()
-    wait()
 
 
     ###############################################################
@@ -208,64 +310,14 @@ def run_meshing(session, geom_path, outdir, L, W, H):
 
     print_header("CREATING LOCAL REFINEMENT REGIONS")
 
-    # Fine mesh preset
-    near_size = 0.016
-    mid_size  = 0.032
-    far_size  = 0.064
-
-    # Symmetric half-model (Z-direction)
-    zmin = 0
-    zmax = W * 0.5
-
-    # Scaled refinement boxes using L/W/H supplied by user
-    box_defs = {
-        "local-refinement-near": {
-            "MeshSize": near_size,
-            "Xmin": -L*0.65,
-            "Xmax":  L*2.2,
-            "Ymin":  0,
-            "Ymax":  H*1.5,
-            "Zmin":  zmin,
-            "Zmax":  zmax
-        },
-        "local-refinement-mid": {
-            "MeshSize": mid_size,
-            "Xmin": -L*0.72,
-            "Xmax":  L*4.1,
-            "Ymin":  0,
-            "Ymax":  H*2.2,
-            "Zmin":  zmin,
-            "Zmax":  zmax
-        },
-        "local-refinement-far": {
-            "MeshSize": far_size,
-            "Xmin": -L*0.78,
-            "Xmax":  L*6.0,
-            "Ymin":  0,
-            "Ymax":  H*3.0,
-            "Zmin":  zmin,
-            "Zmax":  zmax
-        },
-    }
-
     add_refine = tasks["Create Local Refinement Regions"]
 
     # Create refinement regions
-    for name, params in box_defs.items():
+    for name, *spec in BOX_SPECS:
         add_refine.AddChildToTask()
         child = tasks[name]
-        child.Arguments.set_state({
-            "CoordinateSpecificationMethod": "Direct",
-            "MeshSize": params["MeshSize"],
-            "Xmin": params["Xmin"],
-            "Xmax": params["Xmax"],
-            "Ymin": params["Ymin"],
-            "Ymax": params["Ymax"],
-            "Zmin": params["Zmin"],
-            "Zmax": params["Zmax"]
-        })
+        child.Arguments.set_state(refinement_box(*spec, L, W, H))
         child.Execute()
-        wait()
 
 
     ###############################################################
@@ -288,7 +340,6 @@ def run_meshing(session, geom_path, outdir, L, W, H):
         "BoundaryNameList": ["rearwing"]
     })
     child.Execute()
-    wait()
 
 
     ###############################################################
@@ -307,7 +358,6 @@ def run_meshing(session, geom_path, outdir, L, W, H):
         "SizeFunctions": "CurvatureProximity"
     })
     surf.Execute()
-    wait()
 
 
     ###############################################################
@@ -321,7 +371,6 @@ def run_meshing(session, geom_path, outdir, L, W, H):
         "FaceQualityLimit": 0.7
     })
     improve_surf.Execute()
-    wait()
 
 
     ###############################################################
@@ -333,7 +382,6 @@ def run_meshing(session, geom_path, outdir, L, W, H):
         "SetupType": "The geometry consists of only fluid regions with no voids"
     })
     desc.Execute()
-    wait()
 
 
     ###############################################################
@@ -341,10 +389,8 @@ def run_meshing(session, geom_path, outdir, L, W, H):
     ###############################################################
 
     tasks["Update Boundaries"].Execute()
-    wait()
 
     tasks["Update Regions"].Execute()
-    wait()
 
 
     ###############################################################
@@ -364,7 +410,6 @@ def run_meshing(session, geom_path, outdir, L, W, H):
         "LastLayerRatio": 1.2
     })
     child.Execute()
-    wait()
 
 
     ###############################################################
@@ -382,7 +427,6 @@ def run_meshing(session, geom_path, outdir, L, W, H):
         "EnableParallel": True
     })
     vol.Execute()
-    wait()
 
 
     ###############################################################
@@ -397,7 +441,6 @@ def run_meshing(session, geom_path, outdir, L, W, H):
         "CellQualityLimit": 0.2
     })
     impv.Execute()
-    wait()
 
 
     ###############################################################
@@ -417,24 +460,21 @@ def run_meshing(session, geom_path, outdir, L, W, H):
 # ---- SOLVER PIPELINE (REAR WING) ----
 ###########################################################
 
-def run_solver(mesh_path, outdir):
+def run_solver(mesh_path, outdir, geom_key=None, persistent_session=False):
     print_header("LAUNCHING FLUENT SOLVER (REAR WING)")
 
-    solver = pyfluent.launch_fluent(
-        mode=pyfluent.FluentMode.SOLVER,
-        precision=pyfluent.Precision.DOUBLE,
-        processor_count=16,
-        dimension=3,
-        mpi_type="intel",
-    )
-    wait()
+    # The solver_server.py session only on request: it holds one case at a
+    # time, so runs that may overlap (sweeps) each launch their own solver
+    if persistent_session:
+        solver, _ = launch_or_connect_solver(choose_procs(mesh_path))
+    else:
+        solver = launch_solver(choose_procs(mesh_path))
 
     # -------------------------------
     # LOAD MESH
     # -------------------------------
     print("[Solver] Loading mesh...")
     solver.solver.File.Read(file_type="mesh", file_name=mesh_path)
-    wait()
 
 
     ###############################################################
@@ -444,8 +484,8 @@ def run_solver(mesh_path, outdir):
     try:
         solver.tui.define.units("force", "lbf")
         solver.tui.define.units("velocity", "mph")
-    except:
-        print("[Units] Error assigning units.")
+    except Exception as e:
+        print(f"[Units] Error assigning units: {e}")
 
 
     ###############################################################
@@ -457,8 +497,8 @@ def run_solver(mesh_path, outdir):
         solver.tui.define.models.viscous.ke_gko.options.production_limiter("yes")
         solver.tui.define.models.viscous.ke_gko.options.curvature_correction("no")
         print("[Turbulence] GEKO enabled (curvature correction OFF)")
-    except:
-        print("[Turbulence] ERROR enabling GEKO")
+    except Exception as e:
+        print(f"[Turbulence] ERROR enabling GEKO: {e}")
 
 
     ###############################################################
@@ -472,8 +512,8 @@ def run_solver(mesh_path, outdir):
             "inlet", "yes", "velocity-magnitude", "40"
         )
         print("[BC] inlet = 40 mph")
-    except:
-        print("[BC] ERROR applying inlet")
+    except Exception as e:
+        print(f"[BC] ERROR applying inlet: {e}")
 
     # Moving ground
     try:
@@ -484,8 +524,8 @@ def run_solver(mesh_path, outdir):
             "moving-wall-direction", "1", "0", "0"
         )
         print("[BC] ground = moving at 40 mph")
-    except:
-        print("[BC] ERROR applying ground motion")
+    except Exception as e:
+        print(f"[BC] ERROR applying ground motion: {e}")
 
     # No wheels
     print("[BC] Wheels ignored (isolated rear wing geometry)")
@@ -500,15 +540,15 @@ def run_solver(mesh_path, outdir):
         solver.tui.solve.reference_values.set("velocity", "40")
         solver.tui.solve.reference_values.set("compute-from", "inlet")
         print("[Reference] Using inlet reference")
-    except:
-        print("[Reference] ERROR setting reference values")
+    except Exception as e:
+        print(f"[Reference] ERROR setting reference values: {e}")
 
 
     ###############################################################
     # PROJECTED AREA CALCULATION
     ###############################################################
     print_header("COMPUTING PROJECTED FRONTAL AREA")
-    area = compute_projected_area(solver, outdir)
+    area = compute_projected_area(solver, geom_key)
 
 
     ###############################################################
@@ -531,32 +571,27 @@ def run_solver(mesh_path, outdir):
             "turb-diss-rate", "0.3",
         )
 
-    except:
-        print("[Solver] ERROR setting discretization or relaxation factors")
+    except Exception as e:
+        print(f"[Solver] ERROR setting discretization or relaxation factors: {e}")
 
 
     ###############################################################
     # RAMP-UP SOLVER PHASES
     ###############################################################
 
-    print_header("RAMP-UP PHASE 1 → 1000 ITERATIONS")
-    solver.solution.RunCalculation.iterate(1000)
-    wait()
-
-    print_header("RAMP-UP PHASE 2 → 1000 ITERATIONS")
-    solver.solution.RunCalculation.iterate(1000)
-    wait()
+    # Phases 1 and 2 use identical settings, so they run as one call
+    print_header("RAMP-UP PHASES 1+2 → 2000 ITERATIONS")
+    solver.solution.RunCalculation.iterate(2000)
 
     # Turn ON curvature correction for final ramp
     print_header("ENABLING GEKO CURVATURE CORRECTION FOR FINAL RUN")
     try:
         solver.tui.define.models.viscous.ke_gko.options.curvature_correction("yes")
-    except:
-        print("[GEKO] ERROR enabling curvature correction")
+    except Exception as e:
+        print(f"[GEKO] ERROR enabling curvature correction: {e}")
 
     print_header("FINAL RUN → 5000 ITERATIONS")
     solver.solution.RunCalculation.iterate(5000)
-    wait()
 
 
     ###############################################################
@@ -564,7 +599,7 @@ def run_solver(mesh_path, outdir):
     ###############################################################
     print_header("CHECKING CONTINUITY RESIDUAL")
 
-    converged = wait_until_converged(solver, 1e-4, 1800)
+    converged = wait_until_converged(solver, 1e-4)
 
 
     ###############################################################
@@ -574,7 +609,6 @@ def run_solver(mesh_path, outdir):
 
     cd, cl, scx, scz = extract_aero_coeffs(
         solver=solver,
-        outdir=outdir,
         area=area
     )
 
@@ -592,6 +626,15 @@ def run_solver(mesh_path, outdir):
     print_header("SAVING CASE & DATA")
     save_case_data(solver, outdir)
 
+    write_results(outdir, {
+        "ProjectedArea": area,
+        "Cd": cd,
+        "Cl": cl,
+        "SCx": scx,
+        "SCz": scz,
+        "Converged": converged,
+    })
+
 
     print_header("SOLVER COMPLETE — REAR WING FINISHED")
     return cd, cl, scx, scz
@@ -600,13 +643,17 @@ def run_solver(mesh_path, outdir):
 # ---- MAIN WORKFLOW (REAR WING) ----
 ###########################################################
 
-def main():
+def main(argv=None):
     print_header("FSAE REAR WING CFD — FULL AUTOMATION")
 
     # ------------------------------------------
     # USER INPUT
     # ------------------------------------------
-    geom_path, sim_name, outdir, L, W, H = ask_user_inputs()
+    args = parse_args(argv)
+    geom_path, sim_name, outdir, L, W, H = ask_user_inputs(args)
+
+    # Imported after the prompts: loading PyFluent takes seconds
+    import ansys.fluent.core as pyfluent
 
     # ------------------------------------------
     # START MESHER
@@ -620,7 +667,6 @@ def main():
         dimension=3,
         mpi_type="intel",
     )
-    wait()
 
     # ------------------------------------------
     # RUN MESHING PIPELINE
@@ -642,7 +688,9 @@ def main():
     # ------------------------------------------
     cd, cl, scx, scz = run_solver(
         mesh_path=mesh_file,
-        outdir=outdir
+        outdir=outdir,
+        geom_key=geometry_key(geom_path, "rearwing"),
+        persistent_session=args.persistent_session
     )
 
 
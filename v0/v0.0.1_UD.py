@@ -6,10 +6,18 @@
 # Wheels rotate at 88 rad/s — Wheel blocks do NOT move
 ##############################################
 
+import argparse
+import glob
+import json
 import os
-import time
-import math
-import ansys.fluent.core as pyfluent
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from types import MappingProxyType
+
+from fluent_helpers import failed_tui_commands, present_walls
+from solver_server import CELLS_PER_CORE, MESH_BYTES_PER_CELL, SERVER_INFO_FILE, connect_to_server
 
 
 ###########################################################
@@ -18,29 +26,144 @@ import ansys.fluent.core as pyfluent
 
 # Wheel angular velocity (rad/s)
 WHEEL_OMEGA = 88.0
+WHEEL_OMEGA_STR = f"{WHEEL_OMEGA}"
+
+# Confirmed FL + RL wheel centers (half-car, left side); read-only, as the
+# rotation commands and refinement boxes below are built from it at import
+WHEEL_CENTERS = MappingProxyType({
+    "fw": (-0.7874, 0.2032, 0.6096),
+    "rw": ( 0.7874, 0.2032, 0.5842),
+})
+
+# Same centers pre-formatted for TUI commands
+WHEEL_CENTERS_STR = {
+    name: tuple(f"{v}" for v in pos) for name, pos in WHEEL_CENTERS.items()
+}
+
+# Meshing / solver parallelism; both are further capped to one socket
+# (see CPU TOPOLOGY). Solver: keep each rank above CELLS_PER_CORE cells
+# (solver_server.py, FLUENTAUTO_CELLS_PER_CORE overrides per cluster)
+MAX_MESHING_PROCS = 20
+MAX_SOLVER_PROCS = 20
+
+# Launch the solver while the mesh is improved and saved. The launch can't
+# see the mesh file yet, so it uses MAX_SOLVER_PROCS instead of sizing by
+# solver_process_count; set False to launch after the save instead.
+PIPELINE_SOLVER_LAUNCH = True
+
+# Warm start: each run leaves its converged field in WARM_START_DIR, keyed by
+# the vehicle size rounded to WARM_START_BUCKET (m). A later run of a similar
+# size is interpolated from it and needs far fewer ramp iterations.
+WARM_START_DIR = os.environ.get(
+    "FLUENTAUTO_WARM_START_DIR",
+    os.path.join(os.path.expanduser("~"), ".fluentauto_cache", "warm_start"),
+)
+WARM_START_BUCKET = 0.05
+WARM_RAMP_ITERS = 600      # Phases 1+2 when warm-started (cold: 2000)
+WARM_CHUNK_ITERS = 500     # Phase 3 runs in chunks until continuity converges
+
+# gzip level for the .cas.h5/.dat.h5 files; 0 writes them uncompressed
+HDF5_COMPRESSION_LEVEL = int(os.environ.get("FLUENTAUTO_HDF5_COMPRESSION", 1))
+
+# Refinement mesh sizes (m)
+NEAR_SIZE = 0.016
+MID_SIZE = 0.032
+FAR_SIZE = 0.064
+
+# Near/mid/far boxes as (name, mesh size, Xmin/L, Xmax/L, Ymax/H), scaled to
+# the user's L/W/H. Y runs from the ground up, Z over the half model (0 → W/2).
+BOX_SPECS = (
+    ("local-refinement-near", NEAR_SIZE, -0.65, 2.2, 1.5),
+    ("local-refinement-mid",  MID_SIZE,  -0.72, 4.1, 2.2),
+    ("local-refinement-far",  FAR_SIZE,  -0.78, 6.0, 3.0),
+)
+
+
+def refinement_box(size, xmin, xmax, ymax, L, W, H):
+    return {
+        "CoordinateSpecificationMethod": "Direct",
+        "MeshSize": size,
+        "Xmin": L * xmin, "Xmax": L * xmax,
+        "Ymin": 0, "Ymax": H * ymax,
+        "Zmin": 0, "Zmax": W * 0.5,
+    }
+
+
+# Curvature local sizing: shared base state + per-control overrides
+LS_BASE = {
+    "LocalSizingType": "Curvature",
+    "SizeControlType": "Curvature",
+}
+
+LS_SPECS = (
+    ("curvature_undertray",  {"MinSize": 0.0005, "MaxSize": 0.008, "CurvatureNormalAngle": 9,  "BoundaryNameList": ["undertray"]}),
+    ("curvature_wheels",     {"MinSize": 0.0005, "MaxSize": 0.032, "CurvatureNormalAngle": 18, "BoundaryNameList": ["fw", "rw"]}),
+    ("curvature_blocks",     {"MinSize": 0.0005, "MaxSize": 0.032, "CurvatureNormalAngle": 18, "BoundaryNameList": ["fwb", "rwb"]}),
+    ("curvature_bargeboard", {"MinSize": 0.0005, "MaxSize": 0.016, "CurvatureNormalAngle": 12, "BoundaryNameList": ["bargeboard"]}),
+)
+
+# Full set_state payload per control, merged once at import
+LS_PAYLOADS = tuple((name, {**LS_BASE, **spec}) for name, spec in LS_SPECS)
 
 
 ###########################################################
 # ---- USER INPUT HANDLING ----
 ###########################################################
 
-def ask_user_inputs():
+def parse_args(argv=None):
+    """
+    Command-line inputs for unattended runs. Anything left out is asked
+    for interactively by ask_user_inputs.
+    """
+    parser = argparse.ArgumentParser(description="FSAE undertray CFD automation")
+    parser.add_argument("--geom", help="Undertray geometry (.step / .stp)")
+    parser.add_argument("--name", help="Simulation name (output folder)")
+    parser.add_argument("--L", type=float, help="Vehicle length (m)")
+    parser.add_argument("--W", type=float, help="Vehicle width (m)")
+    parser.add_argument("--H", type=float, help="Vehicle height (m)")
+    parser.add_argument("--persistent-session", action="store_true",
+                        help="Solve in the solver_server.py session instead of launching one")
+    args = parser.parse_args(argv)
+
+    # Batch jobs have no terminal to prompt on: every input must be given
+    if not sys.stdin.isatty() and (
+        None in (args.L, args.W, args.H) or not (args.geom and os.path.isfile(args.geom))
+    ):
+        parser.error("--geom (an existing file), --L, --W and --H are required "
+                     "when not run from a terminal")
+    return args
+
+
+def ask_user_inputs(args=None):
+    if args is None:
+        args = parse_args()
+
     print("\n===========================================")
     print("      FSAE CFD AUTOMATION — UNDERTRAY")
     print("===========================================\n")
 
-    geom = input("Enter full path to UNDERTRAY geometry (.step or .stp): ").strip()
+    geom = args.geom or input("Enter full path to UNDERTRAY geometry (.step or .stp): ").strip()
     while not os.path.isfile(geom):
         geom = input("❗ File not found. Enter geometry file path again: ").strip()
 
-    sim_name = input("Enter simulation name (e.g., UT_test01): ").strip()
-    if sim_name == "":
+    # Without a terminal (batch job) a missing name means the default
+    sim_name = args.name
+    if sim_name is None and sys.stdin.isatty():
+        sim_name = input("Enter simulation name (e.g., UT_test01): ").strip()
+    if not sim_name:
         sim_name = "undertray_sim"
 
-    print("\nENTER VEHICLE BOUNDING BOX DIMENSIONS (M)")
-    L = float(input("Vehicle Length  L (m): ").strip())
-    W = float(input("Vehicle Width   W (m): ").strip())
-    H = float(input("Vehicle Height  H (m): ").strip())
+    L, W, H = args.L, args.W, args.H
+    if None in (L, W, H):
+        print("\nENTER VEHICLE BOUNDING BOX DIMENSIONS (M)")
+    if (L, W, H) == (None, None, None):
+        try:
+            L, W, H = map(float, input("Vehicle L W H (m), space-separated: ").split())
+        except ValueError:
+            print("❗ Expected three numbers — enter them one at a time.")
+    L = L if L is not None else float(input("Vehicle Length  L (m): ").strip())
+    W = W if W is not None else float(input("Vehicle Width   W (m): ").strip())
+    H = H if H is not None else float(input("Vehicle Height  H (m): ").strip())
 
     outdir = os.path.join(os.getcwd(), sim_name)
     os.makedirs(outdir, exist_ok=True)
@@ -57,53 +180,123 @@ def print_header(msg):
     print(msg)
     print("=" * 70 + "\n")
 
-def wait():
-    time.sleep(0.25)
+# Set from Fluent's CALCULATIONS_ENDED event; wait() parks on it
+# instead of sleeping a fixed interval.
+_calc_done = threading.Event()
 
 
-###########################################################
-# ---- WHEEL COORDINATES (HALF CAR LEFT SIDE) ----
-###########################################################
+def _on_calculations_ended(*_):
+    _calc_done.set()
+
+
+def _on_iteration_ended(*args):
+    event_info = args[-1]
+    if event_info.index % 500 == 0:
+        print(f"   iteration {event_info.index}")
 
-def get_wheel_centers():
+
+def register_solver_events(solver):
     """
-    Returns the confirmed FL + RL wheel centers for half-car simulation.
-    Wheel blocks DO NOT move.
+    Hooks solver completion + iteration events once per session.
+    Meshing tasks need no hook: Execute() only returns once done.
     """
+    import ansys.fluent.core as pyfluent
+    solver.events.register_callback(
+        pyfluent.SolverEvent.CALCULATIONS_ENDED, _on_calculations_ended
+    )
+    solver.events.register_callback(
+        pyfluent.SolverEvent.ITERATION_ENDED, _on_iteration_ended
+    )
 
-    FL = (-0.7874, 0.2032, 0.6096)
-    RL = ( 0.7874, 0.2032, 0.5842)
 
-    return {"fw": FL, "rw": RL}
+def wait(timeout=5):
+    """
+    Block until Fluent reports the last calculation finished. iterate()
+    already blocks, so the event normally arrives at once; a timeout means
+    it was lost (e.g. callbacks not registered) and is reported, not hidden.
+    """
+    if not _calc_done.wait(timeout):
+        print(f"[Solver] WARNING — no calculation-ended event after {timeout} s; continuing")
+    _calc_done.clear()
 
 
 ###########################################################
 # ---- WHEEL ROTATION BC SETUP ----
 ###########################################################
 
-def apply_wheel_rotation(solver, wheel_name, center):
+def wheel_rotation_command(wheel_name):
     """
-    Applies rotational moving-wall boundary condition to a wheel.
+    Builds the TUI command for a wheel's rotational moving-wall condition.
     Wheel blocks are NOT rotated.
     """
 
-    x, y, z = center
+    x, y, z = WHEEL_CENTERS_STR[wheel_name]
 
-    try:
-        solver.tui.define.boundary_conditions.wall(
-            wheel_name, "yes",
-            "motion", "rotational",
-            "rotational-speed", f"{WHEEL_OMEGA}",
-            "rotation-origin-x", f"{x}",
-            "rotation-origin-y", f"{y}",
-            "rotation-origin-z", f"{z}",
-            "rotation-axis-x", "0",
-            "rotation-axis-y", "1",
-            "rotation-axis-z", "0"
-        )
-        print(f"[BC] Wheel {wheel_name} rotating at {WHEEL_OMEGA} rad/s")
-    except:
-        print(f"[BC] ERROR applying rotation to wheel: {wheel_name}")
+    return (
+        f"define/boundary-conditions/wall {wheel_name} yes "
+        f"motion rotational rotational-speed {WHEEL_OMEGA_STR} "
+        f"rotation-origin-x {x} rotation-origin-y {y} rotation-origin-z {z} "
+        "rotation-axis-x 0 rotation-axis-y 1 rotation-axis-z 0"
+    )
+
+
+# Built once at import; identical for every run
+WHEEL_ROTATION_COMMANDS = {name: wheel_rotation_command(name) for name in WHEEL_CENTERS}
+
+
+###########################################################
+# ---- WHEEL REFINEMENT REGIONS ----
+###########################################################
+
+def wheel_refinement_boxes(wheel_name):
+    """
+    Local refinement tasks around one wheel: a cylinder on the wheel plus
+    a box ahead of it and a wake box behind it. Returns (task name, state).
+    """
+
+    x, y, z = WHEEL_CENTERS[wheel_name]
+
+    return [
+        (f"wheel-cylinder-{wheel_name}", {
+            "CoordinateSpecificationMethod": "Direct",
+            "RegionType": "Cylinder",
+            "CenterX": x,
+            "CenterY": y,
+            "CenterZ": z,
+            "AxisX1": x,
+            "AxisY1": y + 0.3,
+            "AxisZ1": z,
+            "Radius": 0.254,    # ~5 in radius
+            "Height": 0.25,
+            "MeshSize": 0.016
+        }),
+        (f"wheel-front-{wheel_name}", {
+            "CoordinateSpecificationMethod": "Direct",
+            "MeshSize": 0.016,
+            "Xmin": x - 0.25,
+            "Xmax": x - 0.05,
+            "Ymin": y - 0.3,
+            "Ymax": y + 0.3,
+            "Zmin": z - 0.2,
+            "Zmax": z + 0.2
+        }),
+        (f"wheel-wake-{wheel_name}", {
+            "CoordinateSpecificationMethod": "Direct",
+            "MeshSize": 0.032,
+            "Xmin": x + 0.05,
+            "Xmax": x + 0.40,
+            "Ymin": y - 0.3,
+            "Ymax": y + 0.3,
+            "Zmin": z - 0.2,
+            "Zmax": z + 0.2
+        }),
+    ]
+
+
+# Built once at import; identical for every run
+WHEEL_REFINEMENT_BOXES = tuple(
+    box for name in WHEEL_CENTERS for box in wheel_refinement_boxes(name)
+)
 
 
 ###########################################################
@@ -115,32 +308,31 @@ def get_continuity_residual(solver):
     try:
         res = solver.solution.Monitors.Residual.GetValues()
         return res.get("continuity", None)
-    except:
+    except Exception:
         return None
 
 
-def wait_until_converged(solver, target=1e-4, max_wait=2400):
+def wait_until_converged(solver, target=1e-4):
     """
-    Poll continuity until below threshold (target = 1e-4).
-    max_wait = seconds allowed (default 40 minutes)
+    Checks continuity against the threshold (target = 1e-4).
+    Call after the iterate() has returned: the residual can't change
+    once the calculation has ended, so it is read once, not polled.
     """
 
-    print("\n[Monitor] Watching continuity until < {:.1e}".format(target))
-    start = time.time()
+    print("\n[Monitor] Checking continuity < {:.1e}".format(target))
 
-    while True:
-        res = get_continuity_residual(solver)
-        if res is not None:
-            print(f"   continuity = {res:.3e}")
-            if res < target:
-                print("[Monitor] Converged.\n")
-                return True
+    res = get_continuity_residual(solver)
+    if res is None:
+        print("[Monitor] WARNING — continuity residual unavailable.\n")
+        return False
 
-        if time.time() - start > max_wait:
-            print("[Monitor] Timeout waiting for convergence.\n")
-            return False
+    print(f"   continuity = {res:.3e}")
+    if res < target:
+        print("[Monitor] Converged.\n")
+        return True
 
-        time.sleep(2)
+    print("[Monitor] WARNING — not converged.\n")
+    return False
 
 
 ###########################################################
@@ -152,8 +344,17 @@ def save_case_data(solver, outdir):
         case_file = os.path.join(outdir, "final.cas.h5")
         data_file = os.path.join(outdir, "final.dat.h5")
 
-        solver.solver.File.Write(file_type="case", file_name=case_file)
-        solver.solver.File.Write(file_type="data", file_name=data_file)
+        # Compressed HDF5 (low gzip level: most of the size saving for little CPU);
+        # Fluent versions without cffio-options write uncompressed instead
+        try:
+            solver.tui.file.cff_files("yes")
+            solver.tui.file.cffio_options.compression_level(HDF5_COMPRESSION_LEVEL)
+        except Exception as e:
+            print(f"[Save] HDF5 compression not set ({e}); writing uncompressed")
+
+        # One write for both files: Fluent walks the mesh once and the
+        # solver is held up by a single RPC instead of two
+        solver.solver.File.Write(file_type="case-data", file_name=case_file)
 
         print(f"[Save] Case saved → {case_file}")
         print(f"[Save] Data saved → {data_file}\n")
@@ -162,6 +363,43 @@ def save_case_data(solver, outdir):
         print(f"[Save] ERROR saving case/data: {e}")
 
 
+###########################################################
+# ---- WARM START (INTERPOLATED INITIAL FIELD) ----
+###########################################################
+
+def warm_start_file(L, W, H):
+    """Interpolation file for vehicles of (roughly) this size."""
+    key = "_".join(str(round(d / WARM_START_BUCKET)) for d in (L, W, H))
+    return os.path.join(WARM_START_DIR, f"undertray_{key}.ip")
+
+
+def read_warm_start(solver, ip_file):
+    """
+    Interpolates a previous run's field onto the current mesh. Call once
+    models, BCs and discretization are set: the flow is initialized from
+    them first, then overwritten by the interpolated field.
+    Returns False (solver keeps its default initialization) on failure.
+    """
+    try:
+        solver.tui.solve.initialize.initialize_flow()
+        solver.tui.file.interpolate.read_data(ip_file)
+        print(f"[WarmStart] Initial field interpolated from {ip_file}")
+        return True
+    except Exception as e:
+        print(f"[WarmStart] ERROR reading {ip_file}: {e} — cold start")
+        return False
+
+
+def write_warm_start(solver, ip_file):
+    """Leaves the converged field behind for the next run of this size."""
+    try:
+        os.makedirs(os.path.dirname(ip_file), exist_ok=True)
+        solver.tui.file.interpolate.write_data(ip_file)
+        print(f"[WarmStart] Field saved → {ip_file}")
+    except Exception as e:
+        print(f"[WarmStart] ERROR saving {ip_file}: {e}")
+
+
 ###########################################################
 # ---- EXPORT CONTOURS ----
 ###########################################################
@@ -170,40 +408,42 @@ def export_contours(solver, outdir):
     press = os.path.join(outdir, "pressure.png")
     vel = os.path.join(outdir, "velocity.png")
 
-    try:
-        solver.tui.display.set_window(1)
-        solver.tui.display.contour("pressure", "static-pressure", "yes")
-        solver.tui.display.save_picture(press)
-        print(f"[Post] Pressure contour saved → {press}")
-    except:
-        print("[Post] Pressure contour failed.")
+    # Window 1 is selected once and both contours are rendered + saved
+    # in one scheme round-trip, so the surface is uploaded to Fluent's
+    # graphics pipeline in a single display pass. Each picture is reported
+    # from its own contour + save-picture results.
+    pictures = [
+        ("Pressure", "display/contour pressure static-pressure yes", press),
+        ("Velocity", "display/contour velocity velocity-magnitude yes", vel),
+    ]
+    commands = ["display/set-window 1"]
+    for _, contour, png in pictures:
+        commands += [contour, f'display/save-picture "{png}"']
 
     try:
-        solver.tui.display.set_window(1)
-        solver.tui.display.contour("velocity", "velocity-magnitude", "yes")
-        solver.tui.display.save_picture(vel)
-        print(f"[Post] Velocity contour saved → {vel}")
-    except:
-        print("[Post] Velocity contour failed.")
+        failed = failed_tui_commands(solver, commands)
+        for label, contour, png in pictures:
+            if contour in failed or f'display/save-picture "{png}"' in failed:
+                print(f"[Post] {label} contour export failed → {png}")
+            else:
+                print(f"[Post] {label} contour saved → {png}")
+    except Exception as e:
+        print(f"[Post] Contour export failed: {e}")
 
 
 ###########################################################
 # ---- PROJECTED AREA CALCULATION ----
 ###########################################################
 
-def compute_projected_area(solver, outdir):
-    txt = os.path.join(outdir, "projected_area.txt")
+def compute_projected_area(solver):
     try:
         solver.tui.solve.reference_values.compute("projected-area")
         area = solver.tui.solve.reference_values.area()
 
-        with open(txt, "w") as f:
-            f.write(str(area))
-
         print(f"[Area] Projected frontal area = {area}\n")
         return float(area)
-    except:
-        print("[Area] ERROR computing projected area.")
+    except Exception as e:
+        print(f"[Area] ERROR computing projected area: {e}")
         return None
 
 
@@ -211,28 +451,21 @@ def compute_projected_area(solver, outdir):
 # ---- AERO COEFFICIENT EXTRACTION ----
 ###########################################################
 
-def extract_aero_coeffs(solver, outdir, area):
+def extract_aero_coeffs(solver, area):
     """
     Reads Cd, Cl directly from Fluent.
     Computes SCx = Cd*A
     Computes SCz = Cl*A
-    Writes everything to text file.
+    Saved with the area by write_results.
     """
 
-    txt = os.path.join(outdir, "aero_coeffs.txt")
-
     try:
         cd = solver.tui.report.force_coefficients.c_d()
         cl = solver.tui.report.force_coefficients.c_l()
 
-        scx = cd * area
-        scz = cl * area
-
-        with open(txt, "w") as f:
-            f.write(f"Cd = {cd}\n")
-            f.write(f"Cl = {cl}\n")
-            f.write(f"SCx = {scx}\n")
-            f.write(f"SCz = {scz}\n")
+        # A failed area compute leaves Cd/Cl valid; only SCx/SCz are lost
+        scx = cd * area if area is not None else None
+        scz = cl * area if area is not None else None
 
         print("\n[Aero Results — UNDERTRAY]")
         print(f"   Cd  = {cd}")
@@ -246,14 +479,108 @@ def extract_aero_coeffs(solver, outdir, area):
         print(f"[Aero] ERROR extracting aero coefficients: {e}")
         return None, None, None, None
 
+
+###########################################################
+# ---- RESULTS FILE ----
+###########################################################
+
+def write_results(outdir, results):
+    """
+    Writes the run's scalar results (area + coefficients) to
+    results.json in one go, once the solver work is done.
+    """
+    path = os.path.join(outdir, "results.json")
+    try:
+        with open(path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"[Results] Saved → {path}")
+    except OSError as e:
+        print(f"[Results] ERROR writing {path}: {e}")
+
+###########################################################
+# ---- CPU TOPOLOGY (ONE SOCKET PER FLUENT PROCESS) ----
+###########################################################
+
+def socket_cpus():
+    """
+    Usable CPU ids of the largest NUMA node (socket), read from sysfs.
+    None on single-node machines and off Linux, where there is nothing to pin.
+    """
+    if not hasattr(os, "sched_getaffinity"):
+        return None
+    usable = os.sched_getaffinity(0)
+
+    nodes = []
+    for node in glob.glob("/sys/devices/system/node/node[0-9]*"):
+        try:
+            with open(os.path.join(node, "cpulist")) as f:
+                cpulist = f.read().strip()
+        except OSError:
+            continue
+        cpus = set()
+        for part in filter(None, cpulist.split(",")):
+            lo, _, hi = part.partition("-")
+            cpus.update(range(int(lo), int(hi or lo) + 1))
+        if cpus & usable:
+            nodes.append(frozenset(cpus & usable))
+
+    return max(nodes, key=len) if len(nodes) > 1 else None
+
+
+# Meshing and solving are memory-bandwidth bound: ranks spread over two
+# sockets run slower than fewer ranks on one, so both stay on SOCKET_CPUS
+SOCKET_CPUS = socket_cpus()
+CORE_LIMIT = len(SOCKET_CPUS) if SOCKET_CPUS else (os.cpu_count() or 1)
+
+
+@contextmanager
+def pinned(cpus):
+    """
+    Narrows this thread's CPU affinity for the block; Fluent and its MPI
+    ranks inherit it from the thread that launches them.
+    """
+    if not cpus:
+        yield
+        return
+    saved = os.sched_getaffinity(0)
+    os.sched_setaffinity(0, cpus)
+    try:
+        yield
+    finally:
+        os.sched_setaffinity(0, saved)
+
+
+def launch_meshing():
+    import ansys.fluent.core as pyfluent
+    nproc = min(MAX_MESHING_PROCS, CORE_LIMIT)
+    print(f"[Meshing] {nproc} processes")
+    with pinned(SOCKET_CPUS):
+        return pyfluent.launch_fluent(
+            mode=pyfluent.FluentMode.MESHING,
+            precision=pyfluent.Precision.DOUBLE,
+            processor_count=nproc,
+            dimension=3,
+            mpi_type="intel",
+        )
+
+
 ###########################################################
 # ---- MESHING PIPELINE (UNDERTRAY + WHEELS) ----
 ###########################################################
 
-def run_meshing(session, geom_path, outdir, L, W, H):
+def run_meshing(session, geom_path, outdir, L, W, H, on_volume_mesh=None):
+    """
+    on_volume_mesh, if given, is called once the volume mesh exists
+    (before improvement + save), e.g. to start the solver launching.
+    """
     workflow = session.workflow
     tasks = workflow.TaskObject
 
+    # Shared by the global and wheel refinement loops; each lookup is a
+    # round-trip to Fluent. New children still need a name lookup, as
+    # AddChildToTask() returns no handle.
+    refine_root = tasks["Create Local Refinement Regions"]
+
     print_header("IMPORTING GEOMETRY")
 
     # ------------------------------------------------------
@@ -265,7 +592,6 @@ def run_meshing(session, geom_path, outdir, L, W, H):
         "LengthUnit": "m"
     })
     imp.Execute()
-    wait()
 
 
     ###########################################################
@@ -273,51 +599,11 @@ def run_meshing(session, geom_path, outdir, L, W, H):
     ###########################################################
     print_header("CREATING GLOBAL LOCAL REFINEMENT REGIONS")
 
-    near_size = 0.016
-    mid_size  = 0.032
-    far_size  = 0.064
-
-    zmin = 0
-    zmax = W * 0.5  # symmetric half model
-
-    box_defs = {
-        "local-refinement-near": {
-            "MeshSize": near_size,
-            "Xmin": -L*0.65,
-            "Xmax":  L*2.2,
-            "Ymin":  0,
-            "Ymax":  H*1.5,
-            "Zmin":  zmin,
-            "Zmax":  zmax
-        },
-        "local-refinement-mid": {
-            "MeshSize": mid_size,
-            "Xmin": -L*0.72,
-            "Xmax":  L*4.1,
-            "Ymin":  0,
-            "Ymax":  H*2.2,
-            "Zmin":  zmin,
-            "Zmax":  zmax
-        },
-        "local-refinement-far": {
-            "MeshSize": far_size,
-            "Xmin": -L*0.78,
-            "Xmax":  L*6.0,
-            "Ymin":  0,
-            "Ymax":  H*3.0,
-            "Zmin":  zmin,
-            "Zmax":  zmax
-        },
-    }
-
-    add_refine = tasks["Create Local Refinement Regions"]
-
-    for name, params in box_defs.items():
-        add_refine.AddChildToTask()
+    for name, *spec in BOX_SPECS:
+        refine_root.AddChildToTask()
         child = tasks[name]
-        child.Arguments.set_state(params)
+        child.Arguments.set_state(refinement_box(*spec, L, W, H))
         child.Execute()
-        wait()
 
 
     ###########################################################
@@ -326,68 +612,11 @@ def run_meshing(session, geom_path, outdir, L, W, H):
 
     print_header("CREATING WHEEL REFINEMENT REGIONS")
 
-    wheels = get_wheel_centers()
-
-    wheel_refine = tasks["Create Local Refinement Regions"]
-
-    for wname, (x, y, z) in wheels.items():
-
-        # -------------------------
-        # Wheel cylindrical region
-        # -------------------------
-        wheel_refine.AddChildToTask()
-        cyl_task = tasks[f"wheel-cylinder-{wname}"]
-        cyl_task.Arguments.set_state({
-            "CoordinateSpecificationMethod": "Direct",
-            "RegionType": "Cylinder",
-            "CenterX": x,
-            "CenterY": y,
-            "CenterZ": z,
-            "AxisX1": x,
-            "AxisY1": y + 0.3,
-            "AxisZ1": z,
-            "Radius": 0.254,    # ~5 in radius
-            "Height": 0.25,
-            "MeshSize": 0.016
-        })
-        cyl_task.Execute()
-        wait()
-
-        # -------------------------
-        # Front refinement box
-        # -------------------------
-        wheel_refine.AddChildToTask()
-        front_box = tasks[f"wheel-front-{wname}"]
-        front_box.Arguments.set_state({
-            "CoordinateSpecificationMethod": "Direct",
-            "MeshSize": 0.016,
-            "Xmin": x - 0.25,
-            "Xmax": x - 0.05,
-            "Ymin": y - 0.3,
-            "Ymax": y + 0.3,
-            "Zmin": z - 0.2,
-            "Zmax": z + 0.2
-        })
-        front_box.Execute()
-        wait()
-
-        # -------------------------
-        # Wake refinement box (rear)
-        # -------------------------
-        wheel_refine.AddChildToTask()
-        wake_box = tasks[f"wheel-wake-{wname}"]
-        wake_box.Arguments.set_state({
-            "CoordinateSpecificationMethod": "Direct",
-            "MeshSize": 0.032,
-            "Xmin": x + 0.05,
-            "Xmax": x + 0.40,
-            "Ymin": y - 0.3,
-            "Ymax": y + 0.3,
-            "Zmin": z - 0.2,
-            "Zmax": z + 0.2
-        })
-        wake_box.Execute()
-        wait()
+    for task_name, params in WHEEL_REFINEMENT_BOXES:
+        refine_root.AddChildToTask()
+        child = tasks[task_name]
+        child.Arguments.set_state(params)
+        child.Execute()
 
 
     ###########################################################
@@ -396,28 +625,13 @@ def run_meshing(session, geom_path, outdir, L, W, H):
 
     print_header("APPLYING CURVATURE SIZING")
 
-    curvature_sizing_targets = [
-        ("curvature_undertray", ["undertray"], 0.0005, 0.008, 9),
-        ("curvature_wheels", ["fw", "rw"], 0.0005, 0.032, 18),
-        ("curvature_blocks", ["fwb", "rwb"], 0.0005, 0.032, 18),
-        ("curvature_bargeboard", ["bargeboard"], 0.0005, 0.016, 12),
-    ]
-
     sizing_task = tasks["Add Local Sizing"]
 
-    for task_name, zones, min_s, max_s, angle in curvature_sizing_targets:
+    for task_name, payload in LS_PAYLOADS:
         sizing_task.AddChildToTask()
         child = tasks[task_name]
-        child.Arguments.set_state({
-            "LocalSizingType": "Curvature",
-            "SizeControlType": "Curvature",
-            "MinSize": min_s,
-            "MaxSize": max_s,
-            "CurvatureNormalAngle": angle,
-            "BoundaryNameList": zones
-        })
+        child.Arguments.set_state(payload)
         child.Execute()
-        wait()
 
 
     ###########################################################
@@ -436,7 +650,6 @@ def run_meshing(session, geom_path, outdir, L, W, H):
         "SizeFunctions": "CurvatureProximity"
     })
     surf.Execute()
-    wait()
 
 
     ###########################################################
@@ -450,7 +663,6 @@ def run_meshing(session, geom_path, outdir, L, W, H):
         "FaceQualityLimit": 0.7
     })
     improve_surf.Execute()
-    wait()
 
 
     ###########################################################
@@ -462,7 +674,6 @@ def run_meshing(session, geom_path, outdir, L, W, H):
         "SetupType": "The geometry consists of only fluid regions with no voids"
     })
     desc.Execute()
-    wait()
 
 
     ###########################################################
@@ -470,10 +681,8 @@ def run_meshing(session, geom_path, outdir, L, W, H):
     ###########################################################
 
     tasks["Update Boundaries"].Execute()
-    wait()
 
     tasks["Update Regions"].Execute()
-    wait()
 
 
     ###########################################################
@@ -495,7 +704,6 @@ def run_meshing(session, geom_path, outdir, L, W, H):
         "LastLayerRatio": 1.2
     })
     bl_task.Execute()
-    wait()
 
 
     ###########################################################
@@ -513,7 +721,9 @@ def run_meshing(session, geom_path, outdir, L, W, H):
         "EnableParallel": True
     })
     vol.Execute()
-    wait()
+
+    if on_volume_mesh:
+        on_volume_mesh()
 
 
     ###########################################################
@@ -528,7 +738,6 @@ def run_meshing(session, geom_path, outdir, L, W, H):
         "CellQualityLimit": 0.2
     })
     impv.Execute()
-    wait()
 
 
     ###########################################################
@@ -548,24 +757,70 @@ def run_meshing(session, geom_path, outdir, L, W, H):
 # ---- SOLVER PIPELINE (UNDERTRAY + WHEELS) ----
 ###########################################################
 
-def run_solver(mesh_path, outdir):
+def solver_process_count(mesh_path):
+    """
+    Picks a solver process count from the estimated mesh size so small
+    meshes are not split below CELLS_PER_CORE cells per rank.
+    The cell count is estimated from the saved mesh file size.
+    """
+    try:
+        cells = os.path.getsize(mesh_path) // MESH_BYTES_PER_CELL
+    except OSError:
+        return MAX_SOLVER_PROCS
+
+    nproc = min(MAX_SOLVER_PROCS, max(2, cells // CELLS_PER_CORE))
+    print(f"[Solver] ~{cells} cells → {nproc} processes")
+    return nproc
+
+
+def launch_solver(nproc):
+    import ansys.fluent.core as pyfluent
+    with pinned(SOCKET_CPUS):
+        solver = pyfluent.launch_fluent(
+            mode=pyfluent.FluentMode.SOLVER,
+            precision=pyfluent.Precision.DOUBLE,
+            processor_count=min(nproc, CORE_LIMIT),
+            dimension=3,
+            mpi_type="intel",
+        )
+    register_solver_events(solver)
+    return solver
+
+
+def run_solver(mesh_path, outdir, warm_start_data=None, warm_start_save=None,
+               solver=None):
+    """
+    warm_start_data: interpolation file to start from instead of the
+    default initialization (shortens the ramp, see WARM_RAMP_ITERS).
+    warm_start_save: where to leave this run's converged field.
+    solver: an already launched session (or a Future of one) to use
+    instead of launching a new one.
+    """
     print_header("LAUNCHING FLUENT SOLVER (UNDERTRAY)")
 
-    solver = pyfluent.launch_fluent(
-        mode=pyfluent.FluentMode.SOLVER,
-        precision=pyfluent.Precision.DOUBLE,
-        processor_count=20,
-        dimension=3,
-        mpi_type="intel",
-    )
-    wait()
+    if isinstance(solver, Future):
+        print("[Solver] Waiting for the pre-launched session...")
+        try:
+            solver = solver.result()
+        except Exception as e:
+            print(f"[Solver] ERROR in pre-launch: {e} — launching again")
+            solver = None
+
+    if solver is None:
+        solver = launch_solver(solver_process_count(mesh_path))
 
     # --------------------------------------------------------
     # LOAD MESH
     # --------------------------------------------------------
     print("[Solver] Loading mesh...")
     solver.solver.File.Read(file_type="mesh", file_name=mesh_path)
-    wait()
+
+    # Headless run: no residual plot redrawn every iteration. Residuals are
+    # still computed and monitored; export_contours opens its own window.
+    try:
+        solver.tui.solve.monitors.residual.plot("no")
+    except Exception as e:
+        print(f"[Solver] WARNING — could not disable residual plotting: {e}")
 
 
     ###########################################################
@@ -575,8 +830,8 @@ def run_solver(mesh_path, outdir):
     try:
         solver.tui.define.units("force", "lbf")
         solver.tui.define.units("velocity", "mph")
-    except:
-        print("[Units] ERROR setting units")
+    except Exception as e:
+        print(f"[Units] ERROR setting units: {e}")
 
 
     ###########################################################
@@ -589,8 +844,8 @@ def run_solver(mesh_path, outdir):
         solver.tui.define.models.viscous.ke_gko.options.production_limiter("yes")
         solver.tui.define.models.viscous.ke_gko.options.curvature_correction("no")
         print("[Turbulence] GEKO ON (curvature correction OFF)")
-    except:
-        print("[Turbulence] ERROR enabling GEKO")
+    except Exception as e:
+        print(f"[Turbulence] ERROR enabling GEKO: {e}")
 
 
     ###########################################################
@@ -607,8 +862,8 @@ def run_solver(mesh_path, outdir):
             "velocity-magnitude", "40"
         )
         print("[BC] inlet = 40 mph")
-    except:
-        print("[BC] ERROR setting inlet")
+    except Exception as e:
+        print(f"[BC] ERROR setting inlet: {e}")
 
 
     # --------------------
@@ -622,30 +877,39 @@ def run_solver(mesh_path, outdir):
             "moving-wall-direction", "1", "0", "0"
         )
         print("[BC] ground moving at 40 mph")
-    except:
-        print("[BC] ERROR setting ground motion")
+    except Exception as e:
+        print(f"[BC] ERROR setting ground motion: {e}")
 
 
     # --------------------
     # Wheels (rotate at 88 rad/s)
     # --------------------
-    wheels = get_wheel_centers()
-
-    for wname, center in wheels.items():
-        apply_wheel_rotation(solver, wname, center)
+    # Optional zones: only those in the mesh are set
+    wheels = present_walls(solver, tuple(WHEEL_CENTERS))
+    commands = {wname: WHEEL_ROTATION_COMMANDS[wname] for wname in wheels}
 
     # --------------------
     # Wheel blocks → DO NOT MOVE
     # --------------------
-    for block in ["fwb", "rwb"]:
-        try:
-            solver.tui.define.boundary_conditions.wall(
-                block, "yes",
-                "motion", "stationary"
-            )
-            print(f"[BC] Wheel block {block} = fixed wall")
-        except:
-            print(f"[BC] ERROR assigning wheel block BC: {block}")
+    blocks = present_walls(solver, ["fwb", "rwb"])
+    commands.update(
+        (block, f"define/boundary-conditions/wall {block} yes motion stationary") for block in blocks
+    )
+
+    # Wheels + blocks go to Fluent as one batch; each command's result is checked
+    try:
+        failed = failed_tui_commands(solver, list(commands.values())) if commands else []
+        for cmd in failed:
+            print(f"[BC] ERROR — Fluent rejected: {cmd}")
+
+        wheels_set = [w for w in wheels if commands[w] not in failed]
+        blocks_set = [b for b in blocks if commands[b] not in failed]
+        if wheels_set:
+            print(f"[BC] Wheels {', '.join(wheels_set)} rotating at {WHEEL_OMEGA} rad/s")
+        if blocks_set:
+            print(f"[BC] Wheel blocks {', '.join(blocks_set)} = fixed wall")
+    except Exception as e:
+        print(f"[BC] ERROR assigning wheel / wheel block BCs: {e}")
 
 
     ###########################################################
@@ -657,15 +921,15 @@ def run_solver(mesh_path, outdir):
         solver.tui.solve.reference_values.set("velocity", "40")
         solver.tui.solve.reference_values.set("compute-from", "inlet")
         print("[Reference] Computed from inlet @ 40 mph")
-    except:
-        print("[Reference] ERROR setting reference values")
+    except Exception as e:
+        print(f"[Reference] ERROR setting reference values: {e}")
 
 
     ###########################################################
     # PROJECTED AREA
     ###########################################################
     print_header("COMPUTING PROJECTED AREA")
-    area = compute_projected_area(solver, outdir)
+    area = compute_projected_area(solver)
 
 
     ###########################################################
@@ -688,20 +952,19 @@ def run_solver(mesh_path, outdir):
             "turb-diss-rate", "0.3"
         )
 
-    except:
-        print("[Solver] ERROR setting discretization")
+    except Exception as e:
+        print(f"[Solver] ERROR setting discretization: {e}")
 
 
     ###########################################################
     # SOLVER RAMP-UP
     ###########################################################
+    warm = bool(warm_start_data) and read_warm_start(solver, warm_start_data)
 
-    print_header("RAMP PHASE 1 → 1000 iterations")
-    solver.solution.RunCalculation.iterate(1000)
-    wait()
-
-    print_header("RAMP PHASE 2 → 1000 iterations")
-    solver.solution.RunCalculation.iterate(1000)
+    # Phases 1 and 2 use identical settings, so they run as one call
+    ramp_iters = WARM_RAMP_ITERS if warm else 2000
+    print_header(f"RAMP PHASES 1+2 → {ramp_iters} iterations")
+    solver.solution.RunCalculation.iterate(ramp_iters)
     wait()
 
     print_header("RAMP PHASE 3 → enable curvature correction + 5000 iterations")
@@ -709,11 +972,12 @@ def run_solver(mesh_path, outdir):
     try:
         solver.tui.define.models.viscous.ke_gko.options.curvature_correction("yes")
         print("[GEKO] Curvature correction ON")
-    except:
-        print("[GEKO] ERROR enabling curvature correction")
+    except Exception as e:
+        print(f"[GEKO] ERROR enabling curvature correction: {e}")
 
-    solver.solution.RunCalculation.iterate(5000)
-    wait()
+    if not warm:
+        solver.solution.RunCalculation.iterate(5000)
+        wait()
 
 
     ###########################################################
@@ -721,11 +985,20 @@ def run_solver(mesh_path, outdir):
     ###########################################################
     print_header("CHECKING CONTINUITY RESIDUAL")
 
-    converged = wait_until_converged(
-        solver,
-        target=1e-4,
-        max_wait=2400
-    )
+    if warm:
+        # Started near the solution: stop as soon as continuity converges
+        for done in range(WARM_CHUNK_ITERS, 5000 + 1, WARM_CHUNK_ITERS):
+            solver.solution.RunCalculation.iterate(WARM_CHUNK_ITERS)
+            wait()
+            print(f"[Monitor] {done} / 5000 phase 3 iterations")
+            converged = wait_until_converged(solver, target=1e-4)
+            if converged:
+                break
+    else:
+        converged = wait_until_converged(solver, target=1e-4)
+
+    if converged and warm_start_save:
+        write_warm_start(solver, warm_start_save)
 
 
     ###########################################################
@@ -735,7 +1008,6 @@ def run_solver(mesh_path, outdir):
 
     cd, cl, scx, scz = extract_aero_coeffs(
         solver=solver,
-        outdir=outdir,
         area=area
     )
 
@@ -753,6 +1025,15 @@ def run_solver(mesh_path, outdir):
     print_header("SAVING FINAL CASE & DATA")
     save_case_data(solver, outdir)
 
+    write_results(outdir, {
+        "ProjectedArea": area,
+        "Cd": cd,
+        "Cl": cl,
+        "SCx": scx,
+        "SCz": scz,
+        "Converged": converged,
+    })
+
     print_header("SOLVER COMPLETE — UNDERTRAY FINISHED")
 
     return cd, cl, scx, scz
@@ -761,38 +1042,51 @@ def run_solver(mesh_path, outdir):
 # ---- MAIN WORKFLOW (UNDERTRAY + WHEELS + BLOCKS) ----
 ###########################################################
 
-def main():
+def main(argv=None):
     print_header("FSAE UNDERTRAY CFD — FULL AUTOMATION")
 
     # ------------------------------------------
     # USER INPUT
     # ------------------------------------------
-    geom_path, sim_name, outdir, L, W, H = ask_user_inputs()
+    args = parse_args(argv)
+    geom_path, sim_name, outdir, L, W, H = ask_user_inputs(args)
+
+    # The long-lived session skips the 20-60 s solver launch; it is left
+    # running for the next component. Without a server, launch as usual.
+    server = connect_to_server() if args.persistent_session else None
+    if server is not None:
+        print(f"[Solver] Reusing solver server ({SERVER_INFO_FILE})")
+        register_solver_events(server)
+    elif args.persistent_session:
+        print("[Solver] No solver server running — launching a solver")
 
     # ------------------------------------------
     # START FLUENT MESHING
     # ------------------------------------------
     print_header("LAUNCHING FLUENT MESHING SESSION")
 
-    meshing_session = pyfluent.launch_fluent(
-        mode=pyfluent.FluentMode.MESHING,
-        precision=pyfluent.Precision.DOUBLE,
-        processor_count=20,
-        dimension=3,
-        mpi_type="intel",
-    )
-    wait()
+    meshing_session = launch_meshing()
 
     # ------------------------------------------
     # RUN MESHING PIPELINE
     # ------------------------------------------
     print_header("RUNNING UNDERTRAY MESHING PIPELINE")
 
+    # Solver start-up runs in the background from the volume mesh onwards
+    launcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fluent-launch")
+    pending = {}
+
+    def start_solver():
+        if PIPELINE_SOLVER_LAUNCH and server is None:
+            print("[Solver] Launching in the background...")
+            pending["solver"] = launcher.submit(launch_solver, MAX_SOLVER_PROCS)
+
     mesh_file = run_meshing(
         session=meshing_session,
         geom_path=geom_path,
         outdir=outdir,
-        L=L, W=W, H=H
+        L=L, W=W, H=H,
+        on_volume_mesh=start_solver
     )
 
     print_header("MESHING COMPLETE — MOVING TO SOLVER")
@@ -801,10 +1095,17 @@ def main():
     # ------------------------------------------
     # RUN SOLVER PIPELINE
     # ------------------------------------------
+    # Start from an earlier run of a similar-size vehicle, if there is one
+    warm_file = warm_start_file(L, W, H)
+
     cd, cl, scx, scz = run_solver(
         mesh_path=mesh_file,
-        outdir=outdir
+        outdir=outdir,
+        warm_start_data=warm_file if os.path.isfile(warm_file) else None,
+        warm_start_save=warm_file,
+        solver=server or pending.get("solver")
     )
+    launcher.shutdown()
 
     # ------------------------------------------
     # FINAL SUMMARY